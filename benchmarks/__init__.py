@@ -0,0 +1 @@
+"""Micro-benchmarks for Senziio integration hot paths."""
@@ -0,0 +1,75 @@
+"""Benchmark MQTT handler cost per message for scalar and JSON payloads.
+
+Run from the repository root with the test requirements installed:
+
+    python -m benchmarks.payload_decode
+"""
+
+from __future__ import annotations
+
+import timeit
+from types import SimpleNamespace
+
+from homeassistant.util.json import json_loads_object
+
+from custom_components.senziio.senziio import Senziio
+from custom_components.senziio.utils import decode_sample
+
+ROUNDS = 200_000
+
+PAYLOADS = {
+    "scalar number": "21.4",
+    "scalar integer": "510",
+    "scalar boolean": "true",
+    "json object": '{"temperature": 21.4}',
+    "json object (padded)": '{"temperature": 21.4, "unit": "C", "sensor": "sht40"}',
+}
+
+
+class _Entity:
+    """Minimal stand-in holding the state written by a handler."""
+
+    native_value = None
+
+
+def _legacy_handler(entity, message):
+    """Handler as implemented before scalar payload support."""
+    data = json_loads_object(message.payload)
+    entity.native_value = data.get("temperature")
+
+
+_DEVICE = Senziio("1", "Theia Pro", mqtt=None)
+
+
+def _handler(entity, message):
+    """Current handler decoding path."""
+    value, seq, ts = decode_sample(message.payload, "temperature")
+    if not _DEVICE.accept_sample("temperature", seq, ts):
+        return
+    entity.native_value = value
+
+
+def _per_message_ns(handler, payload: str) -> float:
+    entity = _Entity()
+    message = SimpleNamespace(topic="dt/theia-pro/1/temperature", payload=payload)
+    seconds = min(
+        timeit.repeat(lambda: handler(entity, message), number=ROUNDS, repeat=5)
+    )
+    return seconds / ROUNDS * 1e9
+
+
+def main() -> None:
+    """Print per-message handler cost for each payload format."""
+    print(f"{'payload':<24}{'handler':>12}{'legacy':>12}")
+    for name, payload in PAYLOADS.items():
+        current = _per_message_ns(_handler, payload)
+        legacy = (
+            f"{_per_message_ns(_legacy_handler, payload):>10.0f}ns"
+            if payload.startswith("{")
+            else f"{'-':>12}"
+        )
+        print(f"{name:<24}{current:>10.0f}ns{legacy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark evaluation of compiled threshold rules on device samples.
+
+Run from the repository root with the test requirements installed:
+
+    python -m benchmarks.rule_evaluation
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from custom_components.senziio.rules import RULE_IDLE, compile_rules
+
+DEVICES = 100
+RULES_PER_METRIC = 10
+SAMPLES = 200_000
+METRICS = ("co2", "temperature", "humidity", "illuminance")
+
+
+def main() -> None:
+    """Print rule evaluations per second over a simulated fleet."""
+    tables = [
+        compile_rules(
+            {
+                "id": f"{metric}-{number}",
+                "metric": metric,
+                "above": random.uniform(0, 1000),
+                "hysteresis": 10,
+                "for": 60 * (number % 2),
+            }
+            for metric in METRICS
+            for number in range(RULES_PER_METRIC)
+        )
+        for _ in range(DEVICES)
+    ]
+    samples = [
+        (random.choice(tables), random.choice(METRICS), random.uniform(0, 1000))
+        for _ in range(SAMPLES)
+    ]
+
+    fired = 0
+    start = time.perf_counter()
+    now = 0.0
+    for table, metric, value in samples:
+        now += 0.01
+        for rule in table[metric]:
+            if rule.evaluate(value, now) != RULE_IDLE:
+                fired += 1
+    elapsed = time.perf_counter() - start
+
+    evaluations = SAMPLES * RULES_PER_METRIC
+    print(f"{DEVICES} devices, {len(METRICS) * RULES_PER_METRIC} rules each")
+    print(f"{evaluations / elapsed:,.0f} rule evaluations/s ({fired} transitions)")
+
+
+if __name__ == "__main__":
+    main()
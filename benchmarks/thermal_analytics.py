@@ -0,0 +1,70 @@
+"""Benchmark thermal frame analytics throughput.
+
+Reports frames per second on a single core and across a thread pool with
+one worker per core. Run from the repository root:
+
+    python -m benchmarks.thermal_analytics
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from custom_components.senziio.analytics import ThermalAnalyzer
+from custom_components.senziio.thermal import decode_frame
+
+WIDTH, HEIGHT = 32, 24
+FRAMES = 2_000
+DEVICES = 100
+
+
+def _synthetic_frames(count: int, seed: int = 0) -> list[bytes]:
+    """Build raw frames with a warm background and a few moving people."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for index in range(count):
+        pixels = rng.normal(2200, 20, (HEIGHT, WIDTH))
+        for person in range(3):
+            row = (index + person * 7) % (HEIGHT - 3)
+            column = (index * (person + 1)) % (WIDTH - 3)
+            pixels[row : row + 3, column : column + 2] = 3300
+        header = struct.pack("<HH", WIDTH, HEIGHT)
+        frames.append(header + pixels.astype("<i2").tobytes())
+    return frames
+
+
+def _analyse(analyzer: ThermalAnalyzer, frames: list[bytes]) -> None:
+    for payload in frames:
+        analyzer.analyze(decode_frame(payload))
+
+
+def main() -> None:
+    """Print analytics throughput."""
+    frames = _synthetic_frames(FRAMES)
+
+    start = time.perf_counter()
+    _analyse(ThermalAnalyzer(), frames)
+    single = FRAMES / (time.perf_counter() - start)
+    print(f"single core: {single:,.0f} frames/s")
+
+    workers = os.cpu_count() or 1
+    per_device = max(FRAMES // DEVICES, 1)
+    analyzers = [ThermalAnalyzer() for _ in range(DEVICES)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for analyzer in analyzers:
+            executor.submit(_analyse, analyzer, frames[:per_device])
+    pooled = DEVICES * per_device / (time.perf_counter() - start)
+    print(
+        f"{workers} workers, {DEVICES} devices: {pooled:,.0f} frames/s "
+        f"({pooled / workers:,.0f} frames/s per core)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,35 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Mapping
 from pathlib import Path
+from typing import Any
+
+import aiohttp
+from yarl import URL
 
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt import async_publish, async_subscribe
 from homeassistant.config_entries import ConfigEntry, ConfigType
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PORT, Platform
+from homeassistant.core import HomeAssistant, callback as ha_callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.discovery import async_load_platform
 
-from .entity import DOMAIN
-from .senziio import Senziio, SenziioMQTT
+from .areas import async_get_area_index
+from .discovery import async_get_discovery_index
+from .entity import CONF_PENDING_VERIFICATION, DOMAIN
+from .history import async_register_websocket_commands
+from .openmetrics import async_register_metrics_view
+from .probing import SenziioRTTProbe
+from .reporting import SenziioReportingSync
+from .rules import CONF_RULES, SenziioRuleEngine
+from .senziio import Senziio, SenziioHTTP, SenziioHTTPError, SenziioMQTT
+from .services import async_setup_services
+from .tracing import async_get_tracer
 from .utils import init_resource, register_static_path
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,34 +39,109 @@ PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
     Platform.EVENT,
+    Platform.IMAGE,
     Platform.UPDATE,
 ]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Senziio device from a config entry."""
+    device_id = entry.data["serial-number"]
+    with async_get_tracer(hass).span("async_setup_entry", device_id):
+        return await _async_setup_entry(hass, entry, device_id)
+
+
+async def _async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, device_id: str
+) -> bool:
+    """Set up a device, tracing the phases of its setup."""
+    tracer = async_get_tracer(hass)
 
     # Make sure MQTT integration is enabled and the client is available.
-    if not await mqtt.async_wait_for_mqtt_client(hass):
+    with tracer.span("wait_for_mqtt_client", device_id):
+        mqtt_available = await mqtt.async_wait_for_mqtt_client(hass)
+    if not mqtt_available:
         _LOGGER.error("MQTT integration is not available")
         return False
 
-    device_id = entry.data["serial-number"]
     device_model = entry.data["model"]
-    device = Senziio(device_id, device_model, mqtt=SenziioHAMQTT(hass))
+    device = Senziio(
+        device_id,
+        device_model,
+        mqtt=SenziioHAMQTT(hass),
+        http=SenziioHAHTTP.from_entry_data(hass, entry.data),
+    )
 
-    if info := await device.get_info():
-        hass.config_entries.async_update_entry(entry, data=info)
+    if entry.data.get(CONF_PENDING_VERIFICATION):
+        # added from advertised info, verify without delaying setup
+        entry.async_create_background_task(
+            hass,
+            _async_verify_device(hass, entry, device),
+            f"{DOMAIN} verify {device_id}",
+        )
+    else:
+        with tracer.span("get_info", device_id):
+            info = await device.get_info()
+        if info:
+            # keep the cached device address along with the refreshed info
+            hass.config_entries.async_update_entry(entry, data={**entry.data, **info})
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = device
+    entry.async_on_unload(async_get_area_index(hass).async_add_device(entry, device))
+
+    # local threshold rules, recompiled when options change
+    rules = SenziioRuleEngine(hass, device)
+    rules.async_load(entry.options.get(CONF_RULES, []))
+    entry.async_on_unload(rules.async_stop)
+
+    # round-trip time probes adapting command timeouts
+    probe = SenziioRTTProbe(hass, entry, device)
+    probe.async_start()
+    entry.async_on_unload(probe.async_stop)
+
+    # device-side reporting rate, sent until the device acknowledges it
+    reporting = SenziioReportingSync(hass, entry, device)
+    reporting.async_sync()
+
+    options = entry.options
+
+    async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        nonlocal options
+        # listeners are also called when only entry data changes
+        if entry.options == options:
+            return
+        options = entry.options
+        rules.async_load(entry.options.get(CONF_RULES, []))
+        reporting.async_sync()
+
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
     # forward setup to all platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    with tracer.span("forward_entry_setups", device_id):
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+async def _async_verify_device(
+    hass: HomeAssistant, entry: ConfigEntry, device: Senziio
+) -> None:
+    """Confirm a device added from advertised info answers info requests."""
+    with async_get_tracer(hass).span("verify_device", device.id):
+        info = await device.get_info()
+    if not info:
+        _LOGGER.warning(
+            "Senziio device %s did not answer the device info request, "
+            "verification will be retried on next start",
+            device.id,
+        )
+        return
+    data = {**entry.data, **info}
+    data.pop(CONF_PENDING_VERIFICATION, None)
+    hass.config_entries.async_update_entry(entry, data=data)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -59,12 +150,33 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget persisted data of a removed config entry."""
+    index = await async_get_discovery_index(hass)
+    index.async_remove_device(entry.data["serial-number"])
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType):
     """Setup senziio frontend resources."""
-    path = Path(__file__).parent / "frontend"
-    version = getattr(hass.data["integrations"][DOMAIN], "version", 0)
-    register_static_path(hass.http.app, "/senziio/senziio-card.js", path / "senziio-card.js")
-    await init_resource(hass, "/senziio/senziio-card.js", str(version))
+    tracer = async_get_tracer(hass)
+    with tracer.span("async_setup"):
+        path = Path(__file__).parent / "frontend"
+        version = getattr(hass.data["integrations"][DOMAIN], "version", 0)
+        register_static_path(
+            hass.http.app, "/senziio/senziio-card.js", path / "senziio-card.js"
+        )
+        with tracer.span("init_resource"):
+            await init_resource(hass, "/senziio/senziio-card.js", str(version))
+
+        async_setup_services(hass)
+        async_register_websocket_commands(hass)
+        async_register_metrics_view(hass)
+
+    # area aggregates do not belong to any config entry
+    for platform in (Platform.SENSOR, Platform.BINARY_SENSOR):
+        hass.async_create_task(
+            async_load_platform(hass, platform, DOMAIN, {}, config)
+        )
     return True
 
 
@@ -85,6 +197,9 @@ class SenziioHAMQTT(SenziioMQTT):
 
     async def subscribe(self, topic: str, callback: Callable) -> Callable:
         """Subscribe to topic with a callback."""
+        if not asyncio.iscoroutinefunction(callback):
+            # plain handlers are cheap and must run in the event loop
+            callback = ha_callback(callback)
         try:
             return await async_subscribe(self._hass, topic, callback)
         except HomeAssistantError as error:
@@ -92,5 +207,61 @@ class SenziioHAMQTT(SenziioMQTT):
             raise MQTTError from error
 
 
+class SenziioHAHTTP(SenziioHTTP):
+    """Senziio local HTTP interface using the shared client session."""
+
+    # seconds before falling back to MQTT
+    TIMEOUT = 3
+    # seconds a streamed transfer may stall between chunks
+    STREAM_READ_TIMEOUT = 30
+    STREAM_CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int | None = None) -> None:
+        """Initialize HTTP interface for a Senziio device."""
+        self._session = async_get_clientsession(hass)
+        # builds bracketed IPv6 hosts
+        self._base_url = URL.build(scheme="http", host=host, port=port or 80)
+
+    @classmethod
+    def from_entry_data(
+        cls, hass: HomeAssistant, data: Mapping[str, Any]
+    ) -> SenziioHAHTTP | None:
+        """Create interface for the device address cached in entry data."""
+        if not (host := data.get(CONF_HOST)):
+            return None
+        return cls(hass, host, data.get(CONF_PORT))
+
+    async def get_json(self, path: str | URL) -> Any:
+        """Get JSON document at path."""
+        try:
+            async with self._session.get(
+                self._base_url.join(URL(path)),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+            ) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, TimeoutError, ValueError) as error:
+            raise SenziioHTTPError(f"{path}: {error!r}") from error
+
+    async def stream(self, path: str | URL) -> AsyncIterator[bytes]:
+        """Stream response body at path in chunks."""
+        try:
+            async with self._session.get(
+                self._base_url.join(URL(path)),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    connect=self.TIMEOUT,
+                    sock_read=self.STREAM_READ_TIMEOUT,
+                ),
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(
+                    self.STREAM_CHUNK_SIZE
+                ):
+                    yield chunk
+        except (aiohttp.ClientError, TimeoutError) as error:
+            raise SenziioHTTPError(f"{path}: {error!r}") from error
+
+
 class MQTTError(HomeAssistantError):
     """Error to indicate that required MQTT integration is not enabled."""
@@ -0,0 +1,105 @@
+"""Windowed aggregation of Senziio metric samples."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+
+from .senziio import Senziio
+
+
+class WindowAggregator:
+    """Sliding window mean, min and max of a sample stream.
+
+    The running sum gives the mean and monotonic deques give min and max,
+    so each sample costs amortized O(1) regardless of the window length.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize aggregator."""
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+        self._total = 0.0
+        # values increase from left to right
+        self._min: deque[tuple[float, float]] = deque()
+        # values decrease from left to right
+        self._max: deque[tuple[float, float]] = deque()
+
+    def __len__(self) -> int:
+        """Return number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, timestamp: float, value) -> None:
+        """Add a sample and expire samples that left the window."""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        self.expire(timestamp)
+
+        self._samples.append((timestamp, value))
+        self._total += value
+
+        min_deque = self._min
+        while min_deque and min_deque[-1][1] >= value:
+            min_deque.pop()
+        min_deque.append((timestamp, value))
+
+        max_deque = self._max
+        while max_deque and max_deque[-1][1] <= value:
+            max_deque.pop()
+        max_deque.append((timestamp, value))
+
+    def expire(self, now: float) -> None:
+        """Drop samples older than the window."""
+        oldest = now - self.window
+        samples = self._samples
+        while samples and samples[0][0] < oldest:
+            self._total -= samples.popleft()[1]
+        while self._min and self._min[0][0] < oldest:
+            self._min.popleft()
+        while self._max and self._max[0][0] < oldest:
+            self._max.popleft()
+        if not samples:
+            # avoid drifting float error once the window is empty
+            self._total = 0.0
+
+    @property
+    def mean(self) -> float | None:
+        """Return mean of samples in the window."""
+        return self._total / len(self._samples) if self._samples else None
+
+    @property
+    def min(self) -> float | None:
+        """Return minimum of samples in the window."""
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> float | None:
+        """Return maximum of samples in the window."""
+        return self._max[0][1] if self._max else None
+
+
+class SharedWindowAggregator(WindowAggregator):
+    """Window aggregator fed from a device while it has consumers."""
+
+    def __init__(self, device: Senziio, key: str, window: float) -> None:
+        """Initialize aggregator."""
+        super().__init__(window)
+        self._device = device
+        self._key = key
+        self._consumers = 0
+        self._remove_listener: Callable[[], None] | None = None
+
+    def attach(self) -> None:
+        """Register a consumer, listening to the device on first use."""
+        self._consumers += 1
+        if self._remove_listener is None:
+            self._remove_listener = self._device.add_sample_listener(
+                self._key, self.add
+            )
+
+    def detach(self) -> None:
+        """Unregister a consumer, stop listening when none is left."""
+        self._consumers -= 1
+        if self._consumers <= 0 and self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
@@ -0,0 +1,198 @@
+"""Occupancy analytics computed from Senziio thermal frames."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .entity import DOMAIN
+from .thermal import decode_frame
+
+_LOGGER = logging.getLogger(__name__)
+
+# foreground threshold above background, in hundredths of a degree
+FOREGROUND_DELTA = 150
+# temperature marking a hotspot, in hundredths of a degree
+HOTSPOT_TEMPERATURE = 5000
+# smallest blob counted as a person, in pixels
+MIN_BLOB_PIXELS = 2
+# background learning rate for background and foreground pixels
+BACKGROUND_ALPHA = 0.02
+FOREGROUND_ALPHA = 0.001
+
+# frames queued or running per worker before new frames are dropped
+FRAMES_PER_WORKER = 2
+
+
+@dataclass(frozen=True, slots=True)
+class ThermalAnalysis:
+    """Result of analysing a thermal frame."""
+
+    people_count: int
+    # hottest pixel as (row, column, centi-degrees) when above hotspot level
+    hotspot: tuple[int, int, int] | None
+
+
+def count_blobs(mask: np.ndarray, min_size: int = 1) -> int:
+    """Count 4-connected components of a boolean mask.
+
+    Every foreground pixel starts labelled with its own index, then labels
+    are propagated as neighbourhood minimums with pointer jumping until they
+    settle, all as whole-array operations.
+    """
+    if not mask.any():
+        return 0
+    height, width = mask.shape
+    background = height * width
+    labels = np.where(mask, np.arange(background).reshape(height, width), background)
+
+    while True:
+        padded = np.pad(labels, 1, constant_values=background)
+        updated = np.minimum.reduce(
+            (
+                labels,
+                padded[:-2, 1:-1],
+                padded[2:, 1:-1],
+                padded[1:-1, :-2],
+                padded[1:-1, 2:],
+            )
+        )
+        updated[~mask] = background
+        flat = updated.ravel()
+        foreground = flat < background
+        flat[foreground] = flat[flat[foreground]]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    _, sizes = np.unique(labels[mask], return_counts=True)
+    return int(np.count_nonzero(sizes >= min_size))
+
+
+class ThermalAnalyzer:
+    """Background subtraction and blob counting for one device.
+
+    Not thread safe, frames of a device must be analysed one at a time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize analyzer."""
+        self._background: np.ndarray | None = None
+
+    def analyze(self, frame: np.ndarray) -> ThermalAnalysis:
+        """Analyse a decoded frame and update the learned background."""
+        pixels = frame.astype(np.float32)
+        background = self._background
+        if background is None or background.shape != pixels.shape:
+            background = self._background = pixels.copy()
+
+        foreground = pixels - background > FOREGROUND_DELTA
+        alpha = np.where(foreground, FOREGROUND_ALPHA, BACKGROUND_ALPHA)
+        background += alpha * (pixels - background)
+
+        hotspot = None
+        hottest = int(np.argmax(frame))
+        row, column = divmod(hottest, frame.shape[1])
+        if (temperature := int(frame[row, column])) >= HOTSPOT_TEMPERATURE:
+            hotspot = (row, column, temperature)
+
+        return ThermalAnalysis(count_blobs(foreground, MIN_BLOB_PIXELS), hotspot)
+
+
+@callback
+@singleton(f"{DOMAIN}_analytics_pool")
+def async_get_analytics_pool(hass: HomeAssistant) -> ThermalAnalyticsPool:
+    """Return the shared thermal analytics pool."""
+    pool = ThermalAnalyticsPool(hass)
+
+    @callback
+    def _shutdown(event: Event) -> None:
+        pool.shutdown()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown)
+    return pool
+
+
+class ThermalAnalyticsPool:
+    """Bounded worker pool analysing thermal frames off the event loop.
+
+    At most one frame per device is analysed at a time and only the newest
+    waiting frame is kept, so slow analysis drops frames instead of queueing
+    them. NumPy releases the GIL for most array operations, which lets
+    worker threads use several cores.
+    """
+
+    def __init__(self, hass: HomeAssistant, workers: int | None = None) -> None:
+        """Initialize pool."""
+        self._hass = hass
+        self._workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._workers, thread_name_prefix=f"{DOMAIN}_analytics"
+        )
+        self._lock = threading.Lock()
+        self._running: set[str] = set()
+        self._waiting: dict[str, tuple] = {}
+        self.dropped = 0
+
+    @callback
+    def async_submit(
+        self,
+        key: str,
+        analyzer: ThermalAnalyzer,
+        payload: bytes,
+        on_result: Callable[[ThermalAnalysis], None],
+    ) -> None:
+        """Queue a raw frame for analysis, dropping stale frames under load."""
+        job = (analyzer, payload, on_result)
+        with self._lock:
+            if key in self._running:
+                if self._waiting.pop(key, None) is not None:
+                    self.dropped += 1
+                self._waiting[key] = job
+                return
+            if len(self._running) >= self._workers * FRAMES_PER_WORKER:
+                self.dropped += 1
+                return
+            self._running.add(key)
+        self._executor.submit(self._run, key, job)
+
+    @callback
+    def async_cancel(self, key: str) -> None:
+        """Drop the frame of a device waiting for analysis."""
+        with self._lock:
+            self._waiting.pop(key, None)
+
+    def _run(self, key: str, job: tuple) -> None:
+        """Analyse frames of a device until none is waiting."""
+        while True:
+            analyzer, payload, on_result = job
+            try:
+                if (frame := decode_frame(payload)) is not None:
+                    result = analyzer.analyze(frame)
+                    self._hass.loop.call_soon_threadsafe(on_result, result)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error analysing thermal frame of %s", key)
+
+            with self._lock:
+                if (job := self._waiting.pop(key, None)) is None:
+                    self._running.discard(key)
+                    return
+
+    @property
+    def queue_depth(self) -> int:
+        """Return frames being analysed or waiting, read without locking."""
+        return len(self._running) + len(self._waiting)
+
+    def shutdown(self) -> None:
+        """Stop worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
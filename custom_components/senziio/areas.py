@@ -0,0 +1,280 @@
+"""Area-level aggregates across Senziio devices."""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar, device_registry as dr
+from homeassistant.helpers.singleton import singleton
+
+from .entity import DOMAIN
+from .senziio import Senziio
+
+# metrics averaged and maximized per area
+AREA_METRICS = ("co2", "temperature", "humidity", "illuminance")
+# fused occupancy of each device, aggregated as any or all
+AREA_OCCUPANCY = "occupancy"
+
+
+class AreaAggregate:
+    """Running aggregate of the latest value of each device in an area.
+
+    The sum and count of active devices are maintained on every update, so
+    reading mean, any or all is O(1). The maximum comes from a max-heap with
+    lazy deletion: outdated entries are skipped when they reach the top and
+    the heap is rebuilt once they outnumber current values, which keeps
+    updates and reads amortized O(log n).
+    """
+
+    def __init__(self) -> None:
+        """Initialize aggregate."""
+        self.values: dict[str, float] = {}
+        self.members = 0
+        self.total = 0.0
+        self.active = 0
+        # negated values with their device, possibly outdated
+        self._heap: list[tuple[float, str]] = []
+
+    @property
+    def mean(self) -> float | None:
+        """Return mean of latest device values."""
+        return self.total / len(self.values) if self.values else None
+
+    @property
+    def max(self) -> float | None:
+        """Return maximum of latest device values."""
+        heap = self._heap
+        while heap and self.values.get(heap[0][1]) != -heap[0][0]:
+            heapq.heappop(heap)
+        return -heap[0][0] if heap else None
+
+    @property
+    def any(self) -> bool:
+        """Return whether any device in the area is active."""
+        return self.active > 0
+
+    @property
+    def all(self) -> bool:
+        """Return whether all devices in the area are active."""
+        return self.members > 0 and self.active >= self.members
+
+    def set(self, device_id: str, value: float) -> None:
+        """Set latest value of a device."""
+        old = self.values.get(device_id)
+        self.values[device_id] = value
+        if old is None:
+            self.total += value
+            self.active += value > 0
+        else:
+            self.total += value - old
+            self.active += (value > 0) - (old > 0)
+
+        if value != old:
+            heapq.heappush(self._heap, (-value, device_id))
+            self._compact()
+
+    def remove(self, device_id: str) -> None:
+        """Forget value of a device."""
+        if (old := self.values.pop(device_id, None)) is None:
+            return
+        self.active -= old > 0
+        if self.values:
+            self.total -= old
+        else:
+            # drop accumulated rounding errors
+            self.total = 0.0
+        self._compact()
+
+    def _compact(self) -> None:
+        """Rebuild the heap once outdated entries dominate it."""
+        if len(self._heap) > 2 * len(self.values) + 8:
+            self._heap = [
+                (-value, device_id) for device_id, value in self.values.items()
+            ]
+            heapq.heapify(self._heap)
+
+
+class SenziioAreaIndex:
+    """Index from areas to Senziio devices with their running aggregates.
+
+    Device samples are routed to the aggregate of the device area with a
+    dictionary lookup. The area of each device is refreshed from device and
+    area registry updates, moving its latest values between aggregates.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize index."""
+        self._hass = hass
+        self._entries: dict[str, ConfigEntry] = {}
+        self._areas: dict[str, str] = {}
+        self._latest: dict[str, dict[str, float]] = {}
+        self._aggregates: dict[tuple[str, str], AreaAggregate] = {}
+        self._listeners: dict[tuple[str, str], list[Callable[[], None]]] = {}
+        self._removal_listeners: dict[str, list[Callable[[], None]]] = {}
+        self._platforms: list[Callable[[str], None]] = []
+        self.area_ids: set[str] = set()
+
+    def aggregate(self, area_id: str, key: str) -> AreaAggregate:
+        """Return aggregate of a metric in an area."""
+        if (aggregate := self._aggregates.get((area_id, key))) is None:
+            aggregate = self._aggregates[(area_id, key)] = AreaAggregate()
+        return aggregate
+
+    @callback
+    def async_listen(
+        self, area_id: str, key: str, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen to changes of an area aggregate."""
+        listeners = self._listeners.setdefault((area_id, key), [])
+        listeners.append(listener)
+
+        @callback
+        def remove() -> None:
+            listeners.remove(listener)
+
+        return remove
+
+    @callback
+    def async_listen_removal(
+        self, area_id: str, listener: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Listen to an area being deleted from the area registry."""
+        listeners = self._removal_listeners.setdefault(area_id, [])
+        listeners.append(listener)
+
+        @callback
+        def remove() -> None:
+            if listener in listeners:
+                listeners.remove(listener)
+
+        return remove
+
+    @callback
+    def async_register_platform(self, create: Callable[[str], None]) -> None:
+        """Create area entities of a platform for current and future areas."""
+        self._platforms.append(create)
+        for area_id in self.area_ids:
+            create(area_id)
+
+    @callback
+    def async_add_device(self, entry: ConfigEntry, device: Senziio) -> Callable:
+        """Start aggregating samples of a device."""
+        self._entries[device.id] = entry
+        latest = self._latest[device.id] = {}
+        removers = [
+            device.add_sample_listener(key, self._sample_listener(device.id, key))
+            for key in (*AREA_METRICS, AREA_OCCUPANCY)
+        ]
+        self.async_refresh()
+
+        @callback
+        def remove() -> None:
+            for remover in removers:
+                remover()
+            self._entries.pop(device.id, None)
+            self._move(device.id, latest, None)
+            self._latest.pop(device.id, None)
+
+        return remove
+
+    def _sample_listener(self, device_id: str, key: str) -> Callable:
+        """Return sample listener routing values of a device metric."""
+        latest = self._latest[device_id]
+
+        @callback
+        def sample_received(timestamp: float, value) -> None:
+            if isinstance(value, bool):
+                value = float(value)
+            elif not isinstance(value, (int, float)):
+                return
+            latest[key] = value
+            if (area_id := self._areas.get(device_id)) is not None:
+                self.aggregate(area_id, key).set(device_id, value)
+                self._notify(area_id, key)
+
+        return sample_received
+
+    @callback
+    def async_area_updated(self, event: Event) -> None:
+        """Drop deleted areas and refresh device areas."""
+        if event.data.get("action") == "remove":
+            self._remove_area(event.data["area_id"])
+        self.async_refresh()
+
+    @callback
+    def async_refresh(self, event: Event | None = None) -> None:
+        """Update the area of every device from the device registry.
+
+        Areas left without devices keep their aggregates and entities, which
+        report unavailable until a device joins again.
+        """
+        dev_reg = dr.async_get(self._hass)
+        for device_id, entry in self._entries.items():
+            dev_entry = dev_reg.async_get_device(
+                identifiers={(DOMAIN, entry.data["serial-number"])}
+            )
+            area_id = dev_entry.area_id if dev_entry else None
+            if area_id != self._areas.get(device_id):
+                self._move(device_id, self._latest[device_id], area_id)
+
+    def _move(self, device_id: str, latest: dict[str, float], area_id: str | None) -> None:
+        """Move values of a device to the aggregates of another area."""
+        if (old_area := self._areas.pop(device_id, None)) is not None:
+            for key in (*AREA_METRICS, AREA_OCCUPANCY):
+                self.aggregate(old_area, key).remove(device_id)
+            self.aggregate(old_area, AREA_OCCUPANCY).members -= 1
+            self._notify_area(old_area)
+        if area_id is None:
+            return
+
+        self._areas[device_id] = area_id
+        for key, value in latest.items():
+            self.aggregate(area_id, key).set(device_id, value)
+        self.aggregate(area_id, AREA_OCCUPANCY).members += 1
+        if area_id not in self.area_ids:
+            self.area_ids.add(area_id)
+            for create in self._platforms:
+                create(area_id)
+        self._notify_area(area_id)
+
+    def _remove_area(self, area_id: str) -> None:
+        """Drop aggregates and entities of a deleted area."""
+        for device_id in [
+            device_id for device_id, area in self._areas.items() if area == area_id
+        ]:
+            del self._areas[device_id]
+        self.area_ids.discard(area_id)
+        for key in (*AREA_METRICS, AREA_OCCUPANCY):
+            self._aggregates.pop((area_id, key), None)
+        for listener in self._removal_listeners.pop(area_id, []):
+            listener()
+
+    def _notify(self, area_id: str, key: str) -> None:
+        """Call listeners of an area aggregate."""
+        for listener in self._listeners.get((area_id, key), ()):
+            listener()
+
+    def _notify_area(self, area_id: str) -> None:
+        """Call listeners of all aggregates of an area."""
+        for key in (*AREA_METRICS, AREA_OCCUPANCY):
+            self._notify(area_id, key)
+
+
+def area_name(hass: HomeAssistant, area_id: str) -> str:
+    """Return name of an area."""
+    if area := ar.async_get(hass).async_get_area(area_id):
+        return area.name
+    return area_id
+
+
+@callback
+@singleton(f"{DOMAIN}_area_index")
+def async_get_area_index(hass: HomeAssistant) -> SenziioAreaIndex:
+    """Return the index of Senziio devices by area."""
+    index = SenziioAreaIndex(hass)
+    hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, index.async_refresh)
+    hass.bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, index.async_area_updated)
+    return index
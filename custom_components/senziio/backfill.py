@@ -0,0 +1,370 @@
+"""Import of buffered device readings into long-term statistics."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections.abc import AsyncIterable, Iterable, Mapping
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    statistics_during_period,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.singleton import singleton
+
+from .entity import DOMAIN
+from .senziio import AvailabilityTracker, Senziio, SenziioHTTPError
+
+_LOGGER = logging.getLogger(__name__)
+
+# samples aggregated between two yields to the event loop
+BACKFILL_CHUNK_SIZE = 500
+# hourly rows handed to the recorder per import call
+BACKFILL_IMPORT_BATCH = 24
+# seconds after the end of an hour by which the recorder has compiled it
+COMPILE_DELAY = 300
+
+# history transfers running at once across all devices
+HISTORY_CONCURRENCY = 4
+# seconds to wait for buffered readings of a returning device before
+# pulling its history over HTTP
+HISTORY_GRACE = 30
+
+HOUR = 3600
+
+
+class _HourAccumulator:
+    """Running mean, min and max of the samples of one hour."""
+
+    __slots__ = ("total", "count", "min", "max")
+
+    def __init__(self, value: float) -> None:
+        self.total = value
+        self.count = 1
+        self.min = value
+        self.max = value
+
+    def add(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+
+
+async def async_backfill_statistics(
+    hass: HomeAssistant,
+    device_id: str,
+    key: str,
+    samples: Iterable[tuple[float, float]] | AsyncIterable[tuple[float, float]],
+    unit: str | None,
+    since: float | None = None,
+    until: float | None = None,
+    transfer: asyncio.Semaphore | None = None,
+) -> int:
+    """Import timestamped samples of a device sensor as hourly statistics.
+
+    Samples are consumed one by one and folded into hourly accumulators, so
+    memory grows with the number of covered hours, not with the sample count.
+    The transfer semaphore is only held while samples are consumed.
+
+    The gap runs from since to until, or spans the samples when not given.
+    Hours it covers completely replace what the recorder compiled for them,
+    partly covered hours are merged with the compiled row. Hours the
+    recorder has not compiled yet are waited for. Returns imported row count.
+    """
+    if "recorder" not in hass.config.components:
+        _LOGGER.debug("Recorder not loaded, skipping backfill of %s", key)
+        return 0
+    if unit is None:
+        _LOGGER.debug("Unit of %s unknown, skipping backfill", key)
+        return 0
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{device_id}_{key}"
+    )
+    if entity_id is None:
+        _LOGGER.debug("No sensor for %s of %s, skipping backfill", key, device_id)
+        return 0
+
+    # statistics are kept in the unit displayed, which may have been changed
+    state = hass.states.get(entity_id)
+    if state and state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, unit) != unit:
+        _LOGGER.debug("%s not displayed in %s, skipping backfill", entity_id, unit)
+        return 0
+
+    hours: dict[float, _HourAccumulator] = {}
+    span = [math.inf, -math.inf]
+    processed = 0
+
+    def _add(sample) -> None:
+        try:
+            timestamp, value = float(sample[0]), float(sample[1])
+        except (TypeError, ValueError, IndexError):
+            return
+        if not math.isfinite(value):
+            return
+        if (since is not None and timestamp < since) or (
+            until is not None and timestamp > until
+        ):
+            return
+        span[0] = min(span[0], timestamp)
+        span[1] = max(span[1], timestamp)
+        hour = _hour_start(timestamp)
+        if (accumulator := hours.get(hour)) is None:
+            hours[hour] = _HourAccumulator(value)
+        else:
+            accumulator.add(value)
+
+    async with transfer or nullcontext():
+        if isinstance(samples, AsyncIterable):
+            async for sample in samples:
+                _add(sample)
+                processed += 1
+                if processed % BACKFILL_CHUNK_SIZE == 0:
+                    await asyncio.sleep(0)
+        else:
+            for sample in samples:
+                _add(sample)
+                processed += 1
+                if processed % BACKFILL_CHUNK_SIZE == 0:
+                    await asyncio.sleep(0)
+
+    if not hours:
+        return 0
+    gap = (span[0] if since is None else since, span[1] if until is None else until)
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name=None,
+        source="recorder",
+        statistic_id=entity_id,
+        unit_of_measurement=unit,
+    )
+
+    # hours ending after this are not compiled by the recorder yet
+    compiled_until = datetime.now(timezone.utc).timestamp() - COMPILE_DELAY
+    compiled = sorted(
+        item for item in hours.items() if item[0] + HOUR <= compiled_until
+    )
+    pending = sorted(item for item in hours.items() if item[0] + HOUR > compiled_until)
+
+    rows = await _async_merged_rows(hass, entity_id, compiled, gap)
+    for start in range(0, len(rows), BACKFILL_IMPORT_BATCH):
+        async_import_statistics(
+            hass, metadata, rows[start : start + BACKFILL_IMPORT_BATCH]
+        )
+        await asyncio.sleep(0)
+
+    for hour, accumulator in pending:
+        delay = hour + HOUR + COMPILE_DELAY - datetime.now(timezone.utc).timestamp()
+        await asyncio.sleep(max(delay, 0))
+        row = await _async_merged_rows(hass, entity_id, [(hour, accumulator)], gap)
+        async_import_statistics(hass, metadata, row)
+        rows.extend(row)
+
+    _LOGGER.debug(
+        "Backfilled %s samples into %s hourly statistics for %s",
+        processed, len(rows), entity_id,
+    )
+    return len(rows)
+
+
+async def _async_merged_rows(
+    hass: HomeAssistant,
+    entity_id: str,
+    hours: list[tuple[float, _HourAccumulator]],
+    gap: tuple[float, float],
+) -> list[StatisticData]:
+    """Return rows of compiled hours, merged with the recorder rows.
+
+    The compiled mean of a partly covered hour is taken to describe the
+    part of the hour outside the gap and weighted by its duration.
+    """
+    partial = [hour for hour, _ in hours if hour < gap[0] or hour + HOUR > gap[1]]
+    existing: dict[float, dict] = {}
+    if partial:
+        statistics = await get_instance(hass).async_add_executor_job(
+            statistics_during_period,
+            hass,
+            datetime.fromtimestamp(partial[0], timezone.utc),
+            datetime.fromtimestamp(partial[-1] + HOUR, timezone.utc),
+            {entity_id},
+            "hour",
+            None,
+            {"mean", "min", "max"},
+        )
+        existing = {
+            row["start"]: row
+            for row in statistics.get(entity_id, [])
+            if row["start"] in partial
+        }
+
+    rows = []
+    for hour, accumulator in hours:
+        mean = accumulator.total / accumulator.count
+        low, high = accumulator.min, accumulator.max
+        row = existing.get(hour)
+        if row is not None and row.get("mean") is not None:
+            covered = (min(hour + HOUR, gap[1]) - max(hour, gap[0])) / HOUR
+            mean = row["mean"] * (1 - covered) + mean * covered
+            low = min(low, row["min"])
+            high = max(high, row["max"])
+        rows.append(
+            StatisticData(
+                start=datetime.fromtimestamp(hour, timezone.utc),
+                mean=mean,
+                min=low,
+                max=high,
+            )
+        )
+    return rows
+
+
+@callback
+@singleton(f"{DOMAIN}_history_semaphore")
+def async_get_history_semaphore(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the semaphore limiting concurrent history transfers."""
+    return asyncio.Semaphore(HISTORY_CONCURRENCY)
+
+
+async def async_backfill_history(
+    hass: HomeAssistant,
+    device: Senziio,
+    key: str,
+    unit: str | None,
+    since: float,
+    until: float,
+) -> int:
+    """Stream history of a metric from the device and import it as statistics.
+
+    Transfers wait for a fleet-wide slot, so devices coming back together do
+    not all stream at once. Returns imported row count.
+    """
+    try:
+        return await async_backfill_statistics(
+            hass,
+            device.id,
+            key,
+            device.iter_history(key, since),
+            unit,
+            since,
+            until,
+            async_get_history_semaphore(hass),
+        )
+    except SenziioHTTPError as error:
+        _LOGGER.debug(
+            "History transfer of %s from %s failed: %s", key, device.id, error
+        )
+        return 0
+
+
+class SenziioBackfill:
+    """Fill the gaps of a device in long-term statistics from one source.
+
+    Readings buffered by the device while offline arrive over MQTT. Once a
+    device is back, its stored history is pulled over HTTP for metrics
+    whose buffered readings do not reach back to the start of the gap, so
+    the two transfers never import the same hours.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        device: Senziio,
+        units: Mapping[str, str | None],
+    ) -> None:
+        """Initialize backfill."""
+        self._hass = hass
+        self._entry = entry
+        self._device = device
+        self._units = units
+        # first and last timestamps imported per metric, by source
+        self._buffered: dict[str, tuple[float, float]] = {}
+        self._pulled: dict[str, tuple[float, float]] = {}
+        self._cancel_pull: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_handle_buffered(self, key: str, samples: list) -> None:
+        """Import readings the device buffered while offline."""
+        timestamps = [
+            sample[0]
+            for sample in samples
+            if isinstance(sample, list | tuple)
+            and sample
+            and isinstance(sample[0], int | float)
+        ]
+        if not timestamps:
+            return
+        first, last = min(timestamps), max(timestamps)
+        pulled = self._pulled.get(key)
+        if pulled and pulled[0] <= first and last <= pulled[1]:
+            _LOGGER.debug("History of %s already pulled, ignoring buffer", key)
+            return
+        self._buffered[key] = (first, last)
+        self._entry.async_create_background_task(
+            self._hass,
+            async_backfill_statistics(
+                self._hass, self._device.id, key, samples, self._units.get(key)
+            ),
+            f"{DOMAIN} backfill {self._device.id} {key}",
+        )
+
+    @callback
+    def async_handle_returned(self, since: float, until: float) -> None:
+        """Pull history of the gap once buffered readings had time to arrive."""
+        if self._device.http is None:
+            return
+        self.async_shutdown()
+
+        @callback
+        def _pull(now: datetime) -> None:
+            self._cancel_pull = None
+            self._async_pull_history(since, until)
+
+        self._cancel_pull = async_call_later(self._hass, HISTORY_GRACE, _pull)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel a pending history pull."""
+        if self._cancel_pull is not None:
+            self._cancel_pull()
+            self._cancel_pull = None
+
+    @callback
+    def _async_pull_history(self, since: float, until: float) -> None:
+        """Pull history of metrics not covered by buffered readings."""
+        for key, unit in self._units.items():
+            buffered = self._buffered.get(key)
+            # the first buffered reading follows the last one seen shortly
+            if (
+                buffered
+                and buffered[0] <= since + AvailabilityTracker.OFFLINE_AFTER
+                and buffered[1] >= since
+            ):
+                continue
+            self._pulled[key] = (since, until)
+            self._entry.async_create_background_task(
+                self._hass,
+                async_backfill_history(
+                    self._hass, self._device, key, unit, since, until
+                ),
+                f"{DOMAIN} history {self._device.id} {key}",
+            )
+
+
+def _hour_start(timestamp: float) -> float:
+    """Return start of the hour containing timestamp."""
+    return timestamp - timestamp % HOUR
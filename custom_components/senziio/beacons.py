@@ -0,0 +1,173 @@
+"""Fleet-wide beacon tracking across Senziio devices."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.singleton import singleton
+
+from .entity import DOMAIN
+
+SENZIIO_BEACON_MOVED_EVENT = "senziio_beacon_moved"
+
+# weight of a new advertisement in the smoothed RSSI
+RSSI_ALPHA = 0.3
+# smoothed RSSI advantage in dB needed to move a beacon to another device
+ROOM_HYSTERESIS = 3.0
+# seconds without advertisements before a device stops seeing a beacon
+BEACON_TIMEOUT = 60
+EXPIRE_INTERVAL = timedelta(seconds=15)
+
+
+@dataclass(slots=True)
+class BeaconSighting:
+    """Smoothed signal of a beacon as seen by one device."""
+
+    rssi: float
+    last_seen: float
+
+
+class BeaconTable:
+    """Index of beacon sightings resolving each beacon to its nearest device.
+
+    Sightings are kept in a hash table by beacon ID, so an advertisement
+    costs a lookup plus a scan of the few devices hearing that beacon.
+    Listeners are only called when the set of beacons nearest to a device
+    changes, not for every advertisement.
+    """
+
+    def __init__(self, on_move: Callable[[str, str | None, str | None], None]) -> None:
+        """Initialize table."""
+        self._on_move = on_move
+        self._sightings: dict[str, dict[str, BeaconSighting]] = {}
+        self._rooms: dict[str, str] = {}
+        self._members: dict[str, set[str]] = {}
+        self._listeners: dict[str, Callable[[], None]] = {}
+
+    def beacons(self, device_id: str) -> set[str]:
+        """Return beacons whose nearest device is device_id."""
+        return self._members.get(device_id, set())
+
+    def room(self, beacon_id: str) -> str | None:
+        """Return device nearest to a beacon."""
+        return self._rooms.get(beacon_id)
+
+    @callback
+    def async_listen(self, device_id: str, listener: Callable[[], None]) -> Callable:
+        """Listen to changes of beacons nearest to a device."""
+        self._listeners[device_id] = listener
+
+        @callback
+        def remove() -> None:
+            if self._listeners.get(device_id) is listener:
+                del self._listeners[device_id]
+
+        return remove
+
+    @callback
+    def async_update(
+        self, device_id: str, beacon_id: str, rssi: float, now: float | None = None
+    ) -> None:
+        """Record an advertisement heard by a device."""
+        now = time.monotonic() if now is None else now
+        sightings = self._sightings.setdefault(beacon_id, {})
+        if (sighting := sightings.get(device_id)) is None:
+            sightings[device_id] = BeaconSighting(rssi, now)
+        else:
+            sighting.rssi += RSSI_ALPHA * (rssi - sighting.rssi)
+            sighting.last_seen = now
+        self._resolve(beacon_id, now)
+
+    @callback
+    def async_expire(self, now: float | None = None) -> None:
+        """Forget sightings not refreshed within the timeout."""
+        now = time.monotonic() if now is None else now
+        oldest = now - BEACON_TIMEOUT
+        for beacon_id, sightings in list(self._sightings.items()):
+            for device_id in [
+                device_id
+                for device_id, sighting in sightings.items()
+                if sighting.last_seen < oldest
+            ]:
+                del sightings[device_id]
+            if not sightings:
+                del self._sightings[beacon_id]
+            self._resolve(beacon_id, now)
+
+    @callback
+    def async_remove_device(self, device_id: str) -> None:
+        """Forget all sightings of a device."""
+        now = time.monotonic()
+        for beacon_id, sightings in list(self._sightings.items()):
+            if sightings.pop(device_id, None) is not None:
+                if not sightings:
+                    del self._sightings[beacon_id]
+                self._resolve(beacon_id, now)
+        self._members.pop(device_id, None)
+
+    def _resolve(self, beacon_id: str, now: float) -> None:
+        """Update nearest device of a beacon."""
+        oldest = now - BEACON_TIMEOUT
+        current = self._rooms.get(beacon_id)
+        sightings = self._sightings.get(beacon_id, {})
+
+        nearest = None
+        best = float("-inf")
+        for device_id, sighting in sightings.items():
+            if sighting.last_seen >= oldest and sighting.rssi > best:
+                nearest, best = device_id, sighting.rssi
+
+        if nearest == current:
+            return
+        if (
+            nearest is not None
+            and current is not None
+            and (held := sightings.get(current)) is not None
+            and held.last_seen >= oldest
+            and best - held.rssi < ROOM_HYSTERESIS
+        ):
+            return
+
+        if current is not None:
+            self._members[current].discard(beacon_id)
+            if not self._members[current]:
+                del self._members[current]
+        if nearest is None:
+            del self._rooms[beacon_id]
+        else:
+            self._rooms[beacon_id] = nearest
+            self._members.setdefault(nearest, set()).add(beacon_id)
+
+        self._on_move(beacon_id, current, nearest)
+        for device_id in (current, nearest):
+            if device_id is not None and (listener := self._listeners.get(device_id)):
+                listener()
+
+
+@callback
+@singleton(f"{DOMAIN}_beacon_table")
+def async_get_beacon_table(hass: HomeAssistant) -> BeaconTable:
+    """Return the fleet-wide beacon table."""
+
+    @callback
+    def _beacon_moved(
+        beacon_id: str, from_device: str | None, to_device: str | None
+    ) -> None:
+        hass.bus.async_fire(
+            SENZIIO_BEACON_MOVED_EVENT,
+            {"beacon_id": beacon_id, "from": from_device, "to": to_device},
+        )
+
+    table = BeaconTable(_beacon_moved)
+
+    @callback
+    def _expire(now: datetime) -> None:
+        table.async_expire()
+
+    async_track_time_interval(hass, _expire, EXPIRE_INTERVAL, cancel_on_shutdown=True)
+    return table
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 
 from homeassistant.components.binary_sensor import (
@@ -11,13 +12,20 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.components.mqtt import async_subscribe
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.json import json_loads_object
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
+from .areas import AREA_OCCUPANCY, SenziioAreaIndex, area_name, async_get_area_index
 from .entity import DOMAIN, SenziioEntity
+from .fusion import FUSION_INPUTS, OccupancyFusion
+from .history import SampleBuffer, async_get_history_buffers
+from .metrics import DROPS, STATE_WRITES
 from .senziio import Senziio
+from .tracing import async_get_tracer
+from .utils import decode_sample
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -87,15 +95,41 @@ async def async_setup_entry(
             return {"new_unique_id": f"{device.id}_camera"}
         return None
 
-    await er.async_migrate_entries(hass, entry.entry_id, _migrator)
+    with async_get_tracer(hass).span("migrate_entries", device.id):
+        await er.async_migrate_entries(hass, entry.entry_id, _migrator)
 
     # register entities
     async_add_entities([
         SenziioBinarySensorEntity(hass, descr, entry, device)
         for descr in BINARY_SENSOR_DESCRIPTIONS
     ])
+    async_add_entities([SenziioOccupancyFusionEntity(entry, device)])
 
 
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up Senziio area binary_sensor entities."""
+    if discovery_info is None:
+        return
+
+    index = async_get_area_index(hass)
+
+    @callback
+    def _create_area_entities(area_id: str) -> None:
+        name = area_name(hass, area_id)
+        async_add_entities(
+            [
+                SenziioAreaOccupancyEntity(index, area_id, name, mode)
+                for mode in ("any", "all")
+            ]
+        )
+
+    index.async_register_platform(_create_area_entities)
+
 
 class SenziioBinarySensorEntity(SenziioEntity, BinarySensorEntity):
     """Senziio binary sensor entity."""
@@ -113,16 +147,163 @@ class SenziioBinarySensorEntity(SenziioEntity, BinarySensorEntity):
         self.entity_description = entity_description
         self._attr_unique_id = f"{device.id}_{entity_description.key}"
         self._hass = hass
+        self._device = device
         self._dt_topic = device.entity_topic(entity_description.key)
+        self._history = SampleBuffer(delta_encoding=True)
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to MQTT data event."""
+        async_get_history_buffers(self.hass)[self.entity_id] = self._history
+        metrics = self._device.metrics.topic(self.entity_description.key)
+        counters = metrics.counters
 
         @callback
         def message_received(message):
             """Handle new MQTT messages."""
-            data = json_loads_object(message.payload)
-            self._attr_is_on = data.get(self.entity_description.value_key) is True
+            start = metrics.start()
+            value, seq, ts = decode_sample(
+                message.payload, self.entity_description.value_key
+            )
+            metrics.decoded(start)
+            if not self._device.accept_sample(self.entity_description.key, seq, ts):
+                counters[DROPS] += 1
+                return
+            self._attr_is_on = value is True
+            # device clocks may be off, samples are kept in local time
+            timestamp = time.time()
+            self._history.append(timestamp, self._attr_is_on)
+            self._device.dispatch_sample(
+                self.entity_description.key, timestamp, self._attr_is_on
+            )
+            self.async_write_ha_state()
+            counters[STATE_WRITES] += 1
+            metrics.handled(start)
+
+        with async_get_tracer(self.hass).span(
+            "subscribe", self._device.id, topic=self._dt_topic
+        ):
+            await async_subscribe(self._hass, self._dt_topic, message_received, 1)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release buffered samples."""
+        async_get_history_buffers(self.hass).pop(self.entity_id, None)
+
+
+class SenziioOccupancyFusionEntity(SenziioEntity, BinarySensorEntity):
+    """Occupancy fused from all presence inputs of a Senziio device.
+
+    Each input sample adjusts a running weighted score instead of
+    re-evaluating every input, and state is only written when occupancy
+    changes. Weights, hold times and threshold come from entry options.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.OCCUPANCY
+    _attr_name = "Occupancy"
+    _attr_translation_key = "occupancy"
+
+    def __init__(self, entry: ConfigEntry, device: Senziio) -> None:
+        """Initialize entity."""
+        super().__init__(entry)
+        self.entity_id = f"binary_sensor.senziio_occupancy_{device.id}"
+        self._attr_unique_id = f"{device.id}_occupancy"
+        self._attr_is_on = False
+        self._device = device
+        self._fusion = OccupancyFusion.from_options(entry.options)
+        self._cancel_expiry: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to occupancy inputs and option changes."""
+        for key in FUSION_INPUTS:
+            self.async_on_remove(
+                self._device.add_sample_listener(key, self._input_listener(key))
+            )
+        self.async_on_remove(
+            self.entry.add_update_listener(self._async_options_updated)
+        )
+        self.async_on_remove(self._async_cancel_expiry)
+
+    def _input_listener(self, key: str):
+        """Return sample listener of an input."""
+
+        @callback
+        def sample_received(timestamp: float, value) -> None:
+            self._fusion.update(key, value is True, time.monotonic())
+            self._async_refresh()
+
+        return sample_received
+
+    async def _async_options_updated(
+        self, hass: HomeAssistant, entry: ConfigEntry
+    ) -> None:
+        """Apply new fusion options to current inputs."""
+        self._fusion.apply_options(entry.options)
+        self._async_refresh()
+
+    @callback
+    def _async_refresh(self, *_) -> None:
+        """Write state if occupancy changed and schedule the next expiry."""
+        self._async_cancel_expiry()
+        self._fusion.expire(time.monotonic())
+        if (expiry := self._fusion.next_expiry) is not None:
+            self._cancel_expiry = async_call_later(
+                self.hass, max(expiry - time.monotonic(), 0), self._async_refresh
+            )
+        if self._fusion.occupied != self._attr_is_on:
+            self._attr_is_on = self._fusion.occupied
+            self._device.dispatch_sample(AREA_OCCUPANCY, time.time(), self._attr_is_on)
             self.async_write_ha_state()
 
-        await async_subscribe(self._hass, self._dt_topic, message_received, 1)
+    @callback
+    def _async_cancel_expiry(self) -> None:
+        """Cancel pending expiry of held inputs."""
+        if self._cancel_expiry is not None:
+            self._cancel_expiry()
+            self._cancel_expiry = None
+
+
+class SenziioAreaOccupancyEntity(BinarySensorEntity):
+    """Binary sensor entity reporting whether any or all devices of an area
+    detect occupancy.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.OCCUPANCY
+    _attr_should_poll = False
+
+    def __init__(
+        self, index: SenziioAreaIndex, area_id: str, name: str, mode: str
+    ) -> None:
+        """Initialize entity."""
+        self.entity_id = f"binary_sensor.senziio_area_{area_id}_occupancy_{mode}"
+        self._attr_name = f"{name} Occupancy {mode}"
+        self._attr_unique_id = f"area_{area_id}_occupancy_{mode}"
+        self._index = index
+        self._area_id = area_id
+        self._mode = mode
+
+    async def async_added_to_hass(self) -> None:
+        """Follow area occupancy."""
+        self.async_on_remove(
+            self._index.async_listen(self._area_id, AREA_OCCUPANCY, self._async_update)
+        )
+        self.async_on_remove(
+            self._index.async_listen_removal(self._area_id, self._async_area_removed)
+        )
+        self._async_update(write=False)
+
+    @callback
+    def _async_area_removed(self) -> None:
+        """Remove the entity once its area is deleted."""
+        er.async_get(self.hass).async_remove(self.entity_id)
+
+    @callback
+    def _async_update(self, write: bool = True) -> None:
+        """Write state when area occupancy changes."""
+        aggregate = self._index.aggregate(self._area_id, AREA_OCCUPANCY)
+        is_on = getattr(aggregate, self._mode)
+        available = aggregate.members > 0
+        if is_on == self._attr_is_on and available == self._attr_available:
+            return
+        self._attr_is_on = is_on
+        self._attr_available = available
+        if write:
+            self.async_write_ha_state()
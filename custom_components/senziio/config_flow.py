@@ -3,34 +3,94 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Collection, Container
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.components import zeroconf
-from homeassistant.const import CONF_FRIENDLY_NAME, CONF_MODEL, CONF_UNIQUE_ID
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_DEVICES,
+    CONF_FRIENDLY_NAME,
+    CONF_HOST,
+    CONF_MODEL,
+    CONF_PORT,
+    CONF_UNIQUE_ID,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
 from homeassistant.exceptions import HomeAssistantError
-
-from . import MQTTError, SenziioHAMQTT
-from .entity import DOMAIN, MANUFACTURER
+from homeassistant.helpers import config_validation as cv, selector
+
+from . import MQTTError, SenziioHAHTTP, SenziioHAMQTT
+from .entity import CONF_PENDING_VERIFICATION, DOMAIN, MANUFACTURER
+from .fusion import (
+    CONF_FUSION_THRESHOLD,
+    DEFAULT_HOLDS,
+    DEFAULT_THRESHOLD,
+    DEFAULT_WEIGHTS,
+    FUSION_INPUTS,
+    hold_option,
+    weight_option,
+)
+from .reporting import (
+    CONF_INTERVAL,
+    CONF_REPORTING,
+    CONF_THRESHOLDS,
+    REPORTING_SCHEMA,
+)
+from .rules import CONF_RULES, RULES_SCHEMA
 from .senziio import Senziio
 
 _LOGGER = logging.getLogger(__name__)
 
 _input_type = vol.All(str, vol.Strip)
 
+# seconds to collect answers to a fleet-wide info request
+SWEEP_WINDOW = 3
+
+# Zeroconf TXT properties carrying device info
+TXT_DEVICE_INFO = {
+    "fw": "fw-version",
+    "hw": "hw-version",
+    "mac": "mac-address",
+}
+# seconds during which announcements of a configured device are ignored
+ZEROCONF_SEEN_TTL = 300
+
 
 class SenziioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flows for Senziio Sensor."""
 
     VERSION = 1
 
+    _address: dict[str, Any]
+    _advertised_info: dict[str, str]
+    _discovered: dict[str, dict[str, Any]]
+    _selected: list[str]
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> SenziioOptionsFlow:
+        """Get the options flow for this handler."""
+        return SenziioOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
         """Handle Senziio user setup."""
+        return self.async_show_menu(
+            step_id="user", menu_options=["manual", "discover_all"]
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Handle manual setup of a Senziio device."""
         errors: dict[str, str] = {}
 
         device_id = ""
@@ -71,7 +131,109 @@ class SenziioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         return self.async_show_form(
-            step_id="user", data_schema=step_user_data_schema, errors=errors
+            step_id="manual", data_schema=step_user_data_schema, errors=errors
+        )
+
+    async def async_step_discover_all(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Discover all responding devices and select the ones to adopt."""
+        if user_input is not None:
+            self._selected = user_input[CONF_DEVICES]
+            return await self.async_step_discover_all_confirm()
+
+        try:
+            devices = await Senziio.discover(SenziioHAMQTT(self.hass), SWEEP_WINDOW)
+        except MQTTError:
+            return self.async_abort(reason="mqtt_error")
+
+        configured = self._async_current_ids(include_ignore=True)
+        self._discovered = {}
+        for device_id, info in devices.items():
+            if device_id in configured:
+                continue
+            # the model cannot be recovered from the lowercased topic
+            if not isinstance(info.get(CONF_MODEL), str) or not info[CONF_MODEL]:
+                _LOGGER.warning(
+                    "Skipping Senziio device %s, its device info has no model",
+                    device_id,
+                )
+                continue
+            self._discovered[device_id] = info
+        if not self._discovered:
+            return self.async_abort(reason="no_devices_found")
+
+        options = {
+            device_id: f"{info[CONF_MODEL]} {device_id}"
+            for device_id, info in sorted(self._discovered.items())
+        }
+        return self.async_show_form(
+            step_id="discover_all",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_DEVICES, default=list(options)): cv.multi_select(
+                        options
+                    ),
+                }
+            ),
+            description_placeholders={"count": str(len(options))},
+        )
+
+    async def async_step_discover_all_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Confirm adding the selected devices."""
+        if user_input is not None:
+            for device_id in self._selected:
+                await self.hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                    data={CONF_UNIQUE_ID: device_id, **self._discovered[device_id]},
+                )
+            return self.async_abort(
+                reason="devices_added",
+                description_placeholders={"count": str(len(self._selected))},
+            )
+
+        devices = "\n".join(
+            f"* {self._discovered[device_id][CONF_MODEL]} **{device_id}**"
+            for device_id in sorted(self._selected)
+        )
+        return self.async_show_form(
+            step_id="discover_all_confirm",
+            description_placeholders={
+                "count": str(len(self._selected)),
+                "devices": devices,
+            },
+        )
+
+    async def async_step_integration_discovery(
+        self, discovery_info: dict[str, Any]
+    ) -> config_entries.ConfigFlowResult:
+        """Add a device selected in a discovery sweep."""
+        device_id = discovery_info[CONF_UNIQUE_ID]
+        await self.async_set_unique_id(device_id)
+        self._abort_if_unique_id_configured()
+
+        self.context[CONF_MODEL] = discovery_info[CONF_MODEL]
+        friendly_name = self._get_friendly_name()
+        return self.async_create_entry(
+            title=friendly_name,
+            data={
+                CONF_FRIENDLY_NAME: friendly_name,
+                "serial-number": device_id,
+                **discovery_info,
+            },
+        )
+
+    async def async_step_import(
+        self, import_data: dict[str, Any]
+    ) -> config_entries.ConfigFlowResult:
+        """Add a device validated by a manifest import."""
+        await self.async_set_unique_id(import_data[CONF_UNIQUE_ID])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=import_data[CONF_FRIENDLY_NAME], data=import_data
         )
 
     async def async_step_zeroconf(
@@ -80,13 +242,31 @@ class SenziioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle Senziio device discovered via Zeroconf."""
         _LOGGER.info("Discovered Senziio device via Zeroconf")
 
-        device_id = discovery_info.properties["device_id"]
+        properties = discovery_info.properties
+        device_id = properties["device_id"]
+        address = {CONF_HOST: discovery_info.host, CONF_PORT: discovery_info.port}
+
+        # skip repeated announcements of configured devices
+        seen = _async_get_seen_devices(self.hass)
+        key = (device_id, discovery_info.host, discovery_info.port)
+        now = time.monotonic()
+        if now - seen.get(key, -ZEROCONF_SEEN_TTL) < ZEROCONF_SEEN_TTL:
+            return self.async_abort(reason="already_configured")
 
         await self.async_set_unique_id(device_id)
-        self._abort_if_unique_id_configured()
+        if self.hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, device_id):
+            seen[key] = now
+        # refresh cached address of configured devices
+        self._abort_if_unique_id_configured(updates=address)
 
         self.context[CONF_UNIQUE_ID] = device_id
-        self.context[CONF_MODEL] = discovery_info.properties["device_model"]
+        self.context[CONF_MODEL] = properties["device_model"]
+        self._address = address
+        self._advertised_info = {
+            info_key: properties[txt_key]
+            for txt_key, info_key in TXT_DEVICE_INFO.items()
+            if properties.get(txt_key)
+        }
 
         return await self.async_step_zeroconf_confirm()
 
@@ -103,10 +283,14 @@ class SenziioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 CONF_UNIQUE_ID: device_id,
                 CONF_MODEL: self.context[CONF_MODEL],
                 CONF_FRIENDLY_NAME: friendly_name,
+                **self._address,
             }
 
             try:
-                data = await validate_input(self.hass, data_input)
+                if len(self._advertised_info) == len(TXT_DEVICE_INFO):
+                    data = self._advertised_entry_data(data_input)
+                else:
+                    data = await validate_input(self.hass, data_input)
             except MQTTError:
                 errors["base"] = "mqtt_error"
             except CannotConnect:
@@ -141,36 +325,215 @@ class SenziioConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
-    def _get_friendly_name(self):
+    def _advertised_entry_data(self, data_input: dict[str, Any]) -> dict[str, Any]:
+        """Build entry data from advertised device info.
+
+        The device is verified over MQTT in the background once set up.
+        """
+        friendly_name = _sanitize(data_input[CONF_FRIENDLY_NAME])
+        if any(entry.title == friendly_name for entry in self._async_current_entries()):
+            raise RepeatedTitle
+        return {
+            **data_input,
+            CONF_FRIENDLY_NAME: friendly_name,
+            "serial-number": data_input[CONF_UNIQUE_ID],
+            **self._advertised_info,
+            CONF_PENDING_VERIFICATION: True,
+        }
+
+    def _get_friendly_name(self, used_titles: Collection[str] | None = None):
         """Get a unique friendly name to display as device title."""
-        used_titles = {
-            entry.title for entry in self._async_current_entries(include_ignore=True)
+        if used_titles is None:
+            used_titles = {
+                entry.title
+                for entry in self._async_current_entries(include_ignore=True)
+            }
+        return unique_friendly_name(used_titles, self.context.get(CONF_MODEL))
+
+
+@callback
+@singleton(f"{DOMAIN}_zeroconf_seen")
+def _async_get_seen_devices(hass: HomeAssistant) -> dict[tuple, float]:
+    """Return when configured devices were last announced, by address."""
+    return {}
+
+
+def unique_friendly_name(used_titles: Collection[str], model: str | None = None) -> str:
+    """Get a friendly name not in used titles.
+
+    Bulk callers keep one set of used titles and add each new name to it,
+    instead of collecting entry titles for every device.
+    """
+    prefix = MANUFACTURER
+    if model:
+        prefix = f"{MANUFACTURER} {model}"
+    number = len(used_titles) + 1
+    while (title := f"{prefix} {number}") in used_titles:
+        number += 1
+    return title
+
+
+class SenziioOptionsFlow(config_entries.OptionsFlow):
+    """Handle Senziio options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage Senziio options."""
+        return self.async_show_menu(
+            step_id="init", menu_options=["fusion", "rules", "reporting"]
+        )
+
+    async def async_step_fusion(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage occupancy fusion options."""
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**self.config_entry.options, **user_input}
+            )
+
+        options = self.config_entry.options
+        weight = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, max=1, step=0.05, mode=selector.NumberSelectorMode.SLIDER
+            )
+        )
+        hold = selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=3600,
+                unit_of_measurement="s",
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        )
+        schema: dict[Any, Any] = {
+            vol.Required(
+                CONF_FUSION_THRESHOLD,
+                default=options.get(CONF_FUSION_THRESHOLD, DEFAULT_THRESHOLD),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0.05, max=6, step=0.05, mode=selector.NumberSelectorMode.BOX
+                )
+            ),
         }
-        prefix = MANUFACTURER
-        if model := self.context.get(CONF_MODEL):
-            prefix = f"{MANUFACTURER} {model}"
-        number = len(used_titles) + 1
-        while (title := f"{prefix} {number}") in used_titles:
-            number += 1
-        return title
+        for key in FUSION_INPUTS:
+            schema[
+                vol.Required(
+                    weight_option(key),
+                    default=options.get(weight_option(key), DEFAULT_WEIGHTS[key]),
+                )
+            ] = weight
+            schema[
+                vol.Required(
+                    hold_option(key),
+                    default=options.get(hold_option(key), DEFAULT_HOLDS[key]),
+                )
+            ] = hold
+
+        return self.async_show_form(step_id="fusion", data_schema=vol.Schema(schema))
+
+    async def async_step_rules(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage local threshold rules."""
+        errors: dict[str, str] = {}
+        rules = self.config_entry.options.get(CONF_RULES, [])
+
+        if user_input is not None:
+            rules = user_input.get(CONF_RULES) or []
+            try:
+                rules = RULES_SCHEMA(rules)
+            except vol.Invalid:
+                errors[CONF_RULES] = "invalid_rules"
+            else:
+                return self.async_create_entry(
+                    data={**self.config_entry.options, CONF_RULES: rules}
+                )
+
+        return self.async_show_form(
+            step_id="rules",
+            data_schema=vol.Schema(
+                {vol.Optional(CONF_RULES, default=rules): selector.ObjectSelector()}
+            ),
+            errors=errors,
+        )
+
+    async def async_step_reporting(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage device-side reporting interval and change thresholds."""
+        errors: dict[str, str] = {}
+        reporting = self.config_entry.options.get(CONF_REPORTING, {})
+
+        if user_input is not None:
+            reporting = {
+                key: value for key, value in user_input.items() if value is not None
+            }
+            try:
+                reporting = REPORTING_SCHEMA(reporting)
+            except vol.Invalid:
+                errors[CONF_THRESHOLDS] = "invalid_thresholds"
+            else:
+                # sent to the device by the entry update listener
+                return self.async_create_entry(
+                    data={**self.config_entry.options, CONF_REPORTING: reporting}
+                )
+
+        return self.async_show_form(
+            step_id="reporting",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_INTERVAL,
+                        description={"suggested_value": reporting.get(CONF_INTERVAL)},
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1,
+                            max=86400,
+                            unit_of_measurement="s",
+                            mode=selector.NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_THRESHOLDS, default=reporting.get(CONF_THRESHOLDS, {})
+                    ): selector.ObjectSelector(),
+                }
+            ),
+            errors=errors,
+        )
 
 
 async def validate_input(
-    hass: HomeAssistant, data_input: dict[str, Any]
+    hass: HomeAssistant,
+    data_input: dict[str, Any],
+    existing_titles: Container[str] | None = None,
 ) -> dict[str, Any]:
-    """Validate input data."""
+    """Validate input data.
+
+    Callers validating many devices pass the titles of existing entries.
+    """
     # check friendly name is unique
     friendly_name = _sanitize(data_input[CONF_FRIENDLY_NAME])
-    existing_titles = {
-        entry.title for entry in hass.config_entries.async_entries(DOMAIN)
-    }
+    if existing_titles is None:
+        existing_titles = {
+            entry.title for entry in hass.config_entries.async_entries(DOMAIN)
+        }
     if friendly_name in existing_titles:
         raise RepeatedTitle
 
     # validate device response
     device_id = _sanitize(data_input[CONF_UNIQUE_ID])
     device_model = _sanitize(data_input[CONF_MODEL])
-    device = Senziio(device_id, device_model, mqtt=SenziioHAMQTT(hass))
+    address = {
+        key: data_input[key] for key in (CONF_HOST, CONF_PORT) if data_input.get(key)
+    }
+    device = Senziio(
+        device_id,
+        device_model,
+        mqtt=SenziioHAMQTT(hass),
+        http=SenziioHAHTTP.from_entry_data(hass, address),
+    )
     device_info = await device.get_info()
 
     if not device_info:
@@ -180,6 +543,7 @@ async def validate_input(
         CONF_UNIQUE_ID: device_id,
         CONF_MODEL: device_model,
         CONF_FRIENDLY_NAME: friendly_name,
+        **address,
         **device_info,
     }
 
@@ -0,0 +1,43 @@
+"""Diagnostics support for Senziio."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .entity import DOMAIN
+from .senziio import Senziio
+from .tracing import async_get_tracer
+
+TO_REDACT = {CONF_HOST, "mac-address"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics of a config entry."""
+    device: Senziio | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+    }
+    if device is None:
+        return diagnostics
+
+    diagnostics["connection"] = {
+        "last_seen": device.availability.last_seen,
+        "rtt": device.rtt.srtt,
+        "rtt_deviation": device.rtt.rttvar,
+        "timeout": device.rtt.timeout,
+        "gap_rate": device.gap_rate,
+        "loss_rate": device.loss_rate,
+    }
+    diagnostics["metrics"] = device.metrics.as_dict()
+    diagnostics["startup_trace"] = async_get_tracer(hass).chrome_trace(device.id)
+    return diagnostics
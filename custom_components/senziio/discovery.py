@@ -0,0 +1,132 @@
+"""Discovery of Senziio metrics not covered by known entity descriptions."""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections.abc import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+from homeassistant.helpers.storage import Store
+
+from .entity import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.discovered_metrics"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# minimum seconds between two new entities for the same device
+DISCOVERY_RATE_LIMIT = 30
+# maximum number of discovered entities per device
+DISCOVERY_MAX_ENTITIES = 20
+
+_VALID_KEY = re.compile(r"^[a-z0-9][a-z0-9_-]{0,31}$")
+
+
+@singleton(f"{DOMAIN}_discovery_index")
+async def async_get_discovery_index(hass: HomeAssistant) -> SenziioDiscoveryIndex:
+    """Get the shared discovery index, loading it on first use."""
+    index = SenziioDiscoveryIndex(hass)
+    await index.async_load()
+    return index
+
+
+class SenziioDiscoveryIndex:
+    """Persisted index of metric keys discovered per device."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize index."""
+        self._store: Store[dict[str, list[str]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._keys: dict[str, list[str]] = {}
+
+    async def async_load(self) -> None:
+        """Load index from storage."""
+        if data := await self._store.async_load():
+            self._keys = data
+
+    def keys(self, device_id: str) -> list[str]:
+        """Return metric keys discovered for a device."""
+        return list(self._keys.get(device_id, ()))
+
+    @callback
+    def async_add(self, device_id: str, key: str) -> None:
+        """Record a discovered metric key."""
+        keys = self._keys.setdefault(device_id, [])
+        if key not in keys:
+            keys.append(key)
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_remove_device(self, device_id: str) -> None:
+        """Forget all keys discovered for a device."""
+        if self._keys.pop(device_id, None) is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[str]]:
+        """Return data to persist."""
+        return self._keys
+
+
+class SenziioMetricDiscovery:
+    """Create entities for unseen metric topics of a single device.
+
+    New entities are rate limited and capped per device so a misbehaving
+    firmware cannot flood the entity registry.
+    """
+
+    def __init__(
+        self,
+        index: SenziioDiscoveryIndex,
+        device_id: str,
+        create_entities: Callable[[list[str]], None],
+    ) -> None:
+        """Initialize discovery for a device."""
+        self._index = index
+        self._device_id = device_id
+        self._create_entities = create_entities
+        self._count = len(index.keys(device_id))
+        self._last_created: float | None = None
+
+    @callback
+    def async_restore(self) -> None:
+        """Create entities for keys discovered in previous runs."""
+        if keys := self._index.keys(self._device_id):
+            self._create_entities(keys)
+
+    @callback
+    def async_handle_key(self, key: str) -> bool:
+        """Handle an unseen metric key.
+
+        Return False when the key should be retried on a later message.
+        """
+        if not _VALID_KEY.match(key):
+            _LOGGER.debug("Ignoring invalid metric topic %s", key)
+            return True
+
+        if self._count >= DISCOVERY_MAX_ENTITIES:
+            _LOGGER.warning(
+                "Ignoring metric %s from %s, limit of %s discovered entities reached",
+                key, self._device_id, DISCOVERY_MAX_ENTITIES,
+            )
+            return True
+
+        now = time.monotonic()
+        if (
+            self._last_created is not None
+            and now - self._last_created < DISCOVERY_RATE_LIMIT
+        ):
+            return False
+
+        _LOGGER.info("Discovered new metric %s from %s", key, self._device_id)
+        self._last_created = now
+        self._count += 1
+        self._index.async_add(self._device_id, key)
+        self._create_entities([key])
+        return True
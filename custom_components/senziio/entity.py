@@ -7,6 +7,9 @@ from homeassistant.helpers.entity import Entity
 
 DOMAIN = "senziio"
 MANUFACTURER = "Senziio"
+CONF_AREA = "area"
+# set on entries created from advertised properties until the device answers
+CONF_PENDING_VERIFICATION = "pending-verification"
 
 
 class SenziioEntity(Entity):
@@ -40,4 +43,5 @@ class SenziioEntity(Entity):
             sw_version=sw_version,
             serial_number=serial_number,
             connections=connections,
+            suggested_area=self.entry.data.get(CONF_AREA),
         )
@@ -11,7 +11,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util.json import json_loads_object
 
 from .entity import DOMAIN, MANUFACTURER
+from .metrics import DEDUPES, DROPS, STATE_WRITES
 from .senziio import Senziio
+from .tracing import async_get_tracer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,24 +54,31 @@ class SenziioEvent(EventEntity):
 
     async def async_added_to_hass(self) -> None:
         topic = self._device.entity_topic("event")
+        metrics = self._device.metrics.topic("event")
+        counters = metrics.counters
 
         @callback
         def _on_msg(message):
+            start = metrics.start()
             try:
                 data = json_loads_object(message.payload)
             except Exception:
                 _LOGGER.warning("SenziioEvent: bad payload: %s", message.payload)
+                counters[DROPS] += 1
                 return
+            metrics.decoded(start)
 
             event_id = data.get("event_id")
             event_name = str(data.get("event_name") or "")
             payload = data.get("data")
             if not event_name:
+                counters[DROPS] += 1
                 return
 
             # de-duplicate messages
             sig = (event_id, event_name, payload)
             if sig == self._last_sig:
+                counters[DEDUPES] += 1
                 return
             self._last_sig = sig
 
@@ -78,6 +87,7 @@ class SenziioEvent(EventEntity):
             extra.update({"event_id": event_id, "data": payload})
             self._trigger_event(event_type, extra)
             self.async_write_ha_state()
+            counters[STATE_WRITES] += 1
 
             # event for automations
             message_text = f"{event_name}: {'' if payload is None else str(payload)}".rstrip(": ")
@@ -95,8 +105,12 @@ class SenziioEvent(EventEntity):
                     "domain": "event",
                 },
             )
+            metrics.handled(start)
 
-        self._unsub = await async_subscribe(self._hass, topic, _on_msg, 1)
+        with async_get_tracer(self.hass).span(
+            "subscribe", self._device.id, topic=topic
+        ):
+            self._unsub = await async_subscribe(self._hass, topic, _on_msg, 1)
 
     async def async_will_remove_from_hass(self) -> None:
         if self._unsub:
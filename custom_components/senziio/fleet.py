@@ -0,0 +1,106 @@
+"""Commands sent to many Senziio devices at once."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+
+from .entity import DOMAIN
+from .senziio import Senziio
+
+_LOGGER = logging.getLogger(__name__)
+
+# devices with a command in flight at once
+FLEET_CONCURRENCY = 32
+
+
+@callback
+def async_select_devices(
+    hass: HomeAssistant,
+    area_ids: Iterable[str] = (),
+    models: Iterable[str] = (),
+    device_ids: Iterable[str] = (),
+) -> list[Senziio]:
+    """Return loaded devices matching every given target.
+
+    Areas and device IDs refer to the device registry. Models are compared
+    case and whitespace insensitively. Targets left empty match all devices.
+    """
+    area_ids = set(area_ids)
+    model_keys = {"-".join(model.lower().split()) for model in models}
+    device_ids = set(device_ids)
+    dev_reg = dr.async_get(hass)
+
+    devices = []
+    for entry_id, device in hass.data.get(DOMAIN, {}).items():
+        if model_keys and device.model_key not in model_keys:
+            continue
+        if area_ids or device_ids:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            dev_entry = entry and dev_reg.async_get_device(
+                identifiers={(DOMAIN, entry.data["serial-number"])}
+            )
+            if dev_entry is None:
+                continue
+            if area_ids and dev_entry.area_id not in area_ids:
+                continue
+            if device_ids and dev_entry.id not in device_ids:
+                continue
+        devices.append(device)
+    return devices
+
+
+async def async_fan_out(
+    devices: Iterable[Senziio], send: Callable[[Senziio], Awaitable[Any]]
+) -> dict[str, Any]:
+    """Run a request on every device with bounded concurrency.
+
+    Returns the responses by device ID, along with the devices that did not
+    answer in time and those whose request failed.
+    """
+    devices = list(devices)
+    semaphore = asyncio.Semaphore(FLEET_CONCURRENCY)
+
+    async def _send(device: Senziio) -> Any:
+        async with semaphore:
+            return await send(device)
+
+    results = await asyncio.gather(
+        *(_send(device) for device in devices), return_exceptions=True
+    )
+
+    responses: dict[str, Any] = {}
+    timed_out: list[str] = []
+    failed: dict[str, str] = {}
+    for device, result in zip(devices, results):
+        if isinstance(result, HomeAssistantError):
+            failed[device.id] = str(result) or type(result).__name__
+        elif isinstance(result, Exception):
+            _LOGGER.error(
+                "Unexpected error sending command to %s", device.id, exc_info=result
+            )
+            failed[device.id] = "unknown"
+        elif result is None:
+            timed_out.append(device.id)
+        else:
+            responses[device.id] = result
+
+    return {"responses": responses, "timed_out": timed_out, "failed": failed}
+
+
+async def async_send_fleet_command(
+    devices: Iterable[Senziio],
+    command: str,
+    payload: dict | None = None,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Send the same command to many devices and aggregate their responses."""
+    return await async_fan_out(
+        devices, lambda device: device.send_command(command, payload, timeout)
+    )
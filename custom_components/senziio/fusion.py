@@ -0,0 +1,124 @@
+"""Weighted fusion of Senziio occupancy inputs."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+FUSION_INPUTS = ("presence", "motion", "radar", "pir", "beacon", "camera")
+
+DEFAULT_WEIGHTS = {
+    "presence": 1.0,
+    "motion": 0.6,
+    "radar": 0.8,
+    "pir": 0.6,
+    "beacon": 0.5,
+    "camera": 0.8,
+}
+# seconds an input keeps counting after it turns off
+DEFAULT_HOLDS = {
+    "presence": 0,
+    "motion": 60,
+    "radar": 10,
+    "pir": 60,
+    "beacon": 0,
+    "camera": 10,
+}
+DEFAULT_THRESHOLD = 0.5
+
+CONF_FUSION_THRESHOLD = "fusion_threshold"
+
+
+def weight_option(key: str) -> str:
+    """Return option name of an input weight."""
+    return f"fusion_{key}_weight"
+
+
+def hold_option(key: str) -> str:
+    """Return option name of an input hold time."""
+    return f"fusion_{key}_hold"
+
+
+class OccupancyFusion:
+    """Occupancy score kept up to date in O(1) per input change.
+
+    The score is the sum of weights of inputs that are on or still within
+    their hold time after turning off. Occupancy is reported while the score
+    reaches the threshold. The sum is recomputed rather than kept running,
+    so float error cannot build up, which stays O(1) with a fixed set of
+    inputs.
+    """
+
+    def __init__(
+        self,
+        weights: Mapping[str, float],
+        holds: Mapping[str, float],
+        threshold: float,
+    ) -> None:
+        """Initialize fusion."""
+        self.weights = dict(weights)
+        self.holds = dict(holds)
+        self.threshold = threshold
+        self.score = 0.0
+        self._counted: set[str] = set()
+        self._held: dict[str, float] = {}
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> OccupancyFusion:
+        """Create fusion from config entry options."""
+        fusion = cls({}, {}, DEFAULT_THRESHOLD)
+        fusion.apply_options(options)
+        return fusion
+
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply config entry options, keeping current input states."""
+        self.weights = {
+            key: options.get(weight_option(key), DEFAULT_WEIGHTS[key])
+            for key in FUSION_INPUTS
+        }
+        self.holds = {
+            key: options.get(hold_option(key), DEFAULT_HOLDS[key])
+            for key in FUSION_INPUTS
+        }
+        self.threshold = options.get(CONF_FUSION_THRESHOLD, DEFAULT_THRESHOLD)
+        self._rescore()
+
+    @property
+    def occupied(self) -> bool:
+        """Return whether fused inputs indicate occupancy."""
+        return bool(self._counted) and self.score >= self.threshold
+
+    @property
+    def next_expiry(self) -> float | None:
+        """Return time when the next held input stops counting."""
+        return min(self._held.values()) if self._held else None
+
+    def update(self, key: str, active: bool, now: float) -> None:
+        """Apply a new input value."""
+        if active:
+            self._held.pop(key, None)
+            self._count(key)
+        elif key in self._counted and key not in self._held:
+            if (hold := self.holds.get(key, 0)) > 0:
+                self._held[key] = now + hold
+            else:
+                self._uncount(key)
+
+    def expire(self, now: float) -> None:
+        """Stop counting inputs whose hold time is over."""
+        for key in [key for key, until in self._held.items() if until <= now]:
+            del self._held[key]
+            self._uncount(key)
+
+    def _count(self, key: str) -> None:
+        if key not in self._counted:
+            self._counted.add(key)
+            self._rescore()
+
+    def _uncount(self, key: str) -> None:
+        if key in self._counted:
+            self._counted.discard(key)
+            self._rescore()
+
+    def _rescore(self) -> None:
+        self.score = sum(self.weights.get(key, 0.0) for key in self._counted)
@@ -0,0 +1,152 @@
+"""In-memory high-resolution history of Senziio entity samples."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.singleton import singleton
+
+from .entity import DOMAIN
+
+# samples kept per entity, one hour at 1 Hz
+HISTORY_SIZE = 3600
+# largest timestamp delta in milliseconds representable when delta encoding
+_MAX_DELTA = 0xFFFFFFFF
+
+
+class SampleBuffer:
+    """Fixed-size ring buffer of timestamped numeric samples.
+
+    Timestamps and values are kept in typed arrays of bounded size. With delta
+    encoding, timestamps are stored as millisecond offsets from the previous
+    sample, which cuts timestamp storage in half.
+    """
+
+    __slots__ = (
+        "_size", "_delta", "_timestamps", "_values", "_start", "_count",
+        "_first", "_last",
+    )
+
+    def __init__(self, size: int = HISTORY_SIZE, delta_encoding: bool = False) -> None:
+        """Initialize buffer."""
+        if size < 2:
+            raise ValueError("Buffer size must be at least 2")
+        self._size = size
+        self._delta = delta_encoding
+        # arrays grow up to size, then the oldest samples are overwritten
+        self._timestamps = array("I" if delta_encoding else "d")
+        self._values = array("d")
+        self._start = 0
+        self._count = 0
+        # absolute timestamps of oldest and newest samples when delta encoding
+        self._first = 0.0
+        self._last = 0.0
+
+    def __len__(self) -> int:
+        """Return number of stored samples."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Return memory used by sample storage."""
+        return (
+            self._timestamps.itemsize * len(self._timestamps)
+            + self._values.itemsize * len(self._values)
+        )
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, overwriting the oldest one when full."""
+        if self._delta:
+            if self._count == 0:
+                self._first = self._last = timestamp
+                stored = 0
+            else:
+                stored = min(max(round((timestamp - self._last) * 1000), 0), _MAX_DELTA)
+                # track the decoded value so rounding errors do not accumulate
+                self._last += stored / 1000
+        else:
+            stored = timestamp
+
+        if self._count < self._size:
+            self._timestamps.append(stored)
+            self._values.append(value)
+            self._count += 1
+            return
+
+        index = self._start
+        self._start = (index + 1) % self._size
+        if self._delta:
+            self._first += self._timestamps[self._start] / 1000
+        self._timestamps[index] = stored
+        self._values[index] = value
+
+    def samples(self, since: float | None = None) -> tuple[list[float], list[float]]:
+        """Return timestamps and values of samples not older than since."""
+        size = self._size
+        timestamps: list[float] = []
+        values: list[float] = []
+        timestamp = self._first
+        for offset in range(self._count):
+            index = (self._start + offset) % size
+            if self._delta:
+                if offset:
+                    timestamp += self._timestamps[index] / 1000
+            else:
+                timestamp = self._timestamps[index]
+            if since is None or timestamp >= since:
+                timestamps.append(timestamp)
+                values.append(self._values[index])
+        return timestamps, values
+
+
+@callback
+@singleton(f"{DOMAIN}_history")
+def async_get_history_buffers(hass: HomeAssistant) -> dict[str, SampleBuffer]:
+    """Return sample buffers of Senziio entities by entity ID."""
+    return {}
+
+
+@callback
+def async_query_history(
+    hass: HomeAssistant, entity_id: str, since: float | None = None
+) -> dict[str, Any] | None:
+    """Return buffered samples of an entity, or None if it keeps no history."""
+    if (buffer := async_get_history_buffers(hass).get(entity_id)) is None:
+        return None
+    timestamps, values = buffer.samples(since)
+    return {"timestamps": timestamps, "values": values}
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register history websocket commands."""
+    websocket_api.async_register_command(hass, websocket_history)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/history",
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("since"): vol.Coerce(float),
+    }
+)
+@callback
+def websocket_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return buffered samples of a Senziio entity."""
+    result = async_query_history(hass, msg["entity_id"], msg.get("since"))
+    if result is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Entity keeps no history"
+        )
+        return
+    connection.send_result(msg["id"], result)
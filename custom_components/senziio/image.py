@@ -0,0 +1,132 @@
+"""Senziio thermal image entity."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from homeassistant.components.image import ImageEntity
+from homeassistant.components.mqtt import async_subscribe
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .entity import DOMAIN, SenziioEntity
+from .senziio import Senziio
+from .thermal import THERMAL_FRAME_TOPIC, frame_changed, render_frame_png
+from .tracing import async_get_tracer
+
+_LOGGER = logging.getLogger(__name__)
+
+# minimum seconds between state writes announcing new frames, each one is
+# stored by the recorder as a new state
+FRAME_WRITE_INTERVAL = 10.0
+# centi-degrees a pixel must move by for a frame to be announced
+FRAME_CHANGE_THRESHOLD = 50
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Senziio image entities."""
+    device = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([SenziioThermalImageEntity(hass, entry, device)])
+
+
+class SenziioThermalImageEntity(SenziioEntity, ImageEntity):
+    """Senziio thermal camera frame rendered on demand.
+
+    Incoming frames are only referenced. Decoding and colour mapping run
+    when a client requests the image, and the PNG is cached until the next
+    frame arrives. State is written at most once per FRAME_WRITE_INTERVAL,
+    and only when the frame differs from the last announced one by more
+    than FRAME_CHANGE_THRESHOLD.
+    """
+
+    _attr_content_type = "image/png"
+    _attr_name = "Thermal Frame"
+    _attr_translation_key = "thermal-frame"
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, device: Senziio) -> None:
+        """Initialize entity."""
+        SenziioEntity.__init__(self, entry)
+        ImageEntity.__init__(self, hass)
+        self.entity_id = f"image.senziio_thermal_frame_{device.id}"
+        self._attr_unique_id = f"{device.id}_thermal-frame"
+        self._device = device
+        self._dt_topic = device.entity_topic(THERMAL_FRAME_TOPIC)
+        self._frame: bytes | None = None
+        self._png: bytes | None = None
+        self._announced: bytes | None = None
+        self._last_write = 0.0
+        self._cancel_write: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to raw thermal frames."""
+
+        @callback
+        def frame_received(message):
+            """Keep a reference to the latest frame."""
+            self._frame = message.payload
+            self._png = None
+            self._async_schedule_write()
+
+        with async_get_tracer(self.hass).span(
+            "subscribe", self._device.id, topic=self._dt_topic
+        ):
+            unsubscribe = await async_subscribe(
+                self.hass, self._dt_topic, frame_received, 0, encoding=None
+            )
+        self.async_on_remove(unsubscribe)
+        self.async_on_remove(self._async_cancel_write)
+
+    @callback
+    def _async_schedule_write(self) -> None:
+        """Announce a new frame, at most once per write interval."""
+        if self._cancel_write is not None:
+            return
+        delay = self._last_write + FRAME_WRITE_INTERVAL - time.monotonic()
+        if delay <= 0:
+            self._async_write_frame()
+        else:
+            self._cancel_write = async_call_later(
+                self.hass, delay, self._async_write_frame
+            )
+
+    @callback
+    def _async_write_frame(self, *_) -> None:
+        """Write state so clients fetch the new frame."""
+        self._cancel_write = None
+        self._last_write = time.monotonic()
+        frame = self._frame
+        if self._announced is not None and not frame_changed(
+            self._announced, frame, FRAME_CHANGE_THRESHOLD
+        ):
+            return
+        self._announced = frame
+        self._attr_image_last_updated = dt_util.utcnow()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_write(self) -> None:
+        """Cancel a pending state write."""
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+
+    async def async_image(self) -> bytes | None:
+        """Return PNG rendering of the latest frame."""
+        if self._png is not None or (frame := self._frame) is None:
+            return self._png
+
+        png = await self.hass.async_add_executor_job(render_frame_png, frame)
+        if png is None:
+            _LOGGER.debug("Discarding malformed thermal frame from %s", self._device.id)
+        # a newer frame may have arrived while rendering
+        if frame is self._frame:
+            self._png = png
+        return png
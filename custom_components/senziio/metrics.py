@@ -0,0 +1,166 @@
+"""Runtime metrics of Senziio message handling.
+
+Counters are exact, while decode and handler times are measured on one
+message out of SAMPLE_EVERY per topic, so instrumented handlers only pay
+for a few increments on most messages.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any
+
+# every Nth message of a topic is timed
+SAMPLE_EVERY = 16
+
+# counter slots
+MESSAGES = 0
+DROPS = 1
+DEDUPES = 2
+STATE_WRITES = 3
+COUNTERS = ("messages", "drops", "dedupes", "state_writes")
+
+# bucket i counts durations below 2**i microseconds, the last one the rest
+HISTOGRAM_BUCKETS = 24
+
+
+class Histogram:
+    """Histogram of durations in power of two microsecond buckets."""
+
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self) -> None:
+        """Initialize histogram."""
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration."""
+        micros = int(seconds * 1_000_000)
+        self.buckets[min(micros.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float | None:
+        """Return upper bound of the bucket holding a quantile, in seconds."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                break
+        return (1 << index) / 1_000_000
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return summary of the histogram."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else None,
+            "p50_ms": _milliseconds(self.quantile(0.5)),
+            "p95_ms": _milliseconds(self.quantile(0.95)),
+            "p99_ms": _milliseconds(self.quantile(0.99)),
+            "buckets": {
+                f"<{1 << index}us": count
+                for index, count in enumerate(self.buckets)
+                if count
+            },
+        }
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds."""
+    return None if seconds is None else seconds * 1000
+
+
+class TopicMetrics:
+    """Counters and sampled timings of the messages of one topic.
+
+    Handlers of a topic already counted by another handler are ``shared``,
+    their messages are left out of device totals.
+    """
+
+    __slots__ = ("counters", "decode", "handler", "shared", "_tick")
+
+    def __init__(self, shared: bool = False) -> None:
+        """Initialize metrics."""
+        self.counters = [0] * len(COUNTERS)
+        self.shared = shared
+        self.decode = Histogram()
+        self.handler = Histogram()
+        self._tick = 0
+
+    def start(self) -> float | None:
+        """Count a message, return its start time if it is to be timed."""
+        self.counters[MESSAGES] += 1
+        self._tick += 1
+        if self._tick < SAMPLE_EVERY:
+            return None
+        self._tick = 0
+        return perf_counter()
+
+    def decoded(self, start: float | None) -> None:
+        """Record decode time of a timed message."""
+        if start is not None:
+            self.decode.observe(perf_counter() - start)
+
+    def handled(self, start: float | None) -> None:
+        """Record total handler time of a timed message."""
+        if start is not None:
+            self.handler.observe(perf_counter() - start)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return counters and timing summaries."""
+        messages = self.counters[MESSAGES]
+        handler = self.handler
+        return {
+            **dict(zip(COUNTERS, self.counters)),
+            "decode": self.decode.as_dict(),
+            "handler": handler.as_dict(),
+            # sampled handler time scaled to all messages
+            "estimated_handler_seconds": (
+                handler.total * messages / handler.count if handler.count else 0.0
+            ),
+        }
+
+
+class DeviceMetrics:
+    """Message handling metrics of a device by topic."""
+
+    def __init__(self) -> None:
+        """Initialize metrics."""
+        self.topics: dict[str, TopicMetrics] = {}
+
+    def topic(self, key: str, shared: bool = False) -> TopicMetrics:
+        """Return metrics of a topic, resolved once by each handler.
+
+        Each handler uses its own key. Handlers of an MQTT topic another
+        handler also subscribes to pass ``shared``.
+        """
+        if (metrics := self.topics.get(key)) is None:
+            metrics = self.topics[key] = TopicMetrics(shared)
+        return metrics
+
+    def total(self, counter: int) -> int:
+        """Return a counter summed over all topics, each message once."""
+        return sum(
+            metrics.counters[counter]
+            for metrics in self.topics.values()
+            if counter != MESSAGES or not metrics.shared
+        )
+
+    def handler_quantile(self, q: float) -> float | None:
+        """Return a handler time quantile over all topics, in seconds."""
+        merged = Histogram()
+        for metrics in self.topics.values():
+            handler = metrics.handler
+            merged.count += handler.count
+            for index, count in enumerate(handler.buckets):
+                merged.buckets[index] += count
+        return merged.quantile(q)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return metrics of all topics."""
+        return {key: metrics.as_dict() for key, metrics in sorted(self.topics.items())}
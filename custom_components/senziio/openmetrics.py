@@ -0,0 +1,187 @@
+"""OpenMetrics exposition of Senziio integration internals."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .entity import DOMAIN
+from .metrics import HISTOGRAM_BUCKETS, MESSAGES, Histogram
+from .senziio import Senziio
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+# device blocks are re-rendered at most this often
+RENDER_INTERVAL = timedelta(seconds=10)
+
+# per-topic counters of DeviceMetrics, in metrics.COUNTERS order
+COUNTER_FAMILIES = (
+    ("senziio_messages", "Messages received"),
+    ("senziio_dropped_messages", "Messages dropped as stale or invalid"),
+    ("senziio_deduplicated_messages", "Repeated messages ignored"),
+    ("senziio_state_writes", "Entity state writes caused by messages"),
+)
+HISTOGRAM_FAMILIES = (
+    ("senziio_decode_duration_seconds", "Sampled payload decode time"),
+    ("senziio_handler_duration_seconds", "Sampled message handler time"),
+)
+GAUGE_FAMILIES = (
+    ("senziio_last_seen_timestamp_seconds", "Time the device last sent data"),
+    ("senziio_rtt_seconds", "Smoothed command round-trip time"),
+    ("senziio_handled_topics", "Topics with instrumented message handlers"),
+    ("senziio_sample_listeners", "Listeners of decoded device samples"),
+)
+# histogram buckets exposed, every other power of two microseconds
+EXPOSED_BUCKETS = tuple(range(0, HISTOGRAM_BUCKETS - 1, 2))
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> str:
+    """Render cumulative buckets, count and sum of a histogram."""
+    lines = []
+    cumulative = 0
+    exposed = iter(EXPOSED_BUCKETS)
+    bound = next(exposed)
+    for index, count in enumerate(histogram.buckets):
+        cumulative += count
+        if index == bound:
+            le = f"{(1 << index) / 1_000_000:g}"
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}\n')
+            bound = next(exposed, None)
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}\n')
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}\n")
+    lines.append(f"{name}_sum{{{labels}}} {histogram.total}\n")
+    return "".join(lines)
+
+
+def render_device(device: Senziio) -> tuple[str, ...]:
+    """Render the samples of a device, one string per metric family."""
+    device_label = f'device="{_escape(device.id)}"'
+    counters = [[] for _ in COUNTER_FAMILIES]
+    histograms = [[] for _ in HISTOGRAM_FAMILIES]
+    for key, metrics in sorted(device.metrics.topics.items()):
+        labels = f'{device_label},topic="{_escape(key)}"'
+        for lines, (name, _), value in zip(
+            counters, COUNTER_FAMILIES, metrics.counters
+        ):
+            lines.append(f"{name}_total{{{labels}}} {value}\n")
+        for lines, (name, _), histogram in zip(
+            histograms, HISTOGRAM_FAMILIES, (metrics.decode, metrics.handler)
+        ):
+            lines.append(_histogram_lines(name, labels, histogram))
+
+    gauges = (
+        device.availability.last_seen,
+        device.rtt.srtt,
+        len(device.metrics.topics),
+        device.sample_listener_count,
+    )
+    return (
+        *("".join(lines) for lines in counters),
+        *("".join(lines) for lines in histograms),
+        *(
+            f"{name}{{{device_label}}} {value}\n" if value is not None else ""
+            for (name, _), value in zip(GAUGE_FAMILIES, gauges)
+        ),
+    )
+
+
+class SenziioMetricsExporter:
+    """Pre-rendered OpenMetrics exposition of all loaded devices.
+
+    Device blocks are rendered from the event loop on an interval, and only
+    for devices that received messages since their last render. A scrape
+    joins the cached blocks without touching message handlers.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize exporter."""
+        self._hass = hass
+        self._blocks: dict[str, tuple[str, ...]] = {}
+        self._rendered_at: dict[str, tuple] = {}
+
+    @callback
+    def async_render(self, now: datetime | None = None) -> None:
+        """Re-render blocks of devices with new data."""
+        devices: dict[str, Senziio] = self._hass.data.get(DOMAIN, {})
+        for entry_id in self._blocks.keys() - devices.keys():
+            del self._blocks[entry_id]
+            del self._rendered_at[entry_id]
+        for entry_id, device in devices.items():
+            version = (
+                device.metrics.total(MESSAGES),
+                device.availability.last_seen,
+                device.rtt.srtt,
+            )
+            if self._rendered_at.get(entry_id) != version:
+                self._blocks[entry_id] = render_device(device)
+                self._rendered_at[entry_id] = version
+
+    def exposition(self) -> str:
+        """Return the current exposition."""
+        blocks = self._blocks.values()
+        parts = [
+            "# TYPE senziio_devices gauge\n",
+            "# HELP senziio_devices Loaded Senziio devices\n",
+            f"senziio_devices {len(blocks)}\n",
+        ]
+        if (pool := self._hass.data.get(f"{DOMAIN}_analytics_pool")) is not None:
+            parts.append(
+                "# TYPE senziio_analytics_queue_depth gauge\n"
+                "# HELP senziio_analytics_queue_depth "
+                "Thermal frames being analysed or waiting\n"
+                f"senziio_analytics_queue_depth {pool.queue_depth}\n"
+                "# TYPE senziio_analytics_dropped_frames counter\n"
+                "# HELP senziio_analytics_dropped_frames "
+                "Thermal frames dropped under load\n"
+                f"senziio_analytics_dropped_frames_total {pool.dropped}\n"
+            )
+
+        families = (
+            *((name, "counter", doc) for name, doc in COUNTER_FAMILIES),
+            *((name, "histogram", doc) for name, doc in HISTOGRAM_FAMILIES),
+            *((name, "gauge", doc) for name, doc in GAUGE_FAMILIES),
+        )
+        for index, (name, kind, doc) in enumerate(families):
+            parts.append(f"# TYPE {name} {kind}\n# HELP {name} {doc}\n")
+            parts.extend(block[index] for block in blocks)
+        parts.append("# EOF\n")
+        return "".join(parts)
+
+
+class SenziioMetricsView(HomeAssistantView):
+    """Serve integration metrics to authenticated scrapers."""
+
+    url = "/senziio/metrics"
+    name = "api:senziio:metrics"
+    requires_auth = True
+
+    def __init__(self, exporter: SenziioMetricsExporter) -> None:
+        """Initialize view."""
+        self._exporter = exporter
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the OpenMetrics exposition."""
+        return web.Response(
+            body=self._exporter.exposition().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Serve the metrics endpoint and keep its exposition rendered."""
+    exporter = SenziioMetricsExporter(hass)
+    exporter.async_render()
+    async_track_time_interval(
+        hass, exporter.async_render, RENDER_INTERVAL, cancel_on_shutdown=True
+    )
+    hass.http.register_view(SenziioMetricsView(exporter))
@@ -0,0 +1,79 @@
+"""Periodic round-trip time probes of Senziio devices."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+from .entity import DOMAIN
+from .senziio import Senziio
+
+# seconds between probes of a device, varied by up to PING_JITTER of it
+PING_INTERVAL = 60
+PING_JITTER = 0.2
+
+
+def next_probe_delay(first: bool = False) -> float:
+    """Return seconds until the next probe of a device.
+
+    First probes are spread over a whole interval and later ones are
+    jittered, so probes of a fleet never line up.
+    """
+    if first:
+        return random.uniform(0, PING_INTERVAL)
+    return PING_INTERVAL * random.uniform(1 - PING_JITTER, 1 + PING_JITTER)
+
+
+class SenziioRTTProbe:
+    """Ping a device periodically to keep its round-trip time estimate fresh."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, device: Senziio) -> None:
+        """Initialize probe."""
+        self._hass = hass
+        self._entry = entry
+        self._device = device
+        self._cancel: CALLBACK_TYPE | None = None
+        self._running = False
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the first probe."""
+        self._running = True
+        self._schedule(next_probe_delay(first=True))
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the next probe and release the ping subscription."""
+        self._running = False
+        if self._cancel is not None:
+            self._cancel()
+            self._cancel = None
+        self._device.stop_pings()
+
+    def _schedule(self, delay: float) -> None:
+        """Schedule a probe after a delay."""
+        self._cancel = async_call_later(self._hass, delay, self._probe)
+
+    @callback
+    def _probe(self, now: datetime) -> None:
+        """Start a probe in the background."""
+        self._cancel = None
+        self._entry.async_create_background_task(
+            self._hass, self._async_ping(), f"{DOMAIN} ping {self._device.id}"
+        )
+
+    async def _async_ping(self) -> None:
+        """Ping the device and schedule the next probe."""
+        try:
+            await self._device.ping()
+        except HomeAssistantError:
+            # MQTT errors are logged by the transport
+            pass
+        finally:
+            if self._running:
+                self._schedule(next_probe_delay())
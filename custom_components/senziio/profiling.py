@@ -0,0 +1,171 @@
+"""On-demand profiling of the event loop running Senziio handlers."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.singleton import singleton
+
+from .entity import DOMAIN
+
+# seconds between stack samples of the event loop thread
+SAMPLE_INTERVAL = 0.005
+# frames kept from the innermost one in collapsed stacks
+MAX_STACK_DEPTH = 64
+
+INTEGRATION_PATH = str(Path(__file__).parent)
+
+
+class ProfilingError(HomeAssistantError):
+    """Error to indicate that a capture could not be started."""
+
+
+def frame_label(frame: FrameType) -> str:
+    """Return flamegraph label of a frame."""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame: FrameType | None) -> str:
+    """Return a stack as semicolon separated labels, outermost first."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """Sample stacks of a thread from a background thread.
+
+    Stacks are counted in collapsed form, one line per distinct stack,
+    which flamegraph tools read directly.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        """Initialize sampler."""
+        self._thread_id = thread_id
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stacks: Counter[str] = Counter()
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread = threading.Thread(
+            target=self._run, name=f"{DOMAIN}_sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Take samples until stopped."""
+        while not self._stop.wait(self._interval):
+            if (frame := sys._current_frames().get(self._thread_id)) is not None:
+                self.stacks[collapse_stack(frame)] += 1
+            # drop the reference to the sampled thread frames
+            del frame
+
+    def collapsed(self) -> str:
+        """Return samples in collapsed stack format."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def summarize(profiler: cProfile.Profile, top: int) -> list[dict[str, Any]]:
+    """Return functions of the integration with the most cumulative time."""
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    functions = [
+        (key, value)
+        for key, value in stats.items()
+        if key[0].startswith(INTEGRATION_PATH)
+    ]
+    functions.sort(key=lambda item: item[1][3], reverse=True)
+    summary = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in functions[:top]:
+        summary.append(
+            {
+                "function": f"{Path(filename).name}:{line}({name})",
+                "calls": calls,
+                "total_time": round(total, 6),
+                "cumulative_time": round(cumulative, 6),
+            }
+        )
+    return summary
+
+
+def _write_results(
+    profiler: cProfile.Profile,
+    sampler: StackSampler,
+    pstats_path: Path,
+    collapsed_path: Path,
+    top: int,
+) -> list[dict[str, Any]]:
+    """Write capture files and summarize them, in the executor."""
+    profiler.dump_stats(pstats_path)
+    collapsed_path.write_text(sampler.collapsed(), encoding="utf-8")
+    return summarize(profiler, top)
+
+
+@callback
+@singleton(f"{DOMAIN}_profiling_lock")
+def _async_get_lock(hass: HomeAssistant) -> asyncio.Lock:
+    """Return the lock allowing a single capture at a time."""
+    return asyncio.Lock()
+
+
+async def async_profile(
+    hass: HomeAssistant, duration: float, top: int
+) -> dict[str, Any]:
+    """Profile the event loop for a duration and write the results.
+
+    Nothing is installed outside a capture. During one, cProfile records
+    calls and a background thread samples the stack of the event loop
+    thread. The summary only lists functions of the integration.
+    """
+    lock = _async_get_lock(hass)
+    if lock.locked():
+        raise ProfilingError("A profiling capture is already running")
+
+    async with lock:
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident())
+        try:
+            profiler.enable()
+        except ValueError as error:
+            raise ProfilingError(f"Could not start profiler: {error}") from error
+        sampler.start()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+            await hass.async_add_executor_job(sampler.stop)
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        pstats_path = Path(hass.config.path(f"{DOMAIN}_profile_{stamp}.prof"))
+        collapsed_path = pstats_path.with_suffix(".collapsed")
+        summary = await hass.async_add_executor_job(
+            _write_results, profiler, sampler, pstats_path, collapsed_path, top
+        )
+
+    return {
+        "pstats": str(pstats_path),
+        "collapsed_stacks": str(collapsed_path),
+        "samples": sum(sampler.stacks.values()),
+        "top": summary,
+    }
@@ -0,0 +1,147 @@
+"""Bulk provisioning of Senziio devices from a manifest."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import logging
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import CONF_FRIENDLY_NAME, CONF_MODEL, CONF_UNIQUE_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util.yaml import parse_yaml
+
+from .config_flow import (
+    CannotConnect,
+    MQTTError,
+    unique_friendly_name,
+    validate_input,
+)
+from .entity import CONF_AREA, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# devices validated at once during an import
+IMPORT_CONCURRENCY = 16
+
+MANIFEST_ROW_SCHEMA = vol.Schema(
+    {
+        vol.Required("serial_number"): vol.All(cv.string, vol.Length(min=1)),
+        vol.Required("model"): vol.All(cv.string, vol.Length(min=1)),
+        vol.Optional("friendly_name"): vol.Any(None, cv.string),
+        vol.Optional(CONF_AREA): vol.Any(None, cv.string),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+
+def read_manifest(path: Path) -> list[dict[str, Any]]:
+    """Read manifest rows from a CSV or YAML file."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+    else:
+        rows = parse_yaml(text)
+    if not isinstance(rows, list):
+        raise vol.Invalid("manifest must be a list of devices")
+    return rows
+
+
+async def async_import_manifest(
+    hass: HomeAssistant, rows: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Validate manifest devices concurrently and create their entries.
+
+    Titles of existing entries are collected once and reused for naming and
+    uniqueness checks of every row. Returns a summary of created, skipped
+    and failed devices.
+    """
+    entries = hass.config_entries.async_entries(DOMAIN, include_ignore=True)
+    configured = {entry.unique_id for entry in entries}
+    existing_titles = {entry.title for entry in entries}
+    used_titles = set(existing_titles)
+    skipped: dict[str, str] = {}
+    pending: list[dict[str, Any]] = []
+
+    for number, row in enumerate(rows, 1):
+        try:
+            row = MANIFEST_ROW_SCHEMA(row)
+        except vol.Invalid as error:
+            skipped[f"row {number}"] = f"invalid: {error}"
+            continue
+
+        device_id = " ".join(row["serial_number"].split())
+        if device_id in configured:
+            skipped[device_id] = "already_configured"
+            continue
+        friendly_name = " ".join((row.get("friendly_name") or "").split())
+        if not friendly_name:
+            friendly_name = unique_friendly_name(used_titles, row["model"])
+        elif friendly_name in used_titles:
+            skipped[device_id] = "repeated_title"
+            continue
+
+        configured.add(device_id)
+        used_titles.add(friendly_name)
+        pending.append(
+            {
+                CONF_UNIQUE_ID: device_id,
+                CONF_MODEL: row["model"],
+                CONF_FRIENDLY_NAME: friendly_name,
+                CONF_AREA: row.get(CONF_AREA),
+            }
+        )
+
+    semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+
+    async def _validate(data_input: dict[str, Any]) -> dict[str, Any]:
+        async with semaphore:
+            data = await validate_input(hass, data_input, existing_titles)
+        if area := data_input[CONF_AREA]:
+            data[CONF_AREA] = area
+        return data
+
+    results = await asyncio.gather(
+        *(_validate(data_input) for data_input in pending), return_exceptions=True
+    )
+
+    failed: dict[str, str] = {}
+    validated = []
+    for data_input, result in zip(pending, results):
+        device_id = data_input[CONF_UNIQUE_ID]
+        if isinstance(result, CannotConnect):
+            failed[device_id] = "cannot_connect"
+        elif isinstance(result, MQTTError):
+            failed[device_id] = "mqtt_error"
+        elif isinstance(result, Exception):
+            _LOGGER.error(
+                "Unexpected error validating %s", device_id, exc_info=result
+            )
+            failed[device_id] = "unknown"
+        else:
+            validated.append(result)
+
+    # create all entries in one batch
+    flows = await asyncio.gather(
+        *(
+            hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_IMPORT}, data=data
+            )
+            for data in validated
+        )
+    )
+    created = []
+    for data, flow in zip(validated, flows):
+        if flow["type"] is FlowResultType.CREATE_ENTRY:
+            created.append(data[CONF_UNIQUE_ID])
+        else:
+            skipped[data[CONF_UNIQUE_ID]] = flow.get("reason", "not_created")
+
+    return {"created": created, "skipped": skipped, "failed": failed}
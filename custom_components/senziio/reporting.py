@@ -0,0 +1,114 @@
+"""Device-side reporting rate of Senziio devices."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+
+from .entity import DOMAIN
+from .senziio import Senziio
+
+_LOGGER = logging.getLogger(__name__)
+
+REPORTING_COMMAND = "reporting"
+# requested configuration in options, acknowledged one in entry data
+CONF_REPORTING = "reporting"
+CONF_INTERVAL = "interval"
+CONF_THRESHOLDS = "thresholds"
+
+# seconds between periodic reports of each metric
+REPORTING_INTERVAL = vol.All(vol.Coerce(int), vol.Range(min=1, max=86400))
+# smallest change of a metric reported before the next interval
+REPORTING_THRESHOLDS = {cv.string: vol.All(vol.Coerce(float), vol.Range(min=0))}
+
+REPORTING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_INTERVAL): REPORTING_INTERVAL,
+        vol.Optional(CONF_THRESHOLDS, default={}): REPORTING_THRESHOLDS,
+    }
+)
+
+
+class ReportingRejected(HomeAssistantError):
+    """Error to indicate that a device rejected a reporting configuration."""
+
+
+async def async_apply_reporting(
+    hass: HomeAssistant, entry: ConfigEntry, device: Senziio, config: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Send a reporting configuration and record it once acknowledged.
+
+    The configuration is stored as applied, and as requested unless the
+    options already request it, so it is not sent again and acknowledging
+    an options change does not update the options a second time. Returns
+    the device response, or None without an answer.
+    """
+    response = await device.send_command(REPORTING_COMMAND, config)
+    if response is None:
+        _LOGGER.debug("Senziio device %s did not acknowledge reporting", device.id)
+        return None
+    if not isinstance(response, dict) or "error" in response:
+        error = response.get("error") if isinstance(response, dict) else response
+        raise ReportingRejected(f"reporting configuration rejected: {error}")
+
+    options = entry.options
+    if options.get(CONF_REPORTING) != config:
+        options = {**options, CONF_REPORTING: config}
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_REPORTING: config}, options=options
+    )
+    return response
+
+
+class SenziioReportingSync:
+    """Keep the reporting configuration of a device in line with its options."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, device: Senziio
+    ) -> None:
+        """Initialize sync."""
+        self._hass = hass
+        self._entry = entry
+        self._device = device
+        self._sending: dict[str, Any] | None = None
+
+    @callback
+    def async_sync(self) -> None:
+        """Send the requested configuration if not acknowledged yet."""
+        requested = self._entry.options.get(CONF_REPORTING)
+        if requested is None or requested in (
+            self._entry.data.get(CONF_REPORTING),
+            self._sending,
+        ):
+            return
+        self._sending = requested
+        self._entry.async_create_background_task(
+            self._hass,
+            self._async_send(requested),
+            f"{DOMAIN} reporting {self._device.id}",
+        )
+
+    async def _async_send(self, requested: dict[str, Any]) -> None:
+        """Send a configuration, logging devices not accepting it."""
+        try:
+            response = await async_apply_reporting(
+                self._hass, self._entry, self._device, requested
+            )
+            if response is None:
+                _LOGGER.warning(
+                    "Senziio device %s did not acknowledge the reporting "
+                    "configuration, it will be sent again on next start",
+                    self._device.id,
+                )
+        except HomeAssistantError as error:
+            _LOGGER.warning("Senziio device %s: %s", self._device.id, error)
+        finally:
+            if self._sending is requested:
+                self._sending = None
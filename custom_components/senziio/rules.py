@@ -0,0 +1,215 @@
+"""Local threshold rules evaluated on Senziio device samples."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+
+from .entity import DOMAIN
+from .event import SENZIIO_AUTOMATION_EVENT
+from .senziio import Senziio
+
+CONF_RULES = "rules"
+
+
+def _unique_ids(rules: list[dict]) -> list[dict]:
+    """Validate that rule IDs are unique."""
+    ids = [rule["id"] for rule in rules]
+    if len(ids) != len(set(ids)):
+        raise vol.Invalid("rule IDs must be unique")
+    return rules
+
+
+RULE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required("id"): cv.string,
+            vol.Required("metric"): cv.string,
+            vol.Exclusive("above", "threshold"): vol.Coerce(float),
+            vol.Exclusive("below", "threshold"): vol.Coerce(float),
+            vol.Optional("hysteresis", default=0.0): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            # seconds the threshold must be crossed before the rule fires
+            vol.Optional("for", default=0.0): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+        }
+    ),
+    cv.has_at_least_one_key("above", "below"),
+)
+RULES_SCHEMA = vol.All(cv.ensure_list, [RULE_SCHEMA], _unique_ids)
+
+# results of evaluating a rule
+RULE_IDLE = 0
+RULE_FIRE = 1
+RULE_PENDING = 2
+RULE_CANCEL = 3
+
+
+class Rule:
+    """Compiled threshold rule with hysteresis and duration.
+
+    Thresholds are stored with the sign of their direction applied, so both
+    ``above`` and ``below`` rules are evaluated with a single comparison.
+    A rule fires once when its threshold is crossed for its duration, and
+    is re-armed when the value goes back past the release level.
+    """
+
+    __slots__ = (
+        "rule_id",
+        "metric",
+        "sign",
+        "trigger",
+        "release",
+        "duration",
+        "pending_since",
+        "fired",
+    )
+
+    def __init__(self, config: Mapping[str, Any]) -> None:
+        """Compile a validated rule."""
+        self.rule_id: str = config["id"]
+        self.metric: str = config["metric"]
+        self.sign = 1.0 if "above" in config else -1.0
+        threshold = config["above"] if "above" in config else config["below"]
+        self.trigger = self.sign * threshold
+        self.release = self.trigger - config.get("hysteresis", 0.0)
+        self.duration: float = config.get("for", 0.0)
+        self.pending_since: float | None = None
+        self.fired = False
+
+    def evaluate(self, value: float, now: float) -> int:
+        """Apply a new metric value."""
+        value *= self.sign
+        if self.fired:
+            if value <= self.release:
+                self.fired = False
+            return RULE_IDLE
+
+        if self.pending_since is not None:
+            if value <= self.release:
+                self.pending_since = None
+                return RULE_CANCEL
+            return self.expire(now)
+
+        if value > self.trigger:
+            if self.duration <= 0:
+                self.fired = True
+                return RULE_FIRE
+            self.pending_since = now
+            return RULE_PENDING
+        return RULE_IDLE
+
+    def expire(self, now: float) -> int:
+        """Fire a pending rule whose duration is over."""
+        if self.pending_since is not None and now - self.pending_since >= self.duration:
+            self.pending_since = None
+            self.fired = True
+            return RULE_FIRE
+        return RULE_IDLE
+
+
+def compile_rules(configs: Iterable[Mapping[str, Any]]) -> dict[str, tuple[Rule, ...]]:
+    """Compile rule configs into a table of rules by metric."""
+    table: dict[str, list[Rule]] = {}
+    for config in configs:
+        rule = Rule(config)
+        table.setdefault(rule.metric, []).append(rule)
+    return {metric: tuple(rules) for metric, rules in table.items()}
+
+
+class SenziioRuleEngine:
+    """Evaluate the compiled rule table of a device on its decoded samples."""
+
+    def __init__(self, hass: HomeAssistant, device: Senziio) -> None:
+        """Initialize engine."""
+        self._hass = hass
+        self._device = device
+        self._configs: list[Mapping[str, Any]] | None = None
+        self._removers: list[Callable[[], None]] = []
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_load(self, configs: Iterable[Mapping[str, Any]]) -> None:
+        """Compile rules and listen to the metrics they use."""
+        if (configs := list(configs)) == self._configs:
+            return
+        self.async_stop()
+        self._configs = configs
+        for metric, rules in compile_rules(configs).items():
+            self._removers.append(
+                self._device.add_sample_listener(metric, self._rules_listener(rules))
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop evaluating rules."""
+        self._configs = None
+        for remover in self._removers:
+            remover()
+        self._removers.clear()
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    def _rules_listener(self, rules: tuple[Rule, ...]) -> Callable:
+        """Return sample listener evaluating the rules of a metric."""
+
+        @callback
+        def sample_received(timestamp: float, value) -> None:
+            if not isinstance(value, (int, float)):
+                return
+            now = time.monotonic()
+            for rule in rules:
+                result = rule.evaluate(value, now)
+                if result == RULE_IDLE:
+                    continue
+                if result == RULE_FIRE:
+                    self._async_fire(rule, value)
+                elif result == RULE_PENDING:
+                    self._async_start_timer(rule, value)
+                elif (cancel := self._timers.pop(rule.rule_id, None)) is not None:
+                    cancel()
+
+        return sample_received
+
+    @callback
+    def _async_start_timer(self, rule: Rule, value: float) -> None:
+        """Fire a rule after its duration unless cancelled."""
+
+        @callback
+        def _expired(now) -> None:
+            self._timers.pop(rule.rule_id, None)
+            # the timer is cancelled as soon as the rule stops pending
+            if rule.expire(float("inf")) == RULE_FIRE:
+                self._async_fire(rule, value)
+
+        self._timers[rule.rule_id] = async_call_later(
+            self._hass, rule.duration, _expired
+        )
+
+    @callback
+    def _async_fire(self, rule: Rule, value: float) -> None:
+        """Fire the event of a rule."""
+        self._hass.bus.async_fire(
+            SENZIIO_AUTOMATION_EVENT,
+            {
+                "name": "Rule",
+                "event_type": "ruleEvent",
+                "event_name": rule.rule_id,
+                "rule_id": rule.rule_id,
+                "data": {"metric": rule.metric, "value": value},
+                "message": f"{rule.rule_id}: {rule.metric} {value}",
+                "device_id": self._device.id,
+                "domain": DOMAIN,
+                "computed": True,
+            },
+        )
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
 
 from homeassistant.components.mqtt import async_subscribe
 from homeassistant.components.sensor import (
@@ -10,6 +13,7 @@ from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
+    StateType,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -18,14 +22,32 @@ from homeassistant.const import (
     PERCENTAGE,
     UnitOfPressure,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util.json import json_loads_object
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from custom_components.senziio import Senziio
 
+from .aggregation import SharedWindowAggregator
+from .analytics import ThermalAnalysis, ThermalAnalyzer, async_get_analytics_pool
+from .areas import AREA_METRICS, SenziioAreaIndex, area_name, async_get_area_index
+from .backfill import SenziioBackfill
+from .beacons import async_get_beacon_table
+from .binary_sensor import BINARY_SENSOR_DESCRIPTIONS
+from .discovery import SenziioMetricDiscovery, async_get_discovery_index
 from .entity import DOMAIN, SenziioEntity
+from .event import SENZIIO_AUTOMATION_EVENT
+from .history import SampleBuffer, async_get_history_buffers
+from .metrics import DEDUPES, DROPS, MESSAGES, STATE_WRITES
+from .thermal import THERMAL_FRAME_TOPIC
+from .tracing import async_get_tracer
+from .tracking import RadarTracker
+from .utils import decode_sample
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -35,6 +57,13 @@ class SenziioSensorEntityDescription(SensorEntityDescription):
     value_key: str
 
 
+@dataclass(frozen=True, kw_only=True)
+class SenziioDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Class describing Senziio diagnostic sensor entities."""
+
+    value_fn: Callable[[Senziio], StateType]
+
+
 SENSOR_DESCRIPTIONS: tuple[SenziioSensorEntityDescription, ...] = (
     SenziioSensorEntityDescription(
         name="CO2",
@@ -84,6 +113,96 @@ SENSOR_DESCRIPTIONS: tuple[SenziioSensorEntityDescription, ...] = (
     ),
 )
 
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: tuple[SenziioDiagnosticSensorEntityDescription, ...] = (
+    SenziioDiagnosticSensorEntityDescription(
+        name="Message Gap Rate",
+        key="gap_rate",
+        translation_key="gap-rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=2,
+        value_fn=lambda device: _percentage(device.gap_rate),
+    ),
+    SenziioDiagnosticSensorEntityDescription(
+        name="Message Loss Rate",
+        key="loss_rate",
+        translation_key="loss-rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=2,
+        value_fn=lambda device: _percentage(device.loss_rate),
+    ),
+    SenziioDiagnosticSensorEntityDescription(
+        name="Round Trip Time",
+        key="rtt",
+        translation_key="rtt",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda device: _milliseconds(device.rtt.srtt),
+    ),
+    SenziioDiagnosticSensorEntityDescription(
+        name="Messages Handled",
+        key="messages",
+        translation_key="messages",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda device: device.metrics.total(MESSAGES),
+    ),
+    SenziioDiagnosticSensorEntityDescription(
+        name="Messages Dropped",
+        key="messages_dropped",
+        translation_key="messages-dropped",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda device: device.metrics.total(DROPS)
+        + device.metrics.total(DEDUPES),
+    ),
+    SenziioDiagnosticSensorEntityDescription(
+        name="State Writes",
+        key="state_writes",
+        translation_key="state-writes",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda device: device.metrics.total(STATE_WRITES),
+    ),
+    SenziioDiagnosticSensorEntityDescription(
+        name="Handler Time p95",
+        key="handler_time_p95",
+        translation_key="handler-time",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=3,
+        value_fn=lambda device: _milliseconds(device.metrics.handler_quantile(0.95)),
+    ),
+)
+
+
+# window of companion aggregate entities, in seconds
+AGGREGATE_WINDOW = 300
+AGGREGATE_STATISTICS = ("mean", "min", "max")
+AREA_STATISTICS = ("mean", "max")
+
+
+def _percentage(ratio: float | None) -> float | None:
+    """Convert a ratio to a percentage."""
+    return None if ratio is None else ratio * 100
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds."""
+    return None if seconds is None else seconds * 1000
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -98,6 +217,104 @@ async def async_setup_entry(
             for entity_description in SENSOR_DESCRIPTIONS
         ]
     )
+    async_add_entities(
+        [
+            SenziioDiagnosticSensorEntity(entity_description, entry, device)
+            for entity_description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
+        ]
+    )
+
+    # optional windowed aggregates, meant to be recorded instead of raw samples
+    aggregate_entities = []
+    for entity_description in SENSOR_DESCRIPTIONS:
+        aggregator = SharedWindowAggregator(
+            device, entity_description.key, AGGREGATE_WINDOW
+        )
+        aggregate_entities.extend(
+            SenziioAggregateSensorEntity(
+                entity_description, statistic, entry, device, aggregator
+            )
+            for statistic in AGGREGATE_STATISTICS
+        )
+    async_add_entities(aggregate_entities)
+
+    async_add_entities(
+        [
+            SenziioPeopleCountSensorEntity(entry, device),
+            SenziioRadarTargetsSensorEntity(entry, device),
+            SenziioBeaconsSensorEntity(entry, device),
+        ]
+    )
+
+    # create generic entities for metrics unknown to this release
+    @callback
+    def _create_discovered(keys: list[str]) -> None:
+        async_add_entities(
+            [
+                SenziioSensorEntity(hass, _discovered_description(key), entry, device)
+                for key in keys
+            ]
+        )
+
+    index = await async_get_discovery_index(hass)
+    discovery = SenziioMetricDiscovery(index, device.id, _create_discovered)
+    discovery.async_restore()
+
+    known_keys = {descr.key for descr in SENSOR_DESCRIPTIONS}
+    known_keys.update(descr.key for descr in BINARY_SENSOR_DESCRIPTIONS)
+    known_keys.update(index.keys(device.id))
+    entry.async_on_unload(
+        await device.listen_new_metrics(known_keys, discovery.async_handle_key)
+    )
+
+    # fill statistics of the time the device was offline
+    backfill = SenziioBackfill(
+        hass,
+        entry,
+        device,
+        {descr.key: descr.native_unit_of_measurement for descr in SENSOR_DESCRIPTIONS},
+    )
+    entry.async_on_unload(await device.listen_backfill(backfill.async_handle_buffered))
+    entry.async_on_unload(
+        device.availability.add_listener(backfill.async_handle_returned)
+    )
+    entry.async_on_unload(backfill.async_shutdown)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Set up Senziio area sensor entities."""
+    if discovery_info is None:
+        return
+
+    descriptions = [descr for descr in SENSOR_DESCRIPTIONS if descr.key in AREA_METRICS]
+    index = async_get_area_index(hass)
+
+    @callback
+    def _create_area_entities(area_id: str) -> None:
+        name = area_name(hass, area_id)
+        async_add_entities(
+            [
+                SenziioAreaSensorEntity(index, area_id, name, descr, statistic)
+                for descr in descriptions
+                for statistic in AREA_STATISTICS
+            ]
+        )
+
+    index.async_register_platform(_create_area_entities)
+
+
+def _discovered_description(key: str) -> SenziioSensorEntityDescription:
+    """Build a generic description for a discovered metric key."""
+    return SenziioSensorEntityDescription(
+        name=" ".join(key.replace("_", "-").split("-")).capitalize(),
+        key=key,
+        value_key=key,
+    )
 
 
 class SenziioSensorEntity(SenziioEntity, SensorEntity):
@@ -116,16 +333,382 @@ class SenziioSensorEntity(SenziioEntity, SensorEntity):
         self.entity_description = entity_description
         self._attr_unique_id = f"{device.id}_{entity_description.key}"
         self._hass = hass
+        self._device = device
         self._dt_topic = device.entity_topic(entity_description.key)
+        self._history = SampleBuffer(delta_encoding=False)
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to MQTT data event."""
+        async_get_history_buffers(self.hass)[self.entity_id] = self._history
+        metrics = self._device.metrics.topic(self.entity_description.key)
+        counters = metrics.counters
 
         @callback
         def message_received(message):
             """Handle new MQTT messages."""
-            data = json_loads_object(message.payload)
-            self._attr_native_value = data.get(self.entity_description.value_key)
+            start = metrics.start()
+            value, seq, ts = decode_sample(
+                message.payload, self.entity_description.value_key
+            )
+            metrics.decoded(start)
+            if not self._device.accept_sample(self.entity_description.key, seq, ts):
+                counters[DROPS] += 1
+                return
+            self._attr_native_value = value
+            # device clocks may be off, samples are kept in local time
+            timestamp = time.time()
+            if isinstance(value, (int, float)):
+                self._history.append(timestamp, value)
+            self._device.dispatch_sample(self.entity_description.key, timestamp, value)
             self.async_write_ha_state()
+            counters[STATE_WRITES] += 1
+            metrics.handled(start)
+
+        with async_get_tracer(self.hass).span(
+            "subscribe", self._device.id, topic=self._dt_topic
+        ):
+            await async_subscribe(self._hass, self._dt_topic, message_received, 1)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Release buffered samples."""
+        async_get_history_buffers(self.hass).pop(self.entity_id, None)
+
+
+class SenziioDiagnosticSensorEntity(SenziioEntity, SensorEntity):
+    """Senziio sensor entity polling integration-side device statistics."""
+
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        entity_description: SenziioDiagnosticSensorEntityDescription,
+        entry: ConfigEntry,
+        device: Senziio,
+    ) -> None:
+        """Initialize entity."""
+        super().__init__(entry)
+        self.entity_id = f"sensor.senziio_{entity_description.key}_{device.id}"
+        self.entity_description = entity_description
+        self._attr_unique_id = f"{device.id}_{entity_description.key}"
+        self._device = device
+
+    async def async_update(self) -> None:
+        """Read current value from device statistics."""
+        self._attr_native_value = self.entity_description.value_fn(self._device)
+
+
+class SenziioAggregateSensorEntity(SenziioEntity, SensorEntity):
+    """Senziio sensor entity reporting a windowed statistic of a metric."""
+
+    _attr_entity_registry_enabled_default = False
 
-        await async_subscribe(self._hass, self._dt_topic, message_received, 1)
+    def __init__(
+        self,
+        entity_description: SenziioSensorEntityDescription,
+        statistic: str,
+        entry: ConfigEntry,
+        device: Senziio,
+        aggregator: SharedWindowAggregator,
+    ) -> None:
+        """Initialize entity."""
+        super().__init__(entry)
+        key = f"{entity_description.key}_{statistic}"
+        minutes = int(aggregator.window // 60)
+        self.entity_id = f"sensor.senziio_{key}_{device.id}"
+        self.entity_description = replace(
+            entity_description,
+            key=key,
+            name=f"{entity_description.name} {minutes} min {statistic}",
+        )
+        self._attr_unique_id = f"{device.id}_{key}"
+        self._statistic = statistic
+        self._aggregator = aggregator
+
+    async def async_added_to_hass(self) -> None:
+        """Start aggregating device samples."""
+        self._aggregator.attach()
+        self.async_on_remove(self._aggregator.detach)
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_write_window,
+                timedelta(seconds=self._aggregator.window),
+            )
+        )
+
+    @callback
+    def _async_write_window(self, now: datetime) -> None:
+        """Write statistic once per window."""
+        self._aggregator.expire(now.timestamp())
+        self._attr_native_value = getattr(self._aggregator, self._statistic)
+        self.async_write_ha_state()
+
+
+class SenziioPeopleCountSensorEntity(SenziioEntity, SensorEntity):
+    """Senziio sensor entity counting people in thermal frames.
+
+    Frames are analysed in a shared worker pool, the state is only written
+    when the count changes. Results arriving after removal are ignored.
+    """
+
+    _attr_name = "People Count"
+    _attr_translation_key = "person-counter"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, device: Senziio) -> None:
+        """Initialize entity."""
+        super().__init__(entry)
+        self.entity_id = f"sensor.senziio_people_count_{device.id}"
+        self._attr_unique_id = f"{device.id}_people_count"
+        self._device = device
+        self._dt_topic = device.entity_topic(THERMAL_FRAME_TOPIC)
+        self._analyzer = ThermalAnalyzer()
+        self._analyzing = False
+        self._hotspot = False
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to raw thermal frames."""
+        pool = async_get_analytics_pool(self.hass)
+
+        @callback
+        def frame_received(message) -> None:
+            pool.async_submit(
+                self._device.id,
+                self._analyzer,
+                message.payload,
+                self._async_handle_analysis,
+            )
+
+        @callback
+        def stop_analysis() -> None:
+            self._analyzing = False
+            pool.async_cancel(self._device.id)
+
+        with async_get_tracer(self.hass).span(
+            "subscribe", self._device.id, topic=self._dt_topic
+        ):
+            unsubscribe = await async_subscribe(
+                self.hass, self._dt_topic, frame_received, 0, encoding=None
+            )
+        self._analyzing = True
+        self.async_on_remove(unsubscribe)
+        self.async_on_remove(stop_analysis)
+
+    @callback
+    def _async_handle_analysis(self, analysis: ThermalAnalysis) -> None:
+        """Handle result of a frame analysis."""
+        if not self._analyzing:
+            return
+        if analysis.people_count != self._attr_native_value:
+            self._attr_native_value = analysis.people_count
+            self.async_write_ha_state()
+
+        # fire an event when a hotspot shows up
+        hotspot = analysis.hotspot is not None
+        if hotspot and not self._hotspot:
+            row, column, temperature = analysis.hotspot
+            self.hass.bus.async_fire(
+                SENZIIO_AUTOMATION_EVENT,
+                {
+                    "name": "Event",
+                    "event_type": "hotspotEvent",
+                    "event_name": "hotspotEvent",
+                    "data": {
+                        "row": row,
+                        "column": column,
+                        "temperature": temperature / 100,
+                    },
+                    "message": f"hotspotEvent: {temperature / 100:.1f} °C",
+                    "entity_id": self.entity_id,
+                    "device_id": self._device.id,
+                    "domain": "event",
+                    "computed": True,
+                },
+            )
+        self._hotspot = hotspot
+
+
+class SenziioRadarTargetsSensorEntity(SenziioEntity, SensorEntity):
+    """Senziio sensor entity tracking radar targets.
+
+    Radar payloads may carry a ``targets`` list with positions and
+    velocities. State is only written when targets appear, leave or move
+    noticeably, not on every radar frame.
+    """
+
+    _attr_name = "Radar Targets"
+    _attr_translation_key = "radar-targets"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, device: Senziio) -> None:
+        """Initialize entity."""
+        super().__init__(entry)
+        self.entity_id = f"sensor.senziio_radar_targets_{device.id}"
+        self._attr_unique_id = f"{device.id}_radar_targets"
+        self._device = device
+        self._dt_topic = device.entity_topic("radar")
+        self._tracker = RadarTracker()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to radar frames."""
+        metrics = self._device.metrics.topic("radar-targets", shared=True)
+        counters = metrics.counters
+
+        @callback
+        def message_received(message):
+            """Handle new MQTT messages."""
+            start = metrics.start()
+            targets, seq, ts = decode_sample(message.payload, "targets")
+            metrics.decoded(start)
+            if targets is None or isinstance(targets, bool):
+                # scalar radar payload or an object without targets
+                targets = []
+            elif not isinstance(targets, list):
+                counters[DROPS] += 1
+                return
+            if not self._device.accept_sample("radar-targets", seq, ts):
+                counters[DROPS] += 1
+                return
+            # device clocks may be off, tracks age in local time
+            if self._tracker.update(targets, time.time()):
+                self._attr_native_value = len(self._tracker.tracks)
+                self._attr_extra_state_attributes = {
+                    "targets": self._tracker.as_attributes()
+                }
+                self.async_write_ha_state()
+                counters[STATE_WRITES] += 1
+            metrics.handled(start)
+
+        with async_get_tracer(self.hass).span(
+            "subscribe", self._device.id, topic=self._dt_topic
+        ):
+            unsubscribe = await async_subscribe(
+                self.hass, self._dt_topic, message_received, 0
+            )
+        self.async_on_remove(unsubscribe)
+
+
+class SenziioBeaconsSensorEntity(SenziioEntity, SensorEntity):
+    """Senziio sensor entity listing beacons nearest to the device.
+
+    Beacon payloads may carry a ``beacons`` list of IDs with RSSI. Each
+    beacon is assigned to the device hearing it strongest across the fleet,
+    and state is only written when a beacon enters or leaves this device.
+    """
+
+    _attr_name = "Nearby Beacons"
+    _attr_translation_key = "beacons"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry: ConfigEntry, device: Senziio) -> None:
+        """Initialize entity."""
+        super().__init__(entry)
+        self.entity_id = f"sensor.senziio_beacons_{device.id}"
+        self._attr_unique_id = f"{device.id}_beacons"
+        self._device = device
+        self._dt_topic = device.entity_topic("beacon")
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to beacon advertisements."""
+        table = async_get_beacon_table(self.hass)
+        device_id = self._device.id
+        metrics = self._device.metrics.topic("beacons", shared=True)
+        counters = metrics.counters
+
+        @callback
+        def beacons_changed() -> None:
+            beacons = table.beacons(device_id)
+            self._attr_native_value = len(beacons)
+            self._attr_extra_state_attributes = {"beacons": sorted(beacons)}
+            self.async_write_ha_state()
+            counters[STATE_WRITES] += 1
+
+        @callback
+        def message_received(message):
+            """Handle new MQTT messages."""
+            start = metrics.start()
+            beacons, _, _ = decode_sample(message.payload, "beacons")
+            metrics.decoded(start)
+            if beacons is None or isinstance(beacons, bool):
+                # legacy presence payload without a beacon table
+                metrics.handled(start)
+                return
+            if not isinstance(beacons, list):
+                counters[DROPS] += 1
+                return
+            for beacon in beacons:
+                if (
+                    isinstance(beacon, dict)
+                    and isinstance(beacon_id := beacon.get("id"), str)
+                    and isinstance(rssi := beacon.get("rssi"), (int, float))
+                ):
+                    table.async_update(device_id, beacon_id, rssi)
+            metrics.handled(start)
+
+        self._attr_native_value = 0
+        self.async_on_remove(table.async_listen(device_id, beacons_changed))
+        self.async_on_remove(lambda: table.async_remove_device(device_id))
+        with async_get_tracer(self.hass).span(
+            "subscribe", self._device.id, topic=self._dt_topic
+        ):
+            unsubscribe = await async_subscribe(
+                self.hass, self._dt_topic, message_received, 0
+            )
+        self.async_on_remove(unsubscribe)
+
+
+class SenziioAreaSensorEntity(SensorEntity):
+    """Sensor entity reporting a statistic of a metric across an area."""
+
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        index: SenziioAreaIndex,
+        area_id: str,
+        name: str,
+        entity_description: SenziioSensorEntityDescription,
+        statistic: str,
+    ) -> None:
+        """Initialize entity."""
+        key = f"{entity_description.key}_{statistic}"
+        self.entity_id = f"sensor.senziio_area_{area_id}_{key}"
+        self.entity_description = replace(
+            entity_description,
+            key=key,
+            name=f"{name} {entity_description.name} {statistic}",
+            translation_key=None,
+        )
+        self._attr_unique_id = f"area_{area_id}_{key}"
+        self._index = index
+        self._area_id = area_id
+        self._metric = entity_description.key
+        self._statistic = statistic
+
+    async def async_added_to_hass(self) -> None:
+        """Follow area aggregate."""
+        self.async_on_remove(
+            self._index.async_listen(self._area_id, self._metric, self._async_update)
+        )
+        self.async_on_remove(
+            self._index.async_listen_removal(self._area_id, self._async_area_removed)
+        )
+        self._async_update(write=False)
+
+    @callback
+    def _async_area_removed(self) -> None:
+        """Remove the entity once its area is deleted."""
+        er.async_get(self.hass).async_remove(self.entity_id)
+
+    @callback
+    def _async_update(self, write: bool = True) -> None:
+        """Write state when the statistic changes."""
+        aggregate = self._index.aggregate(self._area_id, self._metric)
+        value = getattr(aggregate, self._statistic)
+        available = value is not None
+        if value == self._attr_native_value and available == self._attr_available:
+            return
+        self._attr_native_value = value
+        self._attr_available = available
+        if write:
+            self.async_write_ha_state()
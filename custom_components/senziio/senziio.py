@@ -3,7 +3,14 @@
 import asyncio
 import json
 import logging
+import time
+import uuid
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+
+from yarl import URL
+
+from .metrics import DROPS, DeviceMetrics
 
 logger = logging.getLogger(__name__)
 
@@ -20,22 +27,243 @@ class SenziioMQTT(ABC):
         """Subscribe to topic with a callback."""
 
 
+class SenziioHTTPError(Exception):
+    """Error to indicate that a device HTTP request failed."""
+
+
+class SenziioHTTP(ABC):
+    """Senziio local HTTP communication interface."""
+
+    @abstractmethod
+    async def get_json(self, path):
+        """Get JSON document at path, raise SenziioHTTPError on failure."""
+
+    @abstractmethod
+    def stream(self, path) -> AsyncIterator[bytes]:
+        """Stream response body at path in chunks, raise SenziioHTTPError on failure."""
+
+
+# longest NDJSON line accepted from a device, in bytes
+MAX_LINE_LENGTH = 64 * 1024
+
+
+async def iter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator:
+    """Decode newline delimited JSON incrementally from chunks of bytes.
+
+    Only the current partial line is buffered. Lines that are malformed or
+    longer than MAX_LINE_LENGTH are skipped.
+    """
+    buffer = bytearray()
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line = buffer[start:end]
+            start = end + 1
+            if skipping:
+                skipping = False
+                continue
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.debug("Skipping malformed NDJSON line")
+        del buffer[:start]
+        if len(buffer) > MAX_LINE_LENGTH:
+            logger.debug("Skipping NDJSON line longer than %s bytes", MAX_LINE_LENGTH)
+            buffer.clear()
+            skipping = True
+    if buffer.strip() and not skipping:
+        try:
+            yield json.loads(buffer)
+        except ValueError:
+            logger.debug("Skipping malformed NDJSON line")
+
+
+class AvailabilityTracker:
+    """Track when a device was last heard from.
+
+    Listeners are called with the start and end of the silence when a
+    device sends data again after being quiet for longer than
+    OFFLINE_AFTER seconds.
+    """
+
+    OFFLINE_AFTER = 300
+
+    __slots__ = ("last_seen", "_listeners")
+
+    def __init__(self) -> None:
+        """Initialize tracker."""
+        self.last_seen: float | None = None
+        self._listeners: tuple[Callable, ...] = ()
+
+    def add_listener(self, callback: Callable) -> Callable:
+        """Register a callback for devices coming back, return its remover."""
+        self._listeners = (*self._listeners, callback)
+
+        def remove():
+            self._listeners = tuple(
+                listener for listener in self._listeners if listener is not callback
+            )
+
+        return remove
+
+    def seen(self, now: float) -> None:
+        """Record that the device sent data."""
+        last_seen = self.last_seen
+        self.last_seen = now
+        if last_seen is not None and now - last_seen > self.OFFLINE_AFTER:
+            for callback in self._listeners:
+                callback(last_seen, now)
+
+
+class SequenceTracker:
+    """Track ordering and loss of messages published on a single topic.
+
+    Devices may add an increasing ``seq`` number and a ``ts`` timestamp to
+    their payloads. Messages older than the last accepted one are rejected
+    and jumps in the sequence are counted as gaps. A sequence falling back
+    to less than half its last value, by more than RESET_THRESHOLD, or
+    after the device was offline is taken as a device restart.
+    """
+
+    # a sequence drop larger than this is taken as a device restart
+    RESET_THRESHOLD = 1000
+
+    __slots__ = ("last_seq", "last_ts", "received", "stale", "gaps", "lost")
+
+    def __init__(self) -> None:
+        """Initialize tracker."""
+        self.last_seq: int | None = None
+        self.last_ts: float | None = None
+        self.received = 0
+        self.stale = 0
+        self.gaps = 0
+        self.lost = 0
+
+    def accept(self, seq, ts, resumed: bool = False) -> bool:
+        """Return whether a message is newer than the last accepted one.
+
+        ``resumed`` tells the device was offline before this message.
+        """
+        if not isinstance(seq, int) or isinstance(seq, bool):
+            seq = None
+        if not isinstance(ts, (int, float)) or isinstance(ts, bool):
+            ts = None
+
+        if seq is not None and self.last_seq is not None:
+            delta = seq - self.last_seq
+            if delta <= 0:
+                restarted = (
+                    resumed
+                    or -delta > self.RESET_THRESHOLD
+                    or 2 * seq < self.last_seq
+                    or (
+                        ts is not None and self.last_ts is not None and ts > self.last_ts
+                    )
+                )
+                if not restarted:
+                    self.stale += 1
+                    return False
+            elif delta > 1:
+                self.gaps += 1
+                self.lost += delta - 1
+        elif ts is not None and self.last_ts is not None and ts < self.last_ts:
+            self.stale += 1
+            return False
+
+        if seq is not None:
+            self.last_seq = seq
+        if ts is not None:
+            self.last_ts = ts
+        self.received += 1
+        return True
+
+
+class RTTEstimator:
+    """Smoothed round-trip time of a device and the timeout derived from it.
+
+    Follows the TCP retransmission timer: the smoothed RTT and its mean
+    deviation are exponentially weighted moving averages, and the timeout
+    is the smoothed RTT plus four deviations. Missed probes double the
+    timeout until the next sample.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    # seconds, the initial timeout is used until a first sample
+    INITIAL_TIMEOUT = 10
+    MIN_TIMEOUT = 1
+    MAX_TIMEOUT = 30
+
+    __slots__ = ("srtt", "rttvar", "timeout")
+
+    def __init__(self) -> None:
+        """Initialize estimator."""
+        self.srtt: float | None = None
+        self.rttvar = 0.0
+        self.timeout: float = self.INITIAL_TIMEOUT
+
+    def add(self, rtt: float) -> None:
+        """Add a round-trip time sample in seconds."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += self.BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += self.ALPHA * (rtt - self.srtt)
+        self.timeout = min(
+            max(self.srtt + 4 * self.rttvar, self.MIN_TIMEOUT), self.MAX_TIMEOUT
+        )
+
+    def backoff(self) -> None:
+        """Double the timeout after a missed response."""
+        self.timeout = min(self.timeout * 2, self.MAX_TIMEOUT)
+
+
 class Senziio:
     """Senziio device communications."""
 
-    GET_INFO_TIMEOUT = 10
+    PING_COMMAND = "ping"
+    HTTP_INFO_PATH = "/device-info"
+    HTTP_HISTORY_PATH = "/history"
 
-    def __init__(self, device_id: str, device_model: str, mqtt: SenziioMQTT) -> None:
+    # devices answer on their own info response topic
+    BROADCAST_INFO_REQ = "cmd/all/device-info/req"
+    INFO_RES_WILDCARD = "cmd/+/+/device-info/res"
+
+    # data topics that do not carry metric values
+    RESERVED_TOPICS = frozenset({"backfill", "device-info", "event", "thermal-frame"})
+
+    def __init__(
+        self,
+        device_id: str,
+        device_model: str,
+        mqtt: SenziioMQTT,
+        http: SenziioHTTP | None = None,
+    ) -> None:
         """Initialize instance."""
         self.device_id = device_id
         self.model_key = "-".join(device_model.lower().split())
         self.mqtt = mqtt
+        self.http = http
         self.topics = {
             "info_req": f"cmd/{self.model_key}/{device_id}/device-info/req",
             "info_res": f"cmd/{self.model_key}/{device_id}/device-info/res",
             "data": f"dt/{self.model_key}/{device_id}",
             "device_info": f"dt/{self.model_key}/{device_id}/device-info",
         }
+        self.sequences: dict[str, SequenceTracker] = {}
+        self.availability = AvailabilityTracker()
+        # drives the timeout of info requests and commands
+        self.rtt = RTTEstimator()
+        self.metrics = DeviceMetrics()
+        self._sample_listeners: dict[str, tuple[Callable, ...]] = {}
+        # pending pings by request ID, answered on one lasting subscription
+        self._pings: dict[str, asyncio.Future] = {}
+        self._ping_lock = asyncio.Lock()
+        self._unsubscribe_pings: Callable | None = None
 
     @property
     def id(self):
@@ -46,8 +274,232 @@ class Senziio:
         """Get topic for listening to entity data updates."""
         return f"{self.topics['data']}/{entity}"
 
+    def accept_sample(self, key: str, seq, ts) -> bool:
+        """Check a sample of a metric topic against its sequence tracker."""
+        now = time.time()
+        last_seen = self.availability.last_seen
+        self.availability.seen(now)
+        if seq is None and ts is None:
+            return True
+        if (tracker := self.sequences.get(key)) is None:
+            tracker = self.sequences[key] = SequenceTracker()
+        offline_after = AvailabilityTracker.OFFLINE_AFTER
+        resumed = last_seen is not None and now - last_seen > offline_after
+        return tracker.accept(seq, ts, resumed)
+
+    def add_sample_listener(self, key: str, callback: Callable) -> Callable:
+        """Register a callback for accepted samples of a metric.
+
+        The callback receives the local time the sample was received and
+        the decoded value.
+        Returns a function removing the listener.
+        """
+        # listeners are kept in tuples so dispatching never copies them
+        self._sample_listeners[key] = (*self._sample_listeners.get(key, ()), callback)
+
+        def remove():
+            listeners = tuple(
+                listener
+                for listener in self._sample_listeners.get(key, ())
+                if listener is not callback
+            )
+            if listeners:
+                self._sample_listeners[key] = listeners
+            else:
+                self._sample_listeners.pop(key, None)
+
+        return remove
+
+    def dispatch_sample(self, key: str, timestamp: float, value) -> None:
+        """Hand an accepted sample to listeners of its metric."""
+        if listeners := self._sample_listeners.get(key):
+            for callback in listeners:
+                callback(timestamp, value)
+
+    @property
+    def sample_listener_count(self) -> int:
+        """Return number of registered sample listeners."""
+        return sum(len(listeners) for listeners in self._sample_listeners.values())
+
+    @property
+    def gap_rate(self) -> float | None:
+        """Return share of accepted messages that followed a sequence gap."""
+        received = sum(tracker.received for tracker in self.sequences.values())
+        if not received:
+            return None
+        return sum(tracker.gaps for tracker in self.sequences.values()) / received
+
+    @property
+    def loss_rate(self) -> float | None:
+        """Return share of sequenced messages that never arrived."""
+        received = sum(tracker.received for tracker in self.sequences.values())
+        lost = sum(tracker.lost for tracker in self.sequences.values())
+        if not received + lost:
+            return None
+        return lost / (received + lost)
+
+    async def iter_history(self, key: str, since: float) -> AsyncIterator:
+        """Stream samples of a metric stored by the device since a timestamp.
+
+        The device answers with one ``[timestamp, value]`` JSON array per
+        line. Requires the HTTP transport, raises SenziioHTTPError when the
+        transfer fails.
+        """
+        if self.http is None:
+            raise SenziioHTTPError("device address unknown")
+        path = URL(self.HTTP_HISTORY_PATH).with_query(
+            {"key": key, "since": int(since)}
+        )
+        async for sample in iter_ndjson(self.http.stream(path)):
+            if isinstance(sample, list) and len(sample) == 2:
+                yield sample
+
+    @classmethod
+    async def discover(cls, mqtt: SenziioMQTT, window: float) -> dict[str, dict]:
+        """Broadcast an info request and collect answers during a window.
+
+        Returns device info by device ID as reported by each device.
+        """
+        devices: dict[str, dict] = {}
+
+        def handle_response(message):
+            try:
+                _, _, device_id, *_ = message.topic.split("/")
+                info = json.loads(message.payload)
+            except ValueError:
+                logger.debug("Ignoring bad device info response on %s", message.topic)
+                return
+            if isinstance(info, dict):
+                devices[device_id] = info
+
+        unsubscribe_callback = await mqtt.subscribe(
+            cls.INFO_RES_WILDCARD, handle_response
+        )
+        try:
+            await mqtt.publish(cls.BROADCAST_INFO_REQ, "Device info request")
+            await asyncio.sleep(window)
+        finally:
+            unsubscribe_callback()
+        return devices
+
+    def command_topics(self, command: str) -> tuple[str, str]:
+        """Return request and response topics of a command."""
+        base = f"cmd/{self.model_key}/{self.device_id}/{command}"
+        return f"{base}/req", f"{base}/res"
+
+    async def send_command(
+        self, command: str, payload: dict | None = None, timeout: float | None = None
+    ):
+        """Send a command and wait for its response.
+
+        A random ``request_id`` is added to the JSON payload. Responses
+        echoing another request ID are ignored, responses without one are
+        taken as the answer. Returns the decoded response, or None when the
+        device does not answer in time. The timeout defaults to the one
+        derived from the device round-trip time.
+        """
+        request_id = uuid.uuid4().hex
+        request_topic, response_topic = self.command_topics(command)
+        response = asyncio.get_running_loop().create_future()
+
+        def handle_response(message):
+            try:
+                data = json.loads(message.payload)
+            except ValueError:
+                logger.debug("Ignoring bad %s response: %s", command, message.payload)
+                return
+            if isinstance(data, dict) and data.get("request_id", request_id) != request_id:
+                return
+            if not response.done():
+                response.set_result(data)
+
+        unsubscribe_callback = await self.mqtt.subscribe(
+            response_topic, handle_response
+        )
+        try:
+            await self.mqtt.publish(
+                request_topic, json.dumps({**(payload or {}), "request_id": request_id})
+            )
+            return await asyncio.wait_for(response, timeout or self.rtt.timeout)
+        except TimeoutError:
+            return None
+        finally:
+            unsubscribe_callback()
+
+    async def ping(self) -> float | None:
+        """Measure the round-trip time of a command, in seconds.
+
+        The ping response topic is subscribed on first use and kept until
+        :meth:`stop_pings`, so probes only publish. The time runs from the
+        publish to the arrival of the matching response. Returns None and
+        backs off the command timeout when the device does not answer.
+        """
+        async with self._ping_lock:
+            if self._unsubscribe_pings is None:
+                _, response_topic = self.command_topics(self.PING_COMMAND)
+                self._unsubscribe_pings = await self.mqtt.subscribe(
+                    response_topic, self._handle_ping_response
+                )
+
+        request_id = uuid.uuid4().hex
+        request_topic, _ = self.command_topics(self.PING_COMMAND)
+        response = asyncio.get_running_loop().create_future()
+        self._pings[request_id] = response
+        try:
+            start = time.monotonic()
+            await self.mqtt.publish(
+                request_topic, json.dumps({"request_id": request_id})
+            )
+            received = await asyncio.wait_for(response, self.rtt.timeout)
+        except TimeoutError:
+            self.rtt.backoff()
+            return None
+        finally:
+            self._pings.pop(request_id, None)
+        rtt = received - start
+        self.rtt.add(rtt)
+        return rtt
+
+    def _handle_ping_response(self, message) -> None:
+        """Resolve the pending ping a response answers with its arrival time."""
+        received = time.monotonic()
+        try:
+            data = json.loads(message.payload)
+        except ValueError:
+            logger.debug("Ignoring bad ping response: %s", message.payload)
+            return
+        if isinstance(data, dict) and "request_id" in data:
+            response = self._pings.get(data["request_id"])
+        else:
+            # responses without a request ID answer the oldest ping
+            response = next(iter(self._pings.values()), None)
+        if response is not None and not response.done():
+            response.set_result(received)
+
+    def stop_pings(self) -> None:
+        """Release the ping response subscription."""
+        if self._unsubscribe_pings is not None:
+            self._unsubscribe_pings()
+            self._unsubscribe_pings = None
+
     async def get_info(self):
-        """Get device info."""
+        """Get device info, over HTTP when the device address is known."""
+        if self.http is not None:
+            try:
+                device_info = await self.http.get_json(self.HTTP_INFO_PATH)
+            except SenziioHTTPError as error:
+                logger.debug(
+                    "HTTP device info request failed, using MQTT: %s", error
+                )
+            else:
+                if isinstance(device_info, dict) and device_info:
+                    return device_info
+                logger.debug("Unexpected HTTP device info, using MQTT")
+
+        return await self._get_info_mqtt()
+
+    async def _get_info_mqtt(self):
+        """Get device info through an MQTT request."""
         device_info = {}
         response = asyncio.Event()
 
@@ -73,7 +525,7 @@ class Senziio:
         )
 
         try:
-            await asyncio.wait_for(response.wait(), self.GET_INFO_TIMEOUT)
+            await asyncio.wait_for(response.wait(), self.rtt.timeout)
             return device_info
         except TimeoutError:
             return None
@@ -104,6 +556,57 @@ class Senziio:
         await self.mqtt.subscribe(self.topics['device_info'], _handler)
 
 
+    async def listen_new_metrics(self, known_keys, callback):
+        """Listen to data topics whose suffix is not a known metric key.
+
+        The callback receives the topic suffix under dt/<model>/<id>/ and
+        returns False if the same suffix should be reported again later.
+        """
+        prefix_length = len(self.topics["data"]) + 1
+        seen = set(known_keys) | self.RESERVED_TOPICS
+
+        def handle(message):
+            key = message.topic[prefix_length:]
+            if key in seen:
+                return
+            if callback(key) is not False:
+                seen.add(key)
+
+        return await self.mqtt.subscribe(self.entity_topic("+"), handle)
+
+    async def listen_backfill(self, callback):
+        """Listen to buffered samples published by a device after reconnecting.
+
+        Example payload:
+
+            {"key": "temperature", "samples": [[1718000000, 21.4], [1718000060, 21.5]]}
+
+        """
+        metrics = self.metrics.topic("backfill")
+        counters = metrics.counters
+
+        def handle(message):
+            start = metrics.start()
+            try:
+                data = json.loads(message.payload)
+            except json.JSONDecodeError:
+                logger.warning("Bad backfill payload: %s", message.payload[:100])
+                counters[DROPS] += 1
+                return
+            metrics.decoded(start)
+
+            key = data.get("key") if isinstance(data, dict) else None
+            samples = data.get("samples") if key else None
+            if not isinstance(key, str) or not isinstance(samples, list):
+                logger.warning("Backfill payload without key or samples")
+                counters[DROPS] += 1
+                return
+
+            callback(key, samples)
+            metrics.handled(start)
+
+        return await self.mqtt.subscribe(self.entity_topic("backfill"), handle)
+
     async def listen_events(self, callback):
         """Listen to events at dt/<identifier>/event."""
         async def handle(message):
@@ -0,0 +1,241 @@
+"""Senziio integration services."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import json_dumps
+
+from .entity import DOMAIN
+from .fleet import async_fan_out, async_select_devices, async_send_fleet_command
+from .history import async_query_history
+from .reporting import (
+    CONF_INTERVAL,
+    CONF_REPORTING,
+    CONF_THRESHOLDS,
+    REPORTING_INTERVAL,
+    REPORTING_THRESHOLDS,
+    async_apply_reporting,
+)
+from .senziio import Senziio
+from .tracing import TRACE_FILE, async_get_tracer
+
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_IMPORT_MANIFEST = "import_manifest"
+SERVICE_SEND_COMMAND = "send_command"
+SERVICE_SET_REPORTING = "set_reporting"
+SERVICE_PROFILE = "profile"
+SERVICE_EXPORT_TRACE = "export_trace"
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required("entity_id"): cv.entity_ids,
+        vol.Optional("duration"): cv.positive_time_period,
+    }
+)
+
+IMPORT_MANIFEST_SCHEMA = vol.Schema({vol.Required("path"): cv.string})
+
+# devices targeted by fleet services, at least one target is required
+FLEET_TARGET_SCHEMA = {
+    vol.Optional("area_id"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("model"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("device_id"): vol.All(cv.ensure_list, [cv.string]),
+}
+
+SEND_COMMAND_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            # a single topic level under cmd/<model>/<id>/
+            vol.Required("command"): cv.matches_regex(r"^[a-z0-9][a-z0-9_-]*$"),
+            vol.Optional("payload", default={}): dict,
+            vol.Optional("timeout"): vol.All(
+                vol.Coerce(float), vol.Range(min=0.1, max=300)
+            ),
+            **FLEET_TARGET_SCHEMA,
+        }
+    ),
+    cv.has_at_least_one_key("area_id", "model", "device_id"),
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("duration", default=timedelta(seconds=10)): vol.All(
+            cv.positive_time_period, vol.Range(max=timedelta(minutes=5))
+        ),
+        vol.Optional("top", default=20): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+    }
+)
+
+SET_REPORTING_SCHEMA = vol.All(
+    cv.has_at_least_one_key(CONF_INTERVAL, CONF_THRESHOLDS),
+    cv.has_at_least_one_key("area_id", "model", "device_id"),
+    vol.Schema(
+        {
+            # fields left out keep their current value
+            vol.Optional(CONF_INTERVAL): REPORTING_INTERVAL,
+            vol.Optional(CONF_THRESHOLDS): REPORTING_THRESHOLDS,
+            **FLEET_TARGET_SCHEMA,
+        }
+    ),
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register Senziio services."""
+
+    @callback
+    def get_history(call: ServiceCall) -> ServiceResponse:
+        """Return buffered high-resolution samples of Senziio entities."""
+        since = None
+        if duration := call.data.get("duration"):
+            since = time.time() - duration.total_seconds()
+        return {
+            entity_id: async_query_history(hass, entity_id, since)
+            for entity_id in call.data["entity_id"]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def import_manifest(call: ServiceCall) -> ServiceResponse:
+        """Add all devices listed in a CSV or YAML manifest."""
+        # imported here, config flow depends on the integration module
+        from .provisioning import async_import_manifest, read_manifest
+
+        path = Path(hass.config.path(call.data["path"]))
+        if not hass.config.is_allowed_path(str(path)):
+            raise ServiceValidationError(f"Access to {path} is not allowed")
+        try:
+            rows = await hass.async_add_executor_job(read_manifest, path)
+        except (OSError, ValueError, vol.Invalid) as error:
+            raise ServiceValidationError(
+                f"Could not read manifest {path}: {error}"
+            ) from error
+
+        return await async_import_manifest(hass, rows)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_MANIFEST,
+        import_manifest,
+        schema=IMPORT_MANIFEST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def send_command(call: ServiceCall) -> ServiceResponse:
+        """Send a command to the targeted devices and collect their answers."""
+        devices = async_select_targets(hass, call)
+        return await async_send_fleet_command(
+            devices,
+            call.data["command"],
+            call.data["payload"],
+            call.data.get("timeout"),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_COMMAND,
+        send_command,
+        schema=SEND_COMMAND_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def set_reporting(call: ServiceCall) -> ServiceResponse:
+        """Set the reporting configuration of the targeted devices."""
+        devices = async_select_targets(hass, call)
+        entries = {
+            entry.data.get("serial-number"): entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+        }
+        changes = {
+            key: call.data[key]
+            for key in (CONF_INTERVAL, CONF_THRESHOLDS)
+            if key in call.data
+        }
+
+        def apply(device: Senziio):
+            entry = entries[device.id]
+            config = {**entry.options.get(CONF_REPORTING, {}), **changes}
+            return async_apply_reporting(hass, entry, device, config)
+
+        return await async_fan_out(devices, apply)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_REPORTING,
+        set_reporting,
+        schema=SET_REPORTING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the event loop and return the costliest Senziio functions."""
+        # imported here, profiling modules are only needed for captures
+        from .profiling import async_profile
+
+        return await async_profile(
+            hass, call.data["duration"].total_seconds(), call.data["top"]
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def export_trace(call: ServiceCall) -> ServiceResponse:
+        """Write the startup timeline as a Chrome trace file."""
+        tracer = async_get_tracer(hass)
+        path = Path(hass.config.path(TRACE_FILE))
+        trace = json_dumps(tracer.chrome_trace())
+        await hass.async_add_executor_job(path.write_text, trace, "utf-8")
+        return {
+            "path": str(path),
+            "spans": len(tracer.spans),
+            "dropped_spans": tracer.dropped,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TRACE,
+        export_trace,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_select_targets(hass: HomeAssistant, call: ServiceCall) -> list[Senziio]:
+    """Return devices targeted by a fleet service call."""
+    devices = async_select_devices(
+        hass,
+        call.data.get("area_id", ()),
+        call.data.get("model", ()),
+        call.data.get("device_id", ()),
+    )
+    if not devices:
+        raise ServiceValidationError("No loaded Senziio device matches the targets")
+    return devices
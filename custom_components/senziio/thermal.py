@@ -0,0 +1,115 @@
+"""Decoding and rendering of Senziio thermal frames."""
+
+from __future__ import annotations
+
+import struct
+import zlib
+
+import numpy as np
+
+THERMAL_FRAME_TOPIC = "thermal-frame"
+
+# frame header: little-endian uint16 width and height
+FRAME_HEADER = struct.Struct("<HH")
+# pixels: little-endian int16 temperatures in hundredths of a degree Celsius
+PIXEL_DTYPE = np.dtype("<i2")
+
+# rendered pixel size of each sensor pixel
+RENDER_SCALE = 10
+
+_PALETTE_ANCHORS = np.array(
+    [
+        (0, 0, 0),
+        (32, 0, 140),
+        (204, 0, 119),
+        (255, 165, 0),
+        (255, 255, 160),
+    ],
+    dtype=np.float64,
+)
+# 256 entry colour map from cold to hot
+PALETTE = np.stack(
+    [
+        np.interp(
+            np.linspace(0, len(_PALETTE_ANCHORS) - 1, 256),
+            np.arange(len(_PALETTE_ANCHORS)),
+            _PALETTE_ANCHORS[:, channel],
+        )
+        for channel in range(3)
+    ],
+    axis=1,
+).astype(np.uint8)
+
+
+def decode_frame(payload: bytes | bytearray | memoryview) -> np.ndarray | None:
+    """Decode a raw thermal frame into a height x width array of centi-degrees.
+
+    The returned array is a read-only view on the payload, no pixel data is
+    copied. Returns None for truncated or malformed frames.
+    """
+    view = memoryview(payload)
+    if view.nbytes < FRAME_HEADER.size:
+        return None
+    width, height = FRAME_HEADER.unpack_from(view)
+    count = width * height
+    if not count or view.nbytes != FRAME_HEADER.size + count * PIXEL_DTYPE.itemsize:
+        return None
+    pixels = np.frombuffer(view, dtype=PIXEL_DTYPE, count=count, offset=FRAME_HEADER.size)
+    return pixels.reshape(height, width)
+
+
+def render_png(frame: np.ndarray, scale: int = RENDER_SCALE) -> bytes:
+    """Render a decoded frame as a colour-mapped PNG image."""
+    low = int(frame.min())
+    span = max(int(frame.max()) - low, 1)
+    levels = ((frame.astype(np.int32) - low) * 255 // span).astype(np.uint8)
+    rgb = PALETTE[levels]
+    if scale > 1:
+        rgb = rgb.repeat(scale, axis=0).repeat(scale, axis=1)
+
+    height, width, _ = rgb.shape
+    # each scanline starts with filter type 0
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+def render_frame_png(payload: bytes) -> bytes | None:
+    """Decode and render a raw thermal frame."""
+    if (frame := decode_frame(payload)) is None:
+        return None
+    return render_png(frame)
+
+
+def frame_changed(previous: bytes, current: bytes, threshold: int) -> bool:
+    """Return whether any pixel moved by more than threshold centi-degrees.
+
+    Frames that cannot be compared, like malformed frames or frames of
+    another size, always count as changed.
+    """
+    before = decode_frame(previous)
+    after = decode_frame(current)
+    if before is None or after is None or before.shape != after.shape:
+        return True
+    difference = np.abs(after.astype(np.int32) - before)
+    return bool(difference.max() > threshold)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    """Build a PNG chunk."""
+    return b"".join(
+        (
+            struct.pack(">I", len(data)),
+            kind,
+            data,
+            struct.pack(">I", zlib.crc32(kind + data)),
+        )
+    )
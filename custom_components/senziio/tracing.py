@@ -0,0 +1,107 @@
+"""Startup timeline of the Senziio integration in Chrome trace format."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .entity import DOMAIN
+
+# spans kept, later ones are counted as dropped
+MAX_SPANS = 20_000
+TRACE_FILE = f"{DOMAIN}_trace.json"
+
+_ALL_DEVICES = object()
+
+
+class StartupTracer:
+    """Record timed spans of setup phases.
+
+    Spans are stored as tuples relative to the creation of the tracer and
+    only converted to trace events when exported. Each device gets its own
+    lane, so setups running concurrently show up side by side.
+    """
+
+    def __init__(self) -> None:
+        """Initialize tracer."""
+        self._origin = time.perf_counter()
+        self.spans: list[tuple[str, str | None, float, float, dict[str, Any]]] = []
+        self.dropped = 0
+
+    @contextmanager
+    def span(
+        self, name: str, device_id: str | None = None, **args: Any
+    ) -> Iterator[None]:
+        """Time the enclosed block, which may await."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, device_id, start, time.perf_counter(), args)
+
+    def record(
+        self,
+        name: str,
+        device_id: str | None,
+        start: float,
+        end: float,
+        args: dict[str, Any],
+    ) -> None:
+        """Record a span from perf_counter times."""
+        if len(self.spans) >= MAX_SPANS:
+            self.dropped += 1
+            return
+        self.spans.append((name, device_id, start - self._origin, end - start, args))
+
+    def chrome_trace(self, device_id: Any = _ALL_DEVICES) -> dict[str, Any]:
+        """Return spans as a Chrome trace, optionally of a single device."""
+        lanes: dict[str | None, int] = {}
+        events = []
+        for name, span_device, start, duration, args in self.spans:
+            if device_id is not _ALL_DEVICES and span_device != device_id:
+                continue
+            if span_device is not None:
+                args = {"device_id": span_device, **args}
+            events.append(
+                {
+                    "name": name,
+                    "cat": DOMAIN,
+                    "ph": "X",
+                    "ts": round(start * 1_000_000, 1),
+                    "dur": round(duration * 1_000_000, 1),
+                    "pid": 1,
+                    "tid": lanes.setdefault(span_device, len(lanes)),
+                    "args": args,
+                }
+            )
+
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": DOMAIN}},
+            *(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": lane or "integration"},
+                }
+                for lane, tid in lanes.items()
+            ),
+        ]
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_spans": self.dropped},
+        }
+
+
+@callback
+@singleton(f"{DOMAIN}_tracer")
+def async_get_tracer(hass: HomeAssistant) -> StartupTracer:
+    """Return the integration startup tracer."""
+    return StartupTracer()
@@ -0,0 +1,145 @@
+"""Radar target tracking across frames."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+# movement in metres since the last reported position that is worth a write
+POSITION_THRESHOLD = 0.3
+# largest distance in metres between a prediction and a matched target
+MATCH_DISTANCE = 1.0
+
+
+@dataclass(slots=True)
+class RadarTrack:
+    """A target followed across radar frames."""
+
+    track_id: int
+    x: float
+    y: float
+    vx: float = 0.0
+    vy: float = 0.0
+    reported_x: float = 0.0
+    reported_y: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return track as state attribute data."""
+        return {
+            "id": self.track_id,
+            "x": round(self.x, 2),
+            "y": round(self.y, 2),
+            "vx": round(self.vx, 2),
+            "vy": round(self.vy, 2),
+        }
+
+
+class RadarTracker:
+    """Match radar targets of each frame against the tracks of the last one.
+
+    Targets carrying an ``id`` are matched directly. Others are matched
+    greedily to the nearest predicted track position. The tracker tells
+    whether a frame changed the target set meaningfully, so entities only
+    write state when targets appear, leave or move noticeably.
+    """
+
+    def __init__(self) -> None:
+        """Initialize tracker."""
+        self.tracks: dict[int, RadarTrack] = {}
+        self._last_timestamp: float | None = None
+        self._next_id = 1
+
+    def update(self, targets: list, timestamp: float) -> bool:
+        """Apply a frame of targets, return whether the change is meaningful."""
+        elapsed = 0.0
+        if self._last_timestamp is not None:
+            elapsed = max(timestamp - self._last_timestamp, 0.0)
+        self._last_timestamp = timestamp
+
+        detections = [target for target in map(_parse_target, targets) if target]
+        unmatched = dict(self.tracks)
+        matched: dict[int, RadarTrack] = {}
+        pending = []
+
+        for detection in detections:
+            track_id = detection.get("id")
+            if track_id is not None and (track := unmatched.pop(track_id, None)):
+                matched[track_id] = self._move(track, detection)
+            elif track_id is not None and track_id not in matched:
+                matched[track_id] = self._new_track(detection, track_id)
+            else:
+                pending.append(detection)
+
+        # greedy nearest-neighbour matching of targets without id
+        for detection in pending:
+            best = None
+            best_distance = MATCH_DISTANCE
+            for track in unmatched.values():
+                distance = math.hypot(
+                    track.x + track.vx * elapsed - detection["x"],
+                    track.y + track.vy * elapsed - detection["y"],
+                )
+                if distance <= best_distance:
+                    best, best_distance = track, distance
+            if best is not None:
+                del unmatched[best.track_id]
+                matched[best.track_id] = self._move(best, detection)
+            else:
+                track = self._new_track(detection)
+                matched[track.track_id] = track
+
+        changed = bool(unmatched) or matched.keys() != self.tracks.keys()
+        for track in matched.values():
+            if (
+                math.hypot(track.x - track.reported_x, track.y - track.reported_y)
+                >= POSITION_THRESHOLD
+            ):
+                changed = True
+
+        self.tracks = matched
+        if changed:
+            for track in matched.values():
+                track.reported_x, track.reported_y = track.x, track.y
+        return changed
+
+    def as_attributes(self) -> list[dict[str, Any]]:
+        """Return tracks as state attribute data."""
+        return [track.as_dict() for track in self.tracks.values()]
+
+    def _new_track(self, detection: dict, track_id: int | None = None) -> RadarTrack:
+        """Start tracking a new target."""
+        if track_id is None:
+            while self._next_id in self.tracks:
+                self._next_id += 1
+            track_id = self._next_id
+            self._next_id += 1
+        x, y = detection["x"], detection["y"]
+        return RadarTrack(
+            track_id, x, y, detection["vx"], detection["vy"], reported_x=x, reported_y=y
+        )
+
+    @staticmethod
+    def _move(track: RadarTrack, detection: dict) -> RadarTrack:
+        """Update a track with its matched detection."""
+        track.x, track.y = detection["x"], detection["y"]
+        track.vx, track.vy = detection["vx"], detection["vy"]
+        return track
+
+
+def _parse_target(target: Any) -> dict | None:
+    """Validate a target of a radar payload."""
+    if not isinstance(target, dict):
+        return None
+    try:
+        parsed = {
+            "x": float(target["x"]),
+            "y": float(target["y"]),
+            "vx": float(target.get("vx", 0.0)),
+            "vy": float(target.get("vy", 0.0)),
+        }
+    except (KeyError, TypeError, ValueError):
+        return None
+    if isinstance(track_id := target.get("id"), int):
+        parsed["id"] = track_id
+    return parsed
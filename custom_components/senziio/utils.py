@@ -1,10 +1,16 @@
 """Package utilities."""
 
+from typing import Any
+
 from aiohttp import web
 
 from homeassistant.components.frontend import add_extra_js_url
 from homeassistant.components.lovelace.resources import ResourceStorageCollection
 from homeassistant.core import HomeAssistant
+from homeassistant.util.json import json_loads
+
+_SCALARS = {"true": True, "false": False, "null": None}
+_MISSING = object()
 
 
 def register_static_path(app: web.Application, url_path: str, path):
@@ -46,3 +52,40 @@ async def init_resource(hass: HomeAssistant, url: str, ver: str) -> bool:
         add_extra_js_url(hass, url2)
 
     return True
+
+
+def decode_value(payload: str | bytes, value_key: str) -> Any:
+    """Decode a metric value from a single-value topic payload."""
+    return decode_sample(payload, value_key)[0]
+
+
+def decode_sample(
+    payload: str | bytes, value_key: str
+) -> tuple[Any, int | None, float | None]:
+    """Decode value, sequence number and timestamp from a single-value payload.
+
+    Bare scalars like ``21.4`` or ``true`` are parsed without JSON decoding and
+    carry no sequence information. Legacy firmware sends a JSON object holding
+    the value under value_key, optionally with ``seq`` and ``ts`` fields.
+    """
+    if isinstance(payload, bytes):
+        payload = payload.decode()
+    text = payload.strip()
+
+    if (value := _SCALARS.get(text, _MISSING)) is not _MISSING:
+        return value, None, None
+
+    if text[:1] == "{":
+        data = json_loads(text)
+        if not isinstance(data, dict):
+            return None, None, None
+        return data.get(value_key), data.get("seq"), data.get("ts")
+
+    try:
+        return int(text), None, None
+    except ValueError:
+        pass
+    try:
+        return float(text), None, None
+    except ValueError:
+        return json_loads(text), None, None
@@ -0,0 +1,31 @@
+"""Test Senziio windowed aggregation."""
+
+from custom_components.senziio.aggregation import WindowAggregator
+
+
+def test_window_aggregator():
+    """Test mean, min and max over a sliding window."""
+    aggregator = WindowAggregator(window=60)
+    assert aggregator.mean is None
+
+    for timestamp, value in ((0, 500), (20, 700), (40, 600), (50, 400)):
+        aggregator.add(timestamp, value)
+
+    assert (aggregator.mean, aggregator.min, aggregator.max) == (550, 400, 700)
+
+    # first two samples leave the window
+    aggregator.expire(90)
+    assert (aggregator.mean, aggregator.min, aggregator.max) == (500, 400, 600)
+
+    aggregator.expire(200)
+    assert len(aggregator) == 0
+    assert aggregator.max is None
+
+
+def test_window_aggregator_ignores_non_numeric_values():
+    """Test non-numeric samples are skipped."""
+    aggregator = WindowAggregator(window=60)
+    for value in (True, "idle", None, 21.5):
+        aggregator.add(0, value)
+
+    assert len(aggregator) == 1
@@ -0,0 +1,79 @@
+"""Test Senziio thermal frame analytics."""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.senziio.analytics import (
+    HOTSPOT_TEMPERATURE,
+    ThermalAnalysis,
+    ThermalAnalyzer,
+    count_blobs,
+)
+from custom_components.senziio.sensor import SenziioPeopleCountSensorEntity
+from custom_components.senziio.senziio import Senziio
+from custom_components.senziio.thermal import THERMAL_FRAME_TOPIC
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, CONFIG_ENTRY
+
+
+def test_count_blobs():
+    """Test counting connected components."""
+    mask = np.array(
+        [
+            [1, 1, 0, 0, 1],
+            [0, 1, 0, 0, 1],
+            [0, 0, 0, 0, 0],
+            [1, 0, 1, 1, 1],
+            [1, 0, 0, 0, 1],
+        ],
+        dtype=bool,
+    )
+    assert count_blobs(mask) == 4
+    assert count_blobs(mask, min_size=3) == 2
+    assert count_blobs(np.zeros((3, 3), dtype=bool)) == 0
+
+
+def test_analyzer_counts_people_and_hotspots():
+    """Test people are counted against the learned background."""
+    analyzer = ThermalAnalyzer()
+    background = np.full((8, 8), 2200, dtype=np.int16)
+    assert analyzer.analyze(background).people_count == 0
+
+    frame = background.copy()
+    frame[1:3, 1:3] = 3300
+    frame[5:7, 4:6] = 3400
+    analysis = analyzer.analyze(frame)
+    assert analysis.people_count == 2
+    assert analysis.hotspot is None
+
+    frame[0, 7] = HOTSPOT_TEMPERATURE + 100
+    assert analyzer.analyze(frame).hotspot == (0, 7, HOTSPOT_TEMPERATURE + 100)
+
+
+async def test_people_count_ignores_results_after_removal(hass: HomeAssistant):
+    """Test frames are received directly and late results are dropped."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    entity = SenziioPeopleCountSensorEntity(CONFIG_ENTRY, device)
+    entity.hass = hass
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(entity.native_value)
+
+    topics = []
+
+    async def subscribe(hass, topic, handler, qos, encoding):
+        topics.append(topic)
+        return lambda: None
+
+    with patch("custom_components.senziio.sensor.async_subscribe", subscribe):
+        await entity.async_added_to_hass()
+    assert topics == [device.entity_topic(THERMAL_FRAME_TOPIC)]
+
+    entity._async_handle_analysis(ThermalAnalysis(2, None))
+    assert writes == [2]
+
+    entity._call_on_remove_callbacks()
+    entity._async_handle_analysis(ThermalAnalysis(3, None))
+    assert writes == [2]
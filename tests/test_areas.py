@@ -0,0 +1,121 @@
+"""Test Senziio area aggregates."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.senziio.areas import AreaAggregate, SenziioAreaIndex
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.senziio import Senziio
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, ENTRY_DATA
+
+
+def test_area_mean_and_max():
+    """Test running mean and maximum follow device updates."""
+    aggregate = AreaAggregate()
+    assert aggregate.mean is None
+    assert aggregate.max is None
+
+    aggregate.set("a", 800)
+    aggregate.set("b", 1200)
+    aggregate.set("c", 1000)
+    assert aggregate.mean == 1000
+    assert aggregate.max == 1200
+
+    # the device holding the maximum decreases
+    aggregate.set("b", 600)
+    assert aggregate.mean == 800
+    assert aggregate.max == 1000
+
+    aggregate.remove("c")
+    assert aggregate.mean == 700
+    assert aggregate.max == 800
+
+    aggregate.remove("a")
+    aggregate.remove("b")
+    assert aggregate.mean is None
+    assert aggregate.max is None
+    assert aggregate.total == 0
+
+
+def test_area_max_skips_outdated_values():
+    """Test the maximum follows many updates while the heap stays bounded."""
+    aggregate = AreaAggregate()
+    for value in range(1000):
+        aggregate.set("a", value)
+        aggregate.set("b", 500)
+    assert aggregate.max == 999
+
+    aggregate.set("a", 10)
+    assert aggregate.max == 500
+    aggregate.remove("b")
+    assert aggregate.max == 10
+    assert len(aggregate._heap) <= 2 * len(aggregate.values) + 8
+
+
+def test_area_any_and_all():
+    """Test occupancy of any or all devices of an area."""
+    aggregate = AreaAggregate()
+    aggregate.members = 2
+    assert not aggregate.any
+    assert not aggregate.all
+
+    aggregate.set("a", 1.0)
+    assert aggregate.any
+    assert not aggregate.all
+
+    aggregate.set("b", 1.0)
+    aggregate.set("b", 1.0)
+    assert aggregate.all
+
+    aggregate.set("a", 0.0)
+    assert aggregate.any
+    assert not aggregate.all
+
+    aggregate.remove("b")
+    assert not aggregate.any
+
+
+async def test_area_kept_until_deleted(hass: HomeAssistant):
+    """Test an area without devices is only dropped once it is deleted."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    area = ar.async_get(hass).async_create("Office")
+    dev_reg = dr.async_get(hass)
+    dev_entry = dev_reg.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, ENTRY_DATA["serial-number"])},
+    )
+    dev_reg.async_update_device(dev_entry.id, area_id=area.id)
+
+    index = SenziioAreaIndex(hass)
+    hass.bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, index.async_area_updated)
+    created = []
+    index.async_register_platform(created.append)
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    remove_device = index.async_add_device(entry, device)
+    assert created == [area.id]
+
+    removed = []
+    index.async_listen_removal(area.id, lambda: removed.append(area.id))
+    device.dispatch_sample("co2", 0, 900)
+    assert index.aggregate(area.id, "co2").max == 900
+
+    # unloading the last device only empties the area
+    remove_device()
+    assert removed == []
+    assert area.id in index.area_ids
+    assert index.aggregate(area.id, "co2").max is None
+    assert index.aggregate(area.id, "occupancy").members == 0
+
+    # entities are not created again when the device comes back
+    index.async_add_device(entry, device)
+    assert created == [area.id]
+    assert index.aggregate(area.id, "occupancy").members == 1
+
+    ar.async_get(hass).async_delete(area.id)
+    await hass.async_block_till_done()
+
+    assert removed == [area.id]
+    assert area.id not in index.area_ids
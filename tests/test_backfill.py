@@ -0,0 +1,160 @@
+"""Test backfill of Senziio readings into statistics."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.components.recorder import Recorder, get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    statistics_during_period,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.senziio.backfill import (
+    HISTORY_GRACE,
+    HOUR,
+    SenziioBackfill,
+    async_backfill_statistics,
+)
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.senziio import Senziio
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, CONFIG_ENTRY
+
+ENTITY_ID = "sensor.theia_pro_temperature"
+TEN_O_CLOCK = datetime(2024, 1, 1, 10, tzinfo=timezone.utc).timestamp()
+
+
+def _register_sensor(hass: HomeAssistant) -> None:
+    """Register the temperature sensor of the test device."""
+    er.async_get(hass).async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"{A_DEVICE_ID}_temperature",
+        suggested_object_id="theia_pro_temperature",
+    )
+    hass.states.async_set(ENTITY_ID, "21", {"unit_of_measurement": "°C"})
+
+
+async def _hourly_rows(hass: HomeAssistant) -> dict[float, dict]:
+    """Return hourly statistics of the sensor by start timestamp."""
+    statistics = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        datetime.fromtimestamp(TEN_O_CLOCK, timezone.utc),
+        None,
+        {ENTITY_ID},
+        "hour",
+        None,
+        {"mean", "min", "max"},
+    )
+    return {row["start"]: row for row in statistics[ENTITY_ID]}
+
+
+async def test_backfill_merges_partly_covered_hours(
+    recorder_mock: Recorder, hass: HomeAssistant
+):
+    """Test compiled hours are only replaced when the gap covers them."""
+    _register_sensor(hass)
+    metadata = StatisticMetaData(
+        has_mean=True,
+        has_sum=False,
+        name=None,
+        source="recorder",
+        statistic_id=ENTITY_ID,
+        unit_of_measurement="°C",
+    )
+    async_import_statistics(
+        hass,
+        metadata,
+        [
+            StatisticData(
+                start=datetime.fromtimestamp(hour, timezone.utc),
+                mean=20.0,
+                min=19.0,
+                max=21.0,
+            )
+            for hour in (TEN_O_CLOCK, TEN_O_CLOCK + HOUR)
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    # offline from 10:45 to 12:15
+    samples = [
+        [timestamp, 30.0 if timestamp < TEN_O_CLOCK + HOUR else 25.0]
+        for timestamp in range(int(TEN_O_CLOCK + 2700), int(TEN_O_CLOCK + 8100) + 1, 60)
+    ]
+    imported = await async_backfill_statistics(
+        hass, A_DEVICE_ID, "temperature", samples, "°C"
+    )
+    await async_wait_recording_done(hass)
+
+    assert imported == 3
+    rows = await _hourly_rows(hass)
+    # a quarter of the hour came from the gap
+    assert rows[TEN_O_CLOCK]["mean"] == 22.5
+    assert rows[TEN_O_CLOCK]["min"] == 19.0
+    assert rows[TEN_O_CLOCK]["max"] == 30.0
+    # fully covered, the compiled row is replaced
+    assert rows[TEN_O_CLOCK + HOUR]["mean"] == 25.0
+    assert rows[TEN_O_CLOCK + HOUR]["min"] == 25.0
+    # nothing compiled to merge with
+    assert rows[TEN_O_CLOCK + 2 * HOUR]["mean"] == 25.0
+
+
+async def test_backfill_needs_native_unit(recorder_mock: Recorder, hass: HomeAssistant):
+    """Test nothing is imported without a unit or in a converted unit."""
+    _register_sensor(hass)
+    samples = [[TEN_O_CLOCK, 20.0]]
+
+    assert await async_backfill_statistics(
+        hass, A_DEVICE_ID, "temperature", samples, None
+    ) == 0
+    assert await async_backfill_statistics(
+        hass, A_DEVICE_ID, "temperature", samples, "°F"
+    ) == 0
+
+
+async def test_gap_is_filled_from_a_single_source(hass: HomeAssistant):
+    """Test history is only pulled for metrics without buffered readings."""
+    CONFIG_ENTRY.add_to_hass(hass)
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None, http=object())
+    backfill = SenziioBackfill(
+        hass, CONFIG_ENTRY, device, {"co2": "ppm", "temperature": "°C"}
+    )
+    since, until = TEN_O_CLOCK, TEN_O_CLOCK + 4 * HOUR
+
+    with (
+        patch(
+            "custom_components.senziio.backfill.async_backfill_statistics",
+            AsyncMock(return_value=1),
+        ) as buffered,
+        patch(
+            "custom_components.senziio.backfill.async_backfill_history",
+            AsyncMock(return_value=1),
+        ) as pulled,
+    ):
+        backfill.async_handle_returned(since, until)
+        backfill.async_handle_buffered(
+            "co2", [[since + 60, 800], [until - 60, 900]]
+        )
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=HISTORY_GRACE + 1)
+        )
+        await hass.async_block_till_done()
+
+        assert buffered.call_count == 1
+        assert [call.args[2] for call in pulled.call_args_list] == ["temperature"]
+        assert pulled.call_args.args[4:] == (since, until)
+
+        # buffered readings arriving late for a pulled gap are ignored
+        backfill.async_handle_buffered("temperature", [[since + 60, 21.0]])
+        await hass.async_block_till_done()
+        assert buffered.call_count == 1
@@ -0,0 +1,79 @@
+"""Test Senziio fleet-wide beacon tracking."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.senziio.beacons import BEACON_TIMEOUT, BeaconTable
+from custom_components.senziio.metrics import DROPS
+from custom_components.senziio.sensor import SenziioBeaconsSensorEntity
+from custom_components.senziio.senziio import Senziio
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, CONFIG_ENTRY
+
+
+def test_beacon_moves_to_nearest_device():
+    """Test beacons resolve to the device hearing them strongest."""
+    moves = []
+    notified = []
+    table = BeaconTable(lambda *move: moves.append(move))
+    table.async_listen("kitchen", lambda: notified.append("kitchen"))
+    table.async_listen("office", lambda: notified.append("office"))
+
+    table.async_update("kitchen", "tag-1", -60, now=0)
+    table.async_update("office", "tag-1", -75, now=0)
+    # repeated advertisements without a room change notify nobody
+    table.async_update("kitchen", "tag-1", -61, now=1)
+
+    assert table.room("tag-1") == "kitchen"
+    assert moves == [("tag-1", None, "kitchen")]
+    assert notified == ["kitchen"]
+
+    # smoothed signal must beat the current room by the hysteresis margin
+    for second in range(2, 12):
+        table.async_update("office", "tag-1", -50, now=second)
+        table.async_update("kitchen", "tag-1", -80, now=second)
+
+    assert table.room("tag-1") == "office"
+    assert table.beacons("office") == {"tag-1"}
+    assert table.beacons("kitchen") == set()
+    assert moves[-1] == ("tag-1", "kitchen", "office")
+
+
+def test_stale_beacons_expire():
+    """Test beacons leave when no device hears them anymore."""
+    moves = []
+    table = BeaconTable(lambda *move: moves.append(move))
+
+    table.async_update("kitchen", "tag-1", -60, now=0)
+    table.async_expire(now=BEACON_TIMEOUT + 1)
+
+    assert table.room("tag-1") is None
+    assert moves[-1] == ("tag-1", "kitchen", None)
+
+
+async def test_legacy_beacon_payloads_are_not_drops(hass: HomeAssistant):
+    """Test payloads without a beacon table are not counted as drops."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    entity = SenziioBeaconsSensorEntity(CONFIG_ENTRY, device)
+    entity.hass = hass
+    entity.async_write_ha_state = lambda: None
+
+    handlers = []
+
+    async def subscribe(hass, topic, handler, qos):
+        handlers.append(handler)
+        return lambda: None
+
+    with patch("custom_components.senziio.sensor.async_subscribe", subscribe):
+        await entity.async_added_to_hass()
+    message_received = handlers[0]
+
+    for payload in ("true", "false", '{"beacon": true}'):
+        message_received(SimpleNamespace(payload=payload))
+    counters = device.metrics.topic("beacons").counters
+    assert counters[DROPS] == 0
+
+    message_received(SimpleNamespace(payload='{"beacons": "bad"}'))
+    assert counters[DROPS] == 1
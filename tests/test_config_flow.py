@@ -1,11 +1,18 @@
 """Test the Senziio config flow."""
 
+from dataclasses import replace
 from unittest.mock import patch
 
 import pytest
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_FRIENDLY_NAME, CONF_MODEL, CONF_UNIQUE_ID
+from homeassistant.const import (
+    CONF_FRIENDLY_NAME,
+    CONF_HOST,
+    CONF_MODEL,
+    CONF_PORT,
+    CONF_UNIQUE_ID,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
@@ -29,6 +36,17 @@ from . import (
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 
+async def _open_manual_flow(hass: HomeAssistant):
+    """Open the user flow and choose manual device entry."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.MENU
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "manual"}
+    )
+
+
 @pytest.mark.skip
 async def test_user_flow_success(hass: HomeAssistant):
     """Test a successful configuration via user initiated config flow."""
@@ -43,13 +61,11 @@ async def test_user_flow_success(hass: HomeAssistant):
         ),
     ):
         # open user flow
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN, context={"source": config_entries.SOURCE_USER}
-        )
+        result = await _open_manual_flow(hass)
 
         # check initialized form
         assert result["type"] == FlowResultType.FORM
-        assert result["step_id"] == "user"
+        assert result["step_id"] == "manual"
 
         # enter form data
         result2 = await hass.config_entries.flow.async_configure(
@@ -96,9 +112,7 @@ async def test_user_flow_form_error_handling(
         "custom_components.senziio.config_flow.validate_input",
         side_effect=error,
     ):
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN, context={"source": config_entries.SOURCE_USER}
-        )
+        result = await _open_manual_flow(hass)
         result2 = await hass.config_entries.flow.async_configure(
             result["flow_id"],
             {
@@ -119,13 +133,11 @@ async def test_user_flow_cannot_connect(hass: HomeAssistant):
         return_value=FakeSenziioDevice({}),
     ):
         # open user flow
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN, context={"source": config_entries.SOURCE_USER}
-        )
+        result = await _open_manual_flow(hass)
 
         # check initialized form
         assert result["type"] == FlowResultType.FORM
-        assert result["step_id"] == "user"
+        assert result["step_id"] == "manual"
 
         # enter form data
         result2 = await hass.config_entries.flow.async_configure(
@@ -156,9 +168,7 @@ async def test_user_flow_aborted_if_device_id_already_configured(hass: HomeAssis
         entry.add_to_hass(hass)
 
         # open user flow
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN, context={"source": config_entries.SOURCE_USER}
-        )
+        result = await _open_manual_flow(hass)
 
         # enter form data with already used friendly name
         result2 = await hass.config_entries.flow.async_configure(
@@ -188,9 +198,7 @@ async def test_user_flow_repeated_friendly_name(hass: HomeAssistant):
         entry.add_to_hass(hass)
 
         # open user flow
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN, context={"source": config_entries.SOURCE_USER}
-        )
+        result = await _open_manual_flow(hass)
 
         # enter form data for different device with already used friendly name
         result2 = await hass.config_entries.flow.async_configure(
@@ -221,9 +229,7 @@ async def test_user_flow_friendly_name_generation(hass: HomeAssistant):
         entry.add_to_hass(hass)
 
         # open user flow
-        result = await hass.config_entries.flow.async_init(
-            DOMAIN, context={"source": config_entries.SOURCE_USER}
-        )
+        result = await _open_manual_flow(hass)
 
         proposed_friendly_name = next(
             field.default()
@@ -271,6 +277,7 @@ async def test_zeroconf_flow_success(hass: HomeAssistant):
         CONF_UNIQUE_ID: A_DEVICE_ID,
         CONF_MODEL: A_DEVICE_MODEL,
         CONF_FRIENDLY_NAME: A_FRIENDLY_NAME,
+        CONF_HOST: "1.1.1.1",
         "fw-version": "1.2.3",
         "hw-version": "1.0.0",
         "mac-address": "1A:2B:3C:4D:5E:6F",
@@ -396,3 +403,123 @@ async def test_zeroconf_flow_repeated_friendly_name(hass: HomeAssistant):
 
         assert result2["type"] == FlowResultType.FORM
         assert result2["errors"] == {"base": "repeated_title"}
+
+
+async def test_discover_all_flow(hass: HomeAssistant, enable_custom_integrations):
+    """Test adopting devices found by a discovery sweep."""
+    MockConfigEntry(domain=DOMAIN, unique_id=A_DEVICE_ID).add_to_hass(hass)
+    discovered = {
+        A_DEVICE_ID: DEVICE_INFO,
+        ANOTHER_DEVICE_ID: {**DEVICE_INFO, "serial-number": ANOTHER_DEVICE_ID},
+        # no model to create the entry with
+        "theia-pro-000000000000": {"fw-version": "1.0"},
+    }
+
+    with (
+        patch(
+            "custom_components.senziio.config_flow.Senziio.discover",
+            return_value=discovered,
+        ),
+        patch(
+            "custom_components.senziio.async_setup_entry",
+            return_value=True,
+        ),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"next_step_id": "discover_all"}
+        )
+
+        # only unconfigured devices are offered
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "discover_all"
+        assert result["description_placeholders"] == {"count": "1"}
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {"devices": [ANOTHER_DEVICE_ID]}
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "discover_all_confirm"
+        assert hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, ANOTHER_DEVICE_ID
+        ) is None
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "devices_added"
+    entry = hass.config_entries.async_entry_for_domain_unique_id(
+        DOMAIN, ANOTHER_DEVICE_ID
+    )
+    assert entry.title == f"{MANUFACTURER} {A_DEVICE_MODEL} 2"
+    assert entry.data["serial-number"] == ANOTHER_DEVICE_ID
+
+
+async def test_zeroconf_flow_advertised_info(
+    hass: HomeAssistant, enable_custom_integrations
+):
+    """Test entries are created from TXT properties without a round trip."""
+    discovery_info = replace(
+        ZEROCONF_DISCOVERY_INFO,
+        properties={
+            **ZEROCONF_DISCOVERY_INFO.properties,
+            "fw": "1.2.3",
+            "hw": "1.0.0",
+            "mac": "1A:2B:3C:4D:5E:6F",
+        },
+    )
+
+    with (
+        patch("custom_components.senziio.config_flow.Senziio") as senziio_mock,
+        patch("custom_components.senziio.async_setup_entry", return_value=True),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_ZEROCONF},
+            data=discovery_info,
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_FRIENDLY_NAME: A_FRIENDLY_NAME}
+        )
+
+    senziio_mock.assert_not_called()
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {
+        CONF_UNIQUE_ID: A_DEVICE_ID,
+        CONF_MODEL: A_DEVICE_MODEL,
+        CONF_FRIENDLY_NAME: A_FRIENDLY_NAME,
+        CONF_HOST: "1.1.1.1",
+        CONF_PORT: 0,
+        "fw-version": "1.2.3",
+        "hw-version": "1.0.0",
+        "mac-address": "1A:2B:3C:4D:5E:6F",
+        "serial-number": A_DEVICE_ID,
+        "pending-verification": True,
+    }
+
+
+async def test_zeroconf_announcements_throttled(
+    hass: HomeAssistant, enable_custom_integrations
+):
+    """Test repeated announcements of configured devices are skipped early."""
+    MockConfigEntry(domain=DOMAIN, unique_id=A_DEVICE_ID).add_to_hass(hass)
+
+    with patch.object(
+        config_entries.ConfigFlow, "async_set_unique_id", autospec=True,
+        side_effect=config_entries.ConfigFlow.async_set_unique_id,
+    ) as set_unique_id_mock:
+        for _ in range(3):
+            result = await hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": config_entries.SOURCE_ZEROCONF},
+                data=ZEROCONF_DISCOVERY_INFO,
+            )
+            assert result["type"] == FlowResultType.ABORT
+            assert result["reason"] == "already_configured"
+
+    assert set_unique_id_mock.call_count == 1
@@ -0,0 +1,98 @@
+"""Test Senziio fleet commands."""
+
+import json
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import area_registry as ar, device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.fleet import (
+    async_select_devices,
+    async_send_fleet_command,
+)
+from custom_components.senziio.senziio import Senziio, SenziioMQTT
+
+
+class RespondingMQTT(SenziioMQTT):
+    """MQTT interface answering command requests of devices."""
+
+    def __init__(self, behaviour: dict[str, str]) -> None:
+        """Initialize with the behaviour of each device ID."""
+        self.behaviour = behaviour
+        self.subscriptions = {}
+
+    async def publish(self, topic, payload):
+        """Answer a request as the device would."""
+        _, _, device_id, command, _ = topic.split("/")
+        behaviour = self.behaviour[device_id]
+        if behaviour == "fail":
+            raise HomeAssistantError("broker unavailable")
+        if behaviour == "answer":
+            request = json.loads(payload)
+            response = {"request_id": request["request_id"], "command": command}
+            self.subscriptions[topic[:-3] + "res"](
+                SimpleNamespace(topic=topic, payload=json.dumps(response))
+            )
+
+    async def subscribe(self, topic, callback):
+        """Record subscription callback."""
+        self.subscriptions[topic] = callback
+        return lambda: self.subscriptions.pop(topic, None)
+
+
+def add_device(
+    hass: HomeAssistant, device_id: str, model: str, mqtt: SenziioMQTT
+) -> dr.DeviceEntry:
+    """Add a loaded device with its config entry and registry entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, unique_id=device_id, data={"serial-number": device_id}
+    )
+    entry.add_to_hass(hass)
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = Senziio(
+        device_id, model, mqtt=mqtt
+    )
+    return dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, device_id)}
+    )
+
+
+async def test_select_devices(hass: HomeAssistant):
+    """Test devices are selected by area, model and device ID."""
+    mqtt = RespondingMQTT({})
+    kitchen = ar.async_get(hass).async_create("Kitchen")
+    dev_reg = dr.async_get(hass)
+    first = add_device(hass, "theia-1", "Theia Pro", mqtt)
+    second = add_device(hass, "theia-2", "Theia Pro", mqtt)
+    add_device(hass, "nyx-1", "Nyx", mqtt)
+    dev_reg.async_update_device(first.id, area_id=kitchen.id)
+    dev_reg.async_update_device(second.id, area_id=kitchen.id)
+
+    def selected(**targets):
+        return sorted(device.id for device in async_select_devices(hass, **targets))
+
+    assert selected(models=["theia  PRO"]) == ["theia-1", "theia-2"]
+    assert selected(area_ids=[kitchen.id]) == ["theia-1", "theia-2"]
+    assert selected(area_ids=[kitchen.id], device_ids=[second.id]) == ["theia-2"]
+    assert selected(models=["Nyx"], area_ids=[kitchen.id]) == []
+    assert selected() == ["nyx-1", "theia-1", "theia-2"]
+
+
+async def test_send_fleet_command(hass: HomeAssistant):
+    """Test responses, timeouts and failures are aggregated."""
+    mqtt = RespondingMQTT(
+        {"theia-1": "answer", "theia-2": "answer", "theia-3": "ignore", "theia-4": "fail"}
+    )
+    devices = [
+        Senziio(device_id, "Theia Pro", mqtt=mqtt) for device_id in mqtt.behaviour
+    ]
+
+    result = await async_send_fleet_command(devices, "led", {"state": "off"}, 0.01)
+
+    assert sorted(result["responses"]) == ["theia-1", "theia-2"]
+    assert result["responses"]["theia-1"]["command"] == "led"
+    assert result["timed_out"] == ["theia-3"]
+    assert result["failed"] == {"theia-4": "broker unavailable"}
+    assert mqtt.subscriptions == {}
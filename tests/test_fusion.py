@@ -0,0 +1,86 @@
+"""Test Senziio occupancy fusion."""
+
+from custom_components.senziio.fusion import (
+    CONF_FUSION_THRESHOLD,
+    OccupancyFusion,
+    hold_option,
+    weight_option,
+)
+
+
+def test_fusion_weights_and_threshold():
+    """Test occupancy follows the weighted score of active inputs."""
+    fusion = OccupancyFusion(
+        {"presence": 1.0, "beacon": 0.4, "radar": 0.4}, {}, threshold=0.8
+    )
+
+    fusion.update("beacon", True, 0.0)
+    assert not fusion.occupied
+    fusion.update("radar", True, 1.0)
+    assert fusion.occupied
+    assert fusion.score == 0.8
+
+    # repeated samples do not count twice
+    fusion.update("radar", True, 2.0)
+    assert fusion.score == 0.8
+
+    fusion.update("beacon", False, 3.0)
+    assert not fusion.occupied
+    fusion.update("radar", False, 4.0)
+    assert fusion.score == 0.0
+
+
+def test_fusion_score_does_not_drift():
+    """Test removing an input restores the exact score of the others."""
+    fusion = OccupancyFusion({"presence": 0.6, "radar": 0.3}, {}, threshold=0.6)
+
+    fusion.update("presence", True, 0.0)
+    fusion.update("radar", True, 1.0)
+    fusion.update("radar", False, 2.0)
+
+    assert fusion.score == 0.6
+    assert fusion.occupied
+
+
+def test_fusion_hold_time():
+    """Test inputs keep counting for their hold time after turning off."""
+    fusion = OccupancyFusion({"motion": 0.6}, {"motion": 60}, threshold=0.5)
+
+    fusion.update("motion", True, 0.0)
+    fusion.update("motion", False, 10.0)
+    assert fusion.occupied
+    assert fusion.next_expiry == 70.0
+
+    # later off samples do not extend the hold
+    fusion.update("motion", False, 30.0)
+    assert fusion.next_expiry == 70.0
+
+    fusion.expire(69.0)
+    assert fusion.occupied
+    fusion.expire(70.0)
+    assert not fusion.occupied
+    assert fusion.next_expiry is None
+
+    # turning on again cancels the hold
+    fusion.update("motion", True, 80.0)
+    fusion.update("motion", False, 90.0)
+    fusion.update("motion", True, 100.0)
+    assert fusion.next_expiry is None
+    assert fusion.occupied
+
+
+def test_fusion_options():
+    """Test options are applied to current inputs."""
+    fusion = OccupancyFusion.from_options({})
+    fusion.update("beacon", True, 0.0)
+    assert fusion.occupied
+
+    fusion.apply_options(
+        {weight_option("beacon"): 0.2, CONF_FUSION_THRESHOLD: 0.5}
+    )
+    assert fusion.score == 0.2
+    assert not fusion.occupied
+
+    fusion.apply_options({hold_option("beacon"): 5})
+    fusion.update("beacon", False, 1.0)
+    assert fusion.next_expiry == 6.0
@@ -0,0 +1,34 @@
+"""Test Senziio in-memory sample history."""
+
+import pytest
+
+from custom_components.senziio.history import SampleBuffer
+
+
+@pytest.mark.parametrize("delta_encoding", [False, True])
+def test_sample_buffer_keeps_latest_samples(delta_encoding: bool):
+    """Test buffer overwrites oldest samples once full."""
+    buffer = SampleBuffer(size=4, delta_encoding=delta_encoding)
+    for index in range(7):
+        buffer.append(1718000000 + index * 0.5, index)
+
+    assert len(buffer) == 4
+    assert buffer.samples() == (
+        [1718000001.5, 1718000002.0, 1718000002.5, 1718000003.0],
+        [3.0, 4.0, 5.0, 6.0],
+    )
+    assert buffer.samples(since=1718000002.5) == (
+        [1718000002.5, 1718000003.0],
+        [5.0, 6.0],
+    )
+
+
+def test_sample_buffer_delta_encoding_is_smaller():
+    """Test delta encoding reduces timestamp storage."""
+    plain = SampleBuffer(size=10)
+    encoded = SampleBuffer(size=10, delta_encoding=True)
+    for index in range(10):
+        plain.append(1718000000 + index, 1.0)
+        encoded.append(1718000000 + index, 1.0)
+
+    assert encoded.nbytes < plain.nbytes
@@ -0,0 +1,116 @@
+"""Test Senziio local HTTP transport."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.senziio import SenziioHAHTTP
+from custom_components.senziio.senziio import Senziio, SenziioHTTPError
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, DEVICE_INFO
+from .test_senziio import FakeMQTT
+
+DEVICE_URL = "http://127.0.0.1:8080"
+
+
+def _device(hass: HomeAssistant, mqtt: FakeMQTT, host: str = "127.0.0.1") -> Senziio:
+    """Return a device reachable over HTTP."""
+    return Senziio(
+        A_DEVICE_ID,
+        A_DEVICE_MODEL,
+        mqtt=mqtt,
+        http=SenziioHAHTTP(hass, host, 8080),
+    )
+
+
+async def test_get_info_over_http(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test device info is fetched from the device HTTP endpoint."""
+    aioclient_mock.get(f"{DEVICE_URL}/device-info", json=DEVICE_INFO)
+    mqtt = FakeMQTT()
+    device = _device(hass, mqtt)
+
+    assert await device.get_info() == DEVICE_INFO
+    assert await device.get_info() == DEVICE_INFO
+    assert [str(call[1]) for call in aioclient_mock.mock_calls] == [
+        f"{DEVICE_URL}/device-info",
+        f"{DEVICE_URL}/device-info",
+    ]
+    assert mqtt.published == []
+
+
+async def test_get_info_falls_back_to_mqtt(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test MQTT is used when the HTTP endpoint fails."""
+    aioclient_mock.get(f"{DEVICE_URL}/device-info", status=500)
+    mqtt = FakeMQTT()
+    device = _device(hass, mqtt)
+
+    async def respond(topic, payload):
+        mqtt.published.append((topic, payload))
+        await mqtt.subscriptions[device.topics["info_res"]](
+            SimpleNamespace(payload='{"model": "Theia Pro"}')
+        )
+
+    mqtt.publish = respond
+
+    assert await device.get_info() == {"model": "Theia Pro"}
+    assert aioclient_mock.call_count == 1
+    assert mqtt.published == [(device.topics["info_req"], "Device info request")]
+
+
+async def test_ipv6_address(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker):
+    """Test IPv6 hosts are bracketed in request URLs."""
+    aioclient_mock.get("http://[fe80::1]:8080/device-info", json=DEVICE_INFO)
+    device = _device(hass, FakeMQTT(), host="fe80::1")
+
+    assert await device.get_info() == DEVICE_INFO
+    assert str(aioclient_mock.mock_calls[0][1]) == "http://[fe80::1]:8080/device-info"
+
+
+async def test_address_from_entry_data(hass: HomeAssistant):
+    """Test HTTP is only used with a cached device address."""
+    assert SenziioHAHTTP.from_entry_data(hass, {}) is None
+    assert SenziioHAHTTP.from_entry_data(hass, {"host": "1.1.1.1"}) is not None
+
+
+async def test_stream_history(hass: HomeAssistant, aioclient_mock: AiohttpClientMocker):
+    """Test stored history is streamed from the device."""
+    aioclient_mock.get(
+        f"{DEVICE_URL}/history", text="[0, 20]\n[3600, 21]\n[7200, 22]\n"
+    )
+    device = _device(hass, FakeMQTT())
+
+    samples = [sample async for sample in device.iter_history("co2", 1.5)]
+    assert samples == [[0, 20], [3600, 21], [7200, 22]]
+    assert str(aioclient_mock.mock_calls[0][1]) == (
+        f"{DEVICE_URL}/history?key=co2&since=1"
+    )
+
+
+async def test_stream_history_error(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test failed transfers raise an HTTP error."""
+    aioclient_mock.get(f"{DEVICE_URL}/history", status=500)
+    device = _device(hass, FakeMQTT())
+
+    with pytest.raises(SenziioHTTPError):
+        [sample async for sample in device.iter_history("co2", 0)]
+
+
+async def test_stream_history_encodes_key(
+    hass: HomeAssistant, aioclient_mock: AiohttpClientMocker
+):
+    """Test metric keys are encoded in the history query."""
+    aioclient_mock.get(f"{DEVICE_URL}/history", text="")
+    device = _device(hass, FakeMQTT())
+
+    assert [sample async for sample in device.iter_history("co2&since=0", 5)] == []
+    url = aioclient_mock.mock_calls[0][1]
+    assert dict(url.query) == {"key": "co2&since=0", "since": "5"}
@@ -32,6 +32,7 @@ async def test_async_setup_entry(hass: HomeAssistant):
             "custom_components.senziio.Senziio",
             return_value=FakeSenziioDevice(DEVICE_INFO),
         ),
+        patch("custom_components.senziio.SenziioRTTProbe"),
         patch.object(
             hass.config_entries, "async_forward_entry_setups", return_value=AsyncMock()
         ) as forward_entry_mock,
@@ -76,6 +77,7 @@ async def test_async_unload_entry(hass: HomeAssistant):
             "custom_components.senziio.Senziio",
             return_value=FakeSenziioDevice(DEVICE_INFO),
         ),
+        patch("custom_components.senziio.SenziioRTTProbe"),
         patch.object(
             hass.config_entries, "async_forward_entry_setups", return_value=AsyncMock()
         ),
@@ -0,0 +1,82 @@
+"""Test Senziio runtime metrics."""
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.senziio.diagnostics import async_get_config_entry_diagnostics
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.metrics import (
+    DROPS,
+    MESSAGES,
+    SAMPLE_EVERY,
+    DeviceMetrics,
+    Histogram,
+)
+from custom_components.senziio.senziio import Senziio
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, ENTRY_DATA
+
+
+def test_histogram_quantiles():
+    """Test quantiles are reported as power of two bucket bounds."""
+    histogram = Histogram()
+    assert histogram.quantile(0.5) is None
+
+    for _ in range(90):
+        histogram.observe(0.000010)
+    for _ in range(10):
+        histogram.observe(0.003)
+
+    assert histogram.quantile(0.5) == 16 / 1_000_000
+    assert histogram.quantile(0.95) == 4096 / 1_000_000
+    assert histogram.as_dict()["buckets"] == {"<16us": 90, "<4096us": 10}
+
+
+def test_messages_are_sampled():
+    """Test every message is counted and one in SAMPLE_EVERY is timed."""
+    metrics = DeviceMetrics()
+    topic = metrics.topic("co2")
+
+    for _ in range(SAMPLE_EVERY * 4):
+        start = topic.start()
+        topic.decoded(start)
+        topic.handled(start)
+    metrics.topic("event").counters[DROPS] += 1
+
+    assert metrics.total(MESSAGES) == SAMPLE_EVERY * 4
+    assert metrics.total(DROPS) == 1
+    assert topic.handler.count == topic.decode.count == 4
+    assert metrics.handler_quantile(0.95) is not None
+    assert metrics.as_dict()["co2"]["estimated_handler_seconds"] >= 0
+
+
+def test_shared_topics_are_counted_once():
+    """Test messages handled by two entities only count once per device."""
+    metrics = DeviceMetrics()
+    radar = metrics.topic("radar")
+    targets = metrics.topic("radar-targets", shared=True)
+
+    for _ in range(3):
+        radar.start()
+        targets.start()
+    targets.counters[DROPS] += 1
+
+    assert targets.counters[MESSAGES] == 3
+    assert metrics.total(MESSAGES) == 3
+    assert metrics.total(DROPS) == 1
+
+
+async def test_diagnostics(hass: HomeAssistant):
+    """Test diagnostics include redacted entry data and device metrics."""
+    entry = MockConfigEntry(domain=DOMAIN, data={**ENTRY_DATA, "host": "1.1.1.1"})
+    entry.add_to_hass(hass)
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    device.metrics.topic("co2").start()
+    hass.data[DOMAIN] = {entry.entry_id: device}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["host"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["mac-address"] == "**REDACTED**"
+    assert diagnostics["metrics"]["co2"]["messages"] == 1
+    assert diagnostics["connection"]["timeout"] == device.rtt.timeout
@@ -0,0 +1,73 @@
+"""Test Senziio OpenMetrics exposition."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.metrics import DROPS, SAMPLE_EVERY
+from custom_components.senziio.openmetrics import (
+    CONTENT_TYPE,
+    SenziioMetricsExporter,
+    SenziioMetricsView,
+)
+from custom_components.senziio.senziio import Senziio
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL
+
+
+def add_device(hass: HomeAssistant) -> Senziio:
+    """Add a loaded device with some handled messages."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    topic = device.metrics.topic("co2")
+    for _ in range(SAMPLE_EVERY):
+        topic.handled(topic.start())
+    topic.counters[DROPS] += 2
+    device.availability.seen(1700000000.0)
+    hass.data[DOMAIN] = {"entry": device}
+    return device
+
+
+async def test_exposition(hass: HomeAssistant):
+    """Test device metrics are rendered grouped by family."""
+    device = add_device(hass)
+    exporter = SenziioMetricsExporter(hass)
+    exporter.async_render()
+    text = exporter.exposition()
+
+    labels = f'device="{A_DEVICE_ID}",topic="co2"'
+    assert "senziio_devices 1\n" in text
+    assert f"senziio_messages_total{{{labels}}} {SAMPLE_EVERY}\n" in text
+    assert f"senziio_dropped_messages_total{{{labels}}} 2\n" in text
+    assert f'senziio_handler_duration_seconds_bucket{{{labels},le="+Inf"}} 1\n' in text
+    assert f"senziio_decode_duration_seconds_count{{{labels}}} 0\n" in text
+    assert (
+        f'senziio_last_seen_timestamp_seconds{{device="{A_DEVICE_ID}"}} 1700000000.0\n'
+        in text
+    )
+    assert text.endswith("# EOF\n")
+
+    # unchanged devices keep their rendered block
+    device.metrics.topic("co2").counters[DROPS] += 1
+    exporter.async_render()
+    assert exporter.exposition() == text
+
+    hass.data[DOMAIN] = {}
+    exporter.async_render()
+    assert "senziio_devices 0\n" in exporter.exposition()
+
+
+async def test_metrics_view(hass: HomeAssistant, hass_client, hass_client_no_auth):
+    """Test metrics are only served to authenticated clients."""
+    await async_setup_component(hass, "http", {})
+    add_device(hass)
+    exporter = SenziioMetricsExporter(hass)
+    exporter.async_render()
+    hass.http.register_view(SenziioMetricsView(exporter))
+
+    response = await (await hass_client_no_auth()).get("/senziio/metrics")
+    assert response.status == 401
+
+    response = await (await hass_client()).get("/senziio/metrics")
+    assert response.status == 200
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    assert "senziio_messages_total" in await response.text()
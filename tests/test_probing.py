@@ -0,0 +1,55 @@
+"""Test Senziio round-trip time probes."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.senziio.probing import (
+    PING_INTERVAL,
+    PING_JITTER,
+    SenziioRTTProbe,
+    next_probe_delay,
+)
+from custom_components.senziio.senziio import Senziio
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, CONFIG_ENTRY
+
+
+def test_probe_delays_are_spread():
+    """Test probes are spread over the interval and jittered."""
+    first = [next_probe_delay(first=True) for _ in range(200)]
+    assert all(0 <= delay <= PING_INTERVAL for delay in first)
+    assert len(set(first)) == len(first)
+
+    later = [next_probe_delay() for _ in range(200)]
+    assert all(
+        PING_INTERVAL * (1 - PING_JITTER) <= delay <= PING_INTERVAL * (1 + PING_JITTER)
+        for delay in later
+    )
+    assert max(later) - min(later) > PING_INTERVAL * PING_JITTER
+
+
+async def test_stop_cancels_next_probe(hass: HomeAssistant):
+    """Test stopping a probe leaves no scheduled ping behind."""
+    CONFIG_ENTRY.add_to_hass(hass)
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    device.ping = AsyncMock(return_value=0.1)
+    probe = SenziioRTTProbe(hass, CONFIG_ENTRY, device)
+
+    probe.async_start()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PING_INTERVAL + 1)
+    )
+    await hass.async_block_till_done()
+    assert device.ping.await_count == 1
+
+    # the next probe is scheduled again until the probe stops
+    probe.async_stop()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=3 * PING_INTERVAL)
+    )
+    await hass.async_block_till_done()
+    assert device.ping.await_count == 1
@@ -0,0 +1,50 @@
+"""Test Senziio profiling."""
+
+import threading
+import time
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.senziio.metrics import DeviceMetrics
+from custom_components.senziio.profiling import StackSampler, async_profile
+
+
+def busy_wait(seconds: float) -> None:
+    """Keep the current thread busy."""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_stack_sampler():
+    """Test stacks of another thread are collected in collapsed form."""
+    sampler = StackSampler(threading.get_ident(), interval=0.001)
+    sampler.start()
+    busy_wait(0.1)
+    sampler.stop()
+
+    assert sampler.stacks
+    line = sampler.collapsed().splitlines()[0]
+    stack, count = line.rsplit(" ", 1)
+    assert "busy_wait (test_profiling.py:" in stack
+    assert int(count) > 0
+
+
+async def test_profile(hass: HomeAssistant, tmp_path: Path):
+    """Test capture files are written and integration functions summarized."""
+    hass.config.config_dir = str(tmp_path)
+    metrics = DeviceMetrics()
+
+    def handle_messages() -> None:
+        topic = metrics.topic("co2")
+        for _ in range(100):
+            topic.handled(topic.start())
+
+    hass.loop.call_later(0.01, handle_messages)
+    result = await async_profile(hass, 0.05, 5)
+
+    assert Path(result["pstats"]).is_file()
+    assert Path(result["collapsed_stacks"]).is_file()
+    assert 0 < len(result["top"]) <= 5
+    assert any("metrics.py" in entry["function"] for entry in result["top"])
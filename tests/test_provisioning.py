@@ -0,0 +1,77 @@
+"""Test Senziio bulk provisioning."""
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.provisioning import async_import_manifest, read_manifest
+
+from . import A_DEVICE_ID, A_FRIENDLY_NAME, DEVICE_INFO, FakeSenziioDevice
+
+
+def _fake_device(device_id, device_model, **kwargs):
+    """Create fake devices answering unless their ID marks them offline."""
+    if device_id.endswith("offline"):
+        return FakeSenziioDevice({})
+    return FakeSenziioDevice(
+        {**DEVICE_INFO, "serial-number": device_id, "model": device_model}
+    )
+
+
+def test_read_manifest(tmp_path):
+    """Test CSV and YAML manifests are read as rows."""
+    csv_manifest = tmp_path / "manifest.csv"
+    csv_manifest.write_text(
+        "serial_number,model,friendly_name,area\nt-1,Theia Pro,Desk,Office\n"
+    )
+    yaml_manifest = tmp_path / "manifest.yaml"
+    yaml_manifest.write_text("- serial_number: t-1\n  model: Theia Pro\n")
+
+    assert read_manifest(csv_manifest) == [
+        {
+            "serial_number": "t-1",
+            "model": "Theia Pro",
+            "friendly_name": "Desk",
+            "area": "Office",
+        }
+    ]
+    assert read_manifest(yaml_manifest) == [
+        {"serial_number": "t-1", "model": "Theia Pro"}
+    ]
+
+
+async def test_import_manifest(hass: HomeAssistant, enable_custom_integrations):
+    """Test devices of a manifest are validated and added in one batch."""
+    MockConfigEntry(
+        domain=DOMAIN, unique_id=A_DEVICE_ID, title=A_FRIENDLY_NAME
+    ).add_to_hass(hass)
+
+    rows = [
+        {"serial_number": "t-1", "model": "Theia Pro", "area": "Office"},
+        {"serial_number": "t-2", "model": "Theia Pro", "friendly_name": "Desk"},
+        {"serial_number": "t-3", "model": "Theia Pro", "friendly_name": "Desk"},
+        {"serial_number": A_DEVICE_ID, "model": "Theia Pro"},
+        {"serial_number": "t-offline", "model": "Theia Pro"},
+        {"model": "Theia Pro"},
+    ]
+    with (
+        patch(
+            "custom_components.senziio.config_flow.Senziio", side_effect=_fake_device
+        ),
+        patch("custom_components.senziio.async_setup_entry", return_value=True),
+    ):
+        summary = await async_import_manifest(hass, rows)
+        await hass.async_block_till_done()
+
+    assert summary["created"] == ["t-1", "t-2"]
+    assert summary["failed"] == {"t-offline": "cannot_connect"}
+    assert summary["skipped"]["t-3"] == "repeated_title"
+    assert summary["skipped"][A_DEVICE_ID] == "already_configured"
+    assert "row 6" in summary["skipped"]
+
+    entry = hass.config_entries.async_entry_for_domain_unique_id(DOMAIN, "t-1")
+    assert entry.title == "Senziio Theia Pro 2"
+    assert entry.data["area"] == "Office"
+    assert entry.data["serial-number"] == "t-1"
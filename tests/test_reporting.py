@@ -0,0 +1,148 @@
+"""Test Senziio device-side reporting configuration."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.reporting import (
+    CONF_REPORTING,
+    ReportingRejected,
+    SenziioReportingSync,
+    async_apply_reporting,
+)
+from custom_components.senziio.senziio import Senziio, SenziioMQTT
+from custom_components.senziio.services import async_setup_services
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, ENTRY_DATA
+
+CONFIG = {"interval": 300, "thresholds": {"co2": 50.0}}
+
+
+class AcknowledgingMQTT(SenziioMQTT):
+    """MQTT interface answering reporting requests."""
+
+    def __init__(self, response: dict | None) -> None:
+        """Initialize with the response to send, None to stay silent."""
+        self.response = response
+        self.requests = []
+        self.subscriptions = {}
+
+    async def publish(self, topic, payload):
+        """Answer a request as the device would."""
+        request = json.loads(payload)
+        self.requests.append(request)
+        if self.response is not None:
+            response = {**self.response, "request_id": request["request_id"]}
+            self.subscriptions[topic[:-3] + "res"](
+                SimpleNamespace(topic=topic, payload=json.dumps(response))
+            )
+
+    async def subscribe(self, topic, callback):
+        """Record subscription callback."""
+        self.subscriptions[topic] = callback
+        return lambda: self.subscriptions.pop(topic, None)
+
+
+async def test_acknowledged_configuration_is_recorded(hass: HomeAssistant):
+    """Test acknowledged configurations are stored as applied."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    mqtt = AcknowledgingMQTT({"status": "ok"})
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+
+    assert await async_apply_reporting(hass, entry, device, CONFIG)
+
+    assert mqtt.requests[0]["interval"] == 300
+    assert entry.data[CONF_REPORTING] == CONFIG
+    assert entry.options[CONF_REPORTING] == CONFIG
+
+
+async def test_acknowledging_requested_configuration_keeps_options(
+    hass: HomeAssistant,
+):
+    """Test options are not written again for a configuration they request."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=ENTRY_DATA, options={CONF_REPORTING: CONFIG}
+    )
+    entry.add_to_hass(hass)
+    options = entry.options
+    device = Senziio(
+        A_DEVICE_ID, A_DEVICE_MODEL, mqtt=AcknowledgingMQTT({"status": "ok"})
+    )
+
+    assert await async_apply_reporting(hass, entry, device, CONFIG)
+
+    assert entry.data[CONF_REPORTING] == CONFIG
+    assert entry.options is options
+
+
+async def test_set_reporting_keeps_omitted_fields(hass: HomeAssistant):
+    """Test the fleet action only changes the fields it is given."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=ENTRY_DATA, options={CONF_REPORTING: CONFIG}
+    )
+    entry.add_to_hass(hass)
+    mqtt = AcknowledgingMQTT({"status": "ok"})
+    hass.data[DOMAIN] = {
+        entry.entry_id: Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+    }
+    dev_entry = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, ENTRY_DATA["serial-number"])},
+    )
+    async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "set_reporting",
+        {"interval": 60, "device_id": [dev_entry.id]},
+        blocking=True,
+    )
+
+    expected = {"interval": 60, "thresholds": {"co2": 50.0}}
+    assert {
+        key: value for key, value in mqtt.requests[0].items() if key != "request_id"
+    } == expected
+    assert entry.options[CONF_REPORTING] == expected
+
+
+async def test_rejected_configuration(hass: HomeAssistant):
+    """Test rejected configurations are not recorded."""
+    entry = MockConfigEntry(domain=DOMAIN, data=ENTRY_DATA)
+    entry.add_to_hass(hass)
+    device = Senziio(
+        A_DEVICE_ID, A_DEVICE_MODEL, mqtt=AcknowledgingMQTT({"error": "range"})
+    )
+
+    with pytest.raises(ReportingRejected):
+        await async_apply_reporting(hass, entry, device, CONFIG)
+    assert CONF_REPORTING not in entry.data
+
+
+async def test_sync_sends_requested_configuration_once(hass: HomeAssistant):
+    """Test requested configurations are sent until acknowledged."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=ENTRY_DATA, options={CONF_REPORTING: CONFIG}
+    )
+    entry.add_to_hass(hass)
+    mqtt = AcknowledgingMQTT({"status": "ok"})
+    sync = SenziioReportingSync(
+        hass, entry, Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+    )
+
+    sync.async_sync()
+    sync.async_sync()
+    await hass.async_block_till_done()
+    assert len(mqtt.requests) == 1
+    assert entry.data[CONF_REPORTING] == CONFIG
+
+    # already acknowledged
+    sync.async_sync()
+    await hass.async_block_till_done()
+    assert len(mqtt.requests) == 1
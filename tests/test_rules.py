@@ -0,0 +1,81 @@
+"""Test Senziio threshold rules."""
+
+import pytest
+import voluptuous as vol
+
+from custom_components.senziio.rules import (
+    RULE_CANCEL,
+    RULE_FIRE,
+    RULE_IDLE,
+    RULE_PENDING,
+    RULES_SCHEMA,
+    Rule,
+    compile_rules,
+)
+
+
+def test_rule_hysteresis():
+    """Test a rule fires once and re-arms below its release level."""
+    (config,) = RULES_SCHEMA(
+        [{"id": "co2-high", "metric": "co2", "above": 1200, "hysteresis": 100}]
+    )
+    rule = Rule(config)
+
+    assert rule.evaluate(1100, 0) == RULE_IDLE
+    assert rule.evaluate(1250, 1) == RULE_FIRE
+    assert rule.evaluate(1300, 2) == RULE_IDLE
+    # still above the release level
+    assert rule.evaluate(1150, 3) == RULE_IDLE
+    assert rule.evaluate(1250, 4) == RULE_IDLE
+
+    assert rule.evaluate(1099, 5) == RULE_IDLE
+    assert rule.evaluate(1250, 6) == RULE_FIRE
+
+
+def test_rule_duration_below():
+    """Test a below rule must hold for its duration."""
+    (config,) = RULES_SCHEMA(
+        [{"id": "cold", "metric": "temperature", "below": 18, "for": 300}]
+    )
+    rule = Rule(config)
+
+    assert rule.evaluate(17, 0) == RULE_PENDING
+    assert rule.evaluate(17.5, 100) == RULE_IDLE
+    assert rule.evaluate(19, 200) == RULE_CANCEL
+    assert rule.evaluate(17, 300) == RULE_PENDING
+    assert rule.expire(500) == RULE_IDLE
+    assert rule.evaluate(17, 600) == RULE_FIRE
+    assert rule.expire(1000) == RULE_IDLE
+
+
+def test_compile_rules_by_metric():
+    """Test rules are grouped by metric."""
+    table = compile_rules(
+        RULES_SCHEMA(
+            [
+                {"id": "a", "metric": "co2", "above": 1000},
+                {"id": "b", "metric": "co2", "above": 1500},
+                {"id": "c", "metric": "humidity", "below": 30},
+            ]
+        )
+    )
+    assert [rule.rule_id for rule in table["co2"]] == ["a", "b"]
+    assert [rule.rule_id for rule in table["humidity"]] == ["c"]
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        [{"id": "a", "metric": "co2"}],
+        [{"id": "a", "metric": "co2", "above": 1, "below": 2}],
+        [{"id": "a", "metric": "co2", "above": 1, "hysteresis": -1}],
+        [
+            {"id": "a", "metric": "co2", "above": 1},
+            {"id": "a", "metric": "co2", "below": 1},
+        ],
+    ],
+)
+def test_invalid_rules(rules):
+    """Test invalid rule configs are rejected."""
+    with pytest.raises(vol.Invalid):
+        RULES_SCHEMA(rules)
@@ -1,5 +1,8 @@
 """Test Senziio sensor entities."""
 
+import json
+import time
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
@@ -13,9 +16,16 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 
+from custom_components.senziio.aggregation import WindowAggregator
 from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.history import async_query_history
+from custom_components.senziio.sensor import SENSOR_DESCRIPTIONS, SenziioSensorEntity
+from custom_components.senziio.senziio import Senziio
 
 from . import (
+    A_DEVICE_ID,
+    A_DEVICE_MODEL,
+    CONFIG_ENTRY,
     DEVICE_INFO,
     FakeSenziioDevice,
     assert_entity_state_is,
@@ -103,3 +113,34 @@ async def set_ha_meassure_units(hass: HomeAssistant, unit_system: str):
     """Set Home Assistant unit system."""
     await async_process_ha_core_config(hass, {CONF_UNIT_SYSTEM: unit_system})
     await hass.async_block_till_done()
+
+
+async def test_samples_are_stamped_on_arrival(hass: HomeAssistant):
+    """Test samples are kept in local time when the device clock is off."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    description = next(
+        descr for descr in SENSOR_DESCRIPTIONS if descr.key == "temperature"
+    )
+    entity = SenziioSensorEntity(hass, description, CONFIG_ENTRY, device)
+    entity.hass = hass
+    entity.entity_id = TEMPERATURE_ENTITY
+    entity.async_write_ha_state = lambda: None
+    aggregator = WindowAggregator(300)
+    device.add_sample_listener("temperature", aggregator.add)
+
+    handlers = {}
+
+    async def subscribe(hass, topic, handler, qos):
+        handlers[topic] = handler
+
+    with patch("custom_components.senziio.sensor.async_subscribe", subscribe):
+        await entity.async_added_to_hass()
+
+    # device clock one day behind
+    payload = json.dumps({"temperature": 21.5, "ts": time.time() - 86400})
+    handlers[device.entity_topic("temperature")](SimpleNamespace(payload=payload))
+    aggregator.expire(time.time())
+
+    assert aggregator.mean == 21.5
+    timestamps = async_query_history(hass, TEMPERATURE_ENTITY)["timestamps"]
+    assert timestamps[0] == pytest.approx(time.time(), abs=5)
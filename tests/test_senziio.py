@@ -0,0 +1,287 @@
+"""Test Senziio device communications."""
+
+import json
+from types import SimpleNamespace
+
+from custom_components.senziio.senziio import (
+    MAX_LINE_LENGTH,
+    AvailabilityTracker,
+    RTTEstimator,
+    Senziio,
+    SenziioMQTT,
+    iter_ndjson,
+)
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL
+
+
+class FakeMQTT(SenziioMQTT):
+    """In-memory MQTT interface recording subscriptions."""
+
+    def __init__(self) -> None:
+        """Initialize fake."""
+        self.published = []
+        self.subscriptions = {}
+
+    async def publish(self, topic, payload):
+        """Record published payload."""
+        self.published.append((topic, payload))
+
+    async def subscribe(self, topic, callback):
+        """Record subscription callback."""
+        self.subscriptions[topic] = callback
+        return lambda: self.subscriptions.pop(topic, None)
+
+    def deliver(self, topic, payload, subscription=None):
+        """Deliver a message to the matching subscription."""
+        message = SimpleNamespace(topic=topic, payload=payload)
+        return self.subscriptions[subscription or topic](message)
+
+
+async def test_listen_new_metrics():
+    """Test unknown metric topics are reported once."""
+    mqtt = FakeMQTT()
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+    wildcard = device.entity_topic("+")
+    reported = []
+    retry = {"noise": True}
+
+    def on_new_metric(key):
+        reported.append(key)
+        return not retry.pop(key, False)
+
+    await device.listen_new_metrics({"co2"}, on_new_metric)
+
+    for key in ("co2", "event", "voc", "voc", "noise", "noise", "noise"):
+        mqtt.deliver(device.entity_topic(key), "{}", wildcard)
+
+    # known and reserved topics are skipped, rejected keys are retried once
+    assert reported == ["voc", "noise", "noise"]
+
+
+def test_sequence_tracking():
+    """Test stale messages are rejected and gaps are counted."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=FakeMQTT())
+
+    accepted = [
+        device.accept_sample("co2", seq, ts)
+        for seq, ts in ((1, 100), (2, 101), (5, 104), (4, 103), (5, 104), (6, None))
+    ]
+    assert accepted == [True, True, True, False, False, True]
+
+    # samples without sequence information are always accepted
+    assert device.accept_sample("co2", None, None) is True
+
+    tracker = device.sequences["co2"]
+    assert (tracker.received, tracker.stale, tracker.gaps, tracker.lost) == (4, 2, 1, 2)
+    assert device.gap_rate == 1 / 4
+    assert device.loss_rate == 2 / 6
+
+
+def test_sequence_restart_is_accepted():
+    """Test a device restart resets the sequence."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=FakeMQTT())
+
+    assert device.accept_sample("co2", 5000, None) is True
+    assert device.accept_sample("co2", 1, None) is True
+    assert device.accept_sample("co2", 3, 10.0) is True
+    assert device.accept_sample("co2", 1, 11.0) is True
+    assert device.accept_sample("co2", None, 9.0) is False
+
+
+def test_sequence_restart_from_low_sequence_is_accepted():
+    """Test a restart is detected without timestamps or a large drop."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=FakeMQTT())
+
+    assert device.accept_sample("co2", 500, None) is True
+    assert device.accept_sample("co2", 0, None) is True
+    assert device.accept_sample("co2", 1, None) is True
+    # small reorderings are still rejected
+    assert device.accept_sample("co2", 800, None) is True
+    assert device.accept_sample("co2", 799, None) is False
+
+    # any drop after the device was offline is a restart
+    device.availability.last_seen -= AvailabilityTracker.OFFLINE_AFTER + 1
+    assert device.accept_sample("co2", 700, None) is True
+
+
+async def test_listen_backfill():
+    """Test buffered samples are handed over with their metric key."""
+    mqtt = FakeMQTT()
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+    batches = []
+
+    await device.listen_backfill(lambda key, samples: batches.append((key, samples)))
+
+    topic = device.entity_topic("backfill")
+    mqtt.deliver(topic, '{"key": "co2", "samples": [[1718000000, 512]]}')
+    mqtt.deliver(topic, '{"samples": [[1718000000, 512]]}')
+    mqtt.deliver(topic, "not json")
+
+    assert batches == [("co2", [[1718000000, 512]])]
+
+
+def test_sample_listeners():
+    """Test accepted samples are dispatched to metric listeners."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=FakeMQTT())
+    received = []
+
+    remove = device.add_sample_listener("co2", lambda ts, value: received.append(value))
+    device.dispatch_sample("co2", 1.0, 500)
+    device.dispatch_sample("humidity", 1.0, 40)
+    remove()
+    device.dispatch_sample("co2", 2.0, 510)
+
+    assert received == [500]
+
+
+async def test_iter_ndjson_across_chunks():
+    """Test NDJSON lines split across chunks are decoded incrementally."""
+
+    async def chunks():
+        yield b'[1, 21.4]\n[2, 2'
+        yield b"1.5]\n\nnot json\n"
+        yield b"[" + b"0" * (MAX_LINE_LENGTH + 1)
+        yield b"]\n[3, 21.6]"
+
+    assert [line async for line in iter_ndjson(chunks())] == [
+        [1, 21.4],
+        [2, 21.5],
+        [3, 21.6],
+    ]
+
+
+def test_availability_listener():
+    """Test listeners are called when a device comes back after a gap."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=FakeMQTT())
+    returns = []
+    remove = device.availability.add_listener(
+        lambda since, until: returns.append((since, until))
+    )
+
+    offline_after = AvailabilityTracker.OFFLINE_AFTER
+    for now in (100, 200, 200 + offline_after + 1, 250 + offline_after):
+        device.availability.seen(now)
+    assert returns == [(200, 200 + offline_after + 1)]
+
+    remove()
+    device.availability.seen(10_000)
+    assert len(returns) == 1
+
+
+async def test_discover_devices():
+    """Test answers to a broadcast info request are collected."""
+    mqtt = FakeMQTT()
+
+    async def publish(topic, payload):
+        mqtt.published.append(topic)
+        for device_id, response in (
+            ("theia-pro-1", '{"model": "Theia Pro"}'),
+            ("theia-2", '{"fw-version": "1.0"}'),
+            ("theia-3", "not json"),
+        ):
+            mqtt.deliver(
+                f"cmd/theia-pro/{device_id}/device-info/res",
+                response,
+                Senziio.INFO_RES_WILDCARD,
+            )
+
+    mqtt.publish = publish
+    devices = await Senziio.discover(mqtt, 0)
+
+    assert mqtt.published == [Senziio.BROADCAST_INFO_REQ]
+    assert devices == {
+        "theia-pro-1": {"model": "Theia Pro"},
+        "theia-2": {"fw-version": "1.0"},
+    }
+    assert mqtt.subscriptions == {}
+
+
+async def test_send_command_correlates_responses():
+    """Test responses to other requests are ignored."""
+    mqtt = FakeMQTT()
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+    request_topic, response_topic = device.command_topics("led")
+
+    async def publish(topic, payload):
+        request = json.loads(payload)
+        mqtt.published.append((topic, request))
+        mqtt.deliver(response_topic, '{"request_id": "other", "ok": false}')
+        mqtt.deliver(response_topic, "not json")
+        mqtt.deliver(
+            response_topic, json.dumps({"request_id": request["request_id"], "ok": True})
+        )
+
+    mqtt.publish = publish
+    response = await device.send_command("led", {"state": "off"})
+
+    [(topic, request)] = mqtt.published
+    assert topic == f"cmd/theia-pro/{A_DEVICE_ID}/led/req"
+    assert request == {"state": "off", "request_id": response["request_id"]}
+    assert response["ok"] is True
+    assert mqtt.subscriptions == {}
+
+
+async def test_send_command_timeout():
+    """Test None is returned when the device does not answer."""
+    mqtt = FakeMQTT()
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+
+    assert await device.send_command("led", timeout=0.01) is None
+    assert mqtt.subscriptions == {}
+
+
+def test_rtt_estimator():
+    """Test the timeout follows smoothed round-trip times."""
+    rtt = RTTEstimator()
+    assert rtt.timeout == RTTEstimator.INITIAL_TIMEOUT
+
+    rtt.add(0.2)
+    assert rtt.srtt == 0.2
+    assert rtt.timeout == RTTEstimator.MIN_TIMEOUT
+
+    for _ in range(20):
+        rtt.add(2.0)
+    assert 1.5 < rtt.srtt < 2.0
+    assert rtt.srtt + 4 * rtt.rttvar == rtt.timeout
+
+    for _ in range(5):
+        rtt.backoff()
+    assert rtt.timeout == RTTEstimator.MAX_TIMEOUT
+
+
+async def test_ping():
+    """Test answered pings feed the round-trip time estimate."""
+    mqtt = FakeMQTT()
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=mqtt)
+    _, response_topic = device.command_topics(Senziio.PING_COMMAND)
+    subscribe = mqtt.subscribe
+    subscribed = []
+
+    async def count_subscribe(topic, callback):
+        subscribed.append(topic)
+        return await subscribe(topic, callback)
+
+    async def publish(topic, payload):
+        request_id = json.loads(payload)["request_id"]
+        mqtt.deliver(response_topic, json.dumps({"request_id": "other"}))
+        mqtt.deliver(response_topic, json.dumps({"request_id": request_id}))
+
+    mqtt.subscribe = count_subscribe
+    mqtt.publish = publish
+    rtt = await device.ping()
+    assert rtt is not None
+    assert device.rtt.srtt == rtt
+
+    # the response subscription is kept between pings
+    assert await device.ping() is not None
+    assert subscribed == [response_topic]
+
+    # missed pings back off the timeout
+    mqtt.publish = FakeMQTT.publish.__get__(mqtt)
+    device.rtt.timeout = 0.01
+    assert await device.ping() is None
+    assert device.rtt.timeout == 0.02
+
+    device.stop_pings()
+    assert response_topic not in mqtt.subscriptions
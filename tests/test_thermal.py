@@ -0,0 +1,60 @@
+"""Test Senziio thermal frame decoding and rendering."""
+
+import struct
+import zlib
+
+import numpy as np
+
+from custom_components.senziio.thermal import (
+    decode_frame,
+    frame_changed,
+    render_frame_png,
+)
+
+
+def make_frame(width: int, height: int, pixels: list[int]) -> bytes:
+    """Build a raw thermal frame payload."""
+    return struct.pack(f"<HH{width * height}h", width, height, *pixels)
+
+
+def test_decode_frame_is_zero_copy():
+    """Test frames are decoded as views on the payload."""
+    payload = bytearray(make_frame(3, 2, [2100, 2200, 2300, 3600, 3650, 2150]))
+
+    frame = decode_frame(payload)
+
+    assert frame.shape == (2, 3)
+    assert frame[1, 1] == 3650
+    assert np.shares_memory(frame, np.frombuffer(payload, dtype=np.uint8))
+
+
+def test_decode_malformed_frame():
+    """Test truncated frames are rejected."""
+    assert decode_frame(b"\x03") is None
+    assert decode_frame(make_frame(3, 2, [0] * 6)[:-2]) is None
+    assert decode_frame(struct.pack("<HH", 0, 0)) is None
+
+
+def test_render_frame_png():
+    """Test rendering a colour-mapped PNG."""
+    png = render_frame_png(make_frame(3, 2, [2100, 2200, 2300, 3600, 3650, 2150]))
+
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == (30, 20)
+
+    # first IDAT chunk holds all scanlines
+    idat_start = png.index(b"IDAT") + 4
+    idat_length = struct.unpack(">I", png[idat_start - 8 : idat_start - 4])[0]
+    rows = zlib.decompress(png[idat_start : idat_start + idat_length])
+    assert len(rows) == height * (width * 3 + 1)
+
+
+def test_frame_changed():
+    """Test frames only count as changed beyond the threshold."""
+    frame = make_frame(2, 1, [2100, 2200])
+
+    assert not frame_changed(frame, make_frame(2, 1, [2140, 2160]), 50)
+    assert frame_changed(frame, make_frame(2, 1, [2100, 2260]), 50)
+    assert frame_changed(frame, make_frame(1, 2, [2100, 2200]), 50)
+    assert frame_changed(frame, b"\x03", 50)
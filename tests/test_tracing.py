@@ -0,0 +1,75 @@
+"""Test Senziio startup tracing."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.senziio.entity import DOMAIN
+from custom_components.senziio.services import async_setup_services
+from custom_components.senziio.tracing import StartupTracer, async_get_tracer
+
+from . import A_DEVICE_ID, ANOTHER_DEVICE_ID
+
+
+def test_chrome_trace_lanes():
+    """Test spans are exported with one lane per device."""
+    tracer = StartupTracer()
+    with tracer.span("async_setup"):
+        pass
+    for device_id in (A_DEVICE_ID, ANOTHER_DEVICE_ID):
+        with tracer.span("async_setup_entry", device_id):
+            with tracer.span("get_info", device_id):
+                pass
+
+    trace = tracer.chrome_trace()
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    lanes = {
+        event["args"]["name"]: event["tid"]
+        for event in trace["traceEvents"]
+        if event["name"] == "thread_name"
+    }
+    assert [span["name"] for span in spans] == [
+        "async_setup",
+        "get_info",
+        "async_setup_entry",
+        "get_info",
+        "async_setup_entry",
+    ]
+    assert spans[1]["tid"] == spans[2]["tid"] == lanes[A_DEVICE_ID]
+    assert spans[3]["args"] == {"device_id": ANOTHER_DEVICE_ID}
+    # nested spans are contained in their parent
+    assert spans[2]["ts"] <= spans[1]["ts"]
+    assert spans[1]["ts"] + spans[1]["dur"] <= spans[2]["ts"] + spans[2]["dur"]
+
+    device_trace = tracer.chrome_trace(A_DEVICE_ID)
+    assert len([e for e in device_trace["traceEvents"] if e["ph"] == "X"]) == 2
+
+
+def test_spans_are_bounded():
+    """Test spans over the limit are counted as dropped."""
+    tracer = StartupTracer()
+    with patch("custom_components.senziio.tracing.MAX_SPANS", 2):
+        for _ in range(3):
+            with tracer.span("subscribe", A_DEVICE_ID):
+                pass
+
+    assert len(tracer.spans) == 2
+    assert tracer.chrome_trace()["otherData"] == {"dropped_spans": 1}
+
+
+async def test_export_trace_service(hass: HomeAssistant, tmp_path: Path):
+    """Test the trace is written to the configuration directory."""
+    hass.config.config_dir = str(tmp_path)
+    async_setup_services(hass)
+    with async_get_tracer(hass).span("async_setup"):
+        pass
+
+    response = await hass.services.async_call(
+        DOMAIN, "export_trace", blocking=True, return_response=True
+    )
+
+    assert response["spans"] == 1
+    trace = json.loads(Path(response["path"]).read_text())
+    assert trace["traceEvents"][-1]["name"] == "async_setup"
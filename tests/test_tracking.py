@@ -0,0 +1,103 @@
+"""Test Senziio radar target tracking."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.senziio.metrics import DROPS
+from custom_components.senziio.sensor import SenziioRadarTargetsSensorEntity
+from custom_components.senziio.senziio import Senziio
+from custom_components.senziio.tracking import RadarTracker
+
+from . import A_DEVICE_ID, A_DEVICE_MODEL, CONFIG_ENTRY
+
+
+def test_tracker_reports_meaningful_changes_only():
+    """Test state changes are reported on enter, leave and movement."""
+    tracker = RadarTracker()
+
+    assert tracker.update([{"x": 1.0, "y": 2.0}], 0.0) is True
+    assert [track["id"] for track in tracker.as_attributes()] == [1]
+
+    # small movement of the same target is not worth a write
+    assert tracker.update([{"x": 1.1, "y": 2.0, "vx": 0.5}], 0.2) is False
+    # movement accumulates against the last reported position
+    assert tracker.update([{"x": 1.35, "y": 2.0, "vx": 0.5}], 0.7) is True
+    assert tracker.as_attributes()[0]["x"] == 1.35
+
+    # a second target enters, the first keeps its track id
+    assert tracker.update([{"x": 3.0, "y": 0.5}, {"x": 1.4, "y": 2.0}], 0.8) is True
+    assert sorted(track["id"] for track in tracker.as_attributes()) == [1, 2]
+
+    assert tracker.update([], 1.0) is True
+    assert tracker.tracks == {}
+
+
+def test_tracker_matches_device_ids():
+    """Test targets with device ids are matched directly."""
+    tracker = RadarTracker()
+
+    tracker.update([{"id": 7, "x": 0.0, "y": 0.0}], 0.0)
+    assert tracker.update([{"id": 7, "x": 5.0, "y": 0.0}], 0.1) is True
+    assert tracker.as_attributes() == [
+        {"id": 7, "x": 5.0, "y": 0.0, "vx": 0.0, "vy": 0.0}
+    ]
+
+
+@pytest.mark.parametrize(
+    "payload", ["false", "true", '{"radar": false}', '{"targets": null}', "null"]
+)
+async def test_payload_without_targets_clears_tracks(
+    hass: HomeAssistant, payload: str
+):
+    """Test radar payloads without a targets list mean nothing is detected."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    entity = SenziioRadarTargetsSensorEntity(CONFIG_ENTRY, device)
+    entity.hass = hass
+    entity.async_write_ha_state = lambda: None
+
+    handlers = []
+
+    async def subscribe(hass, topic, handler, qos):
+        handlers.append(handler)
+        return lambda: None
+
+    with patch("custom_components.senziio.sensor.async_subscribe", subscribe):
+        await entity.async_added_to_hass()
+    message_received = handlers[0]
+
+    message_received(SimpleNamespace(payload='{"targets": [{"x": 1.0, "y": 2.0}]}'))
+    assert entity.native_value == 1
+
+    message_received(SimpleNamespace(payload=payload))
+    assert entity.native_value == 0
+    assert entity.extra_state_attributes == {"targets": []}
+    assert device.metrics.topic("radar-targets").counters[DROPS] == 0
+
+
+async def test_tracks_age_in_local_time(hass: HomeAssistant):
+    """Test radar frames are tracked at their receive time."""
+    device = Senziio(A_DEVICE_ID, A_DEVICE_MODEL, mqtt=None)
+    entity = SenziioRadarTargetsSensorEntity(CONFIG_ENTRY, device)
+    entity.hass = hass
+    entity.async_write_ha_state = lambda: None
+
+    handlers = []
+
+    async def subscribe(hass, topic, handler, qos):
+        handlers.append(handler)
+        return lambda: None
+
+    with patch("custom_components.senziio.sensor.async_subscribe", subscribe):
+        await entity.async_added_to_hass()
+
+    # a device without NTP reports times near the epoch
+    handlers[0](
+        SimpleNamespace(payload='{"targets": [{"x": 1.0, "y": 2.0}], "ts": 5}')
+    )
+    assert entity.native_value == 1
+    assert abs(entity._tracker._last_timestamp - time.time()) < 60
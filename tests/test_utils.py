@@ -0,0 +1,24 @@
+"""Test Senziio package utilities."""
+
+import pytest
+
+from custom_components.senziio.utils import decode_value
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        ("21.4", 21.4),
+        (b"510", 510),
+        (" true\n", True),
+        ("false", False),
+        ("null", None),
+        ('"idle"', "idle"),
+        ('{"temperature": 26}', 26),
+        ('{"humidity": 40}', None),
+        ("[1, 2]", [1, 2]),
+    ],
+)
+def test_decode_value(payload, expected):
+    """Test decoding scalar and legacy JSON object payloads."""
+    assert decode_value(payload, "temperature") == expected